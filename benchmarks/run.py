@@ -0,0 +1,320 @@
+"""
+Benchmarks for the damage engine's hot paths. These run offline against the checked-in
+data/ files, so a gamemaster refresh shows up as a change in the numbers too.
+
+    python benchmarks/run.py                        # run everything, compare to the baseline
+    python benchmarks/run.py --only iv_table        # only benchmarks whose name contains this
+    python benchmarks/run.py --output results.json  # also write the results as JSON
+    python benchmarks/run.py --save-baseline        # record these results as the new baseline
+    python benchmarks/run.py --memory               # measure memory instead of time
+
+A benchmark counts as a regression when its best time is more than `--threshold`
+(default 25%) slower than the baseline's best time; the minimum is much less noisy than
+the median on a busy machine. The exit code is 1 if anything regressed.
+
+In memory mode, each benchmark is run once under tracemalloc, and we record the peak
+memory while it runs and the memory still held by its result afterwards (normalized
+per IV or per result). Memory use is deterministic, so the default threshold is 10%.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pvp_damage.damage import compute_breakpoints, compute_bulkpoints, compute_iv_possibilities
+from pvp_damage.iv_table import clear_iv_table_cache, compute_iv_table
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_move_by_name
+from pvp_damage.models.pokemon import Pokemon, get_species
+from pvp_damage.sweep import sweep_moves
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# does any setup that shouldn't be measured, and returns the function to measure
+type Setup = Callable[[], Callable[[], object]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Setup
+    rounds: int
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str, rounds: int = 7) -> Callable[[Setup], Setup]:
+    """
+    Register a benchmark. The decorated function does any setup that shouldn't be timed,
+    and returns the function to time.
+    """
+
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS.append(Benchmark(name=name, setup=setup, rounds=rounds))
+        return setup
+
+    return register
+
+
+@benchmark("import", rounds=5)
+def _import():
+    # a fresh interpreter, so this includes parsing the gamemaster and league files
+    command = [sys.executable, "-c", "import pvp_damage.damage, pvp_damage.models.leagues"]
+    return lambda: subprocess.run(command, check=True)
+
+
+@benchmark("iv_table.dict")
+def _iv_table_dict():
+    species = get_species("Azumarill")
+    return lambda: compute_iv_possibilities(species, 1500)
+
+
+@benchmark("iv_table.array")
+def _iv_table_array():
+    species = get_species("Azumarill")
+    return lambda: compute_iv_table(species, 1500)
+
+
+@benchmark("breakpoints.single")
+def _breakpoints_single():
+    ape = get_species("Annihilape")
+    clodsire = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+    counter = get_move_by_name("Counter")
+    return lambda: compute_breakpoints(ape, clodsire, counter, 1500)
+
+
+@benchmark("bulkpoints.single")
+def _bulkpoints_single():
+    serperior = Pokemon(species=get_species("Serperior"), level=51, ivs=(8, 15, 15))
+    swampert = get_species("Swampert")
+    vine_whip = get_move_by_name("Vine Whip")
+    return lambda: compute_bulkpoints(serperior, swampert, vine_whip, 2500)
+
+
+@benchmark("sweep.great_league_meta", rounds=5)
+def _sweep_great_league_meta():
+    # every meta entry's fast move against the rank 1 of every meta species
+    def run():
+        for species, moveset in GREAT_LEAGUE.meta:
+            sweep_moves(species, GREAT_LEAGUE, moves=[moveset.fast])
+
+    return run
+
+
+@benchmark("sweep.species")
+def _sweep_species():
+    altaria = get_species("Altaria")
+    return lambda: sweep_moves(altaria, GREAT_LEAGUE, include_charged=True)
+
+
+@dataclass
+class MemoryBenchmark:
+    name: str
+    setup: Setup
+    units: int
+    unit: str
+
+
+MEMORY_BENCHMARKS: list[MemoryBenchmark] = []
+
+
+def memory_benchmark(name: str, units: int, unit: str) -> Callable[[Setup], Setup]:
+    """
+    Register a memory benchmark. Like `benchmark`, but the returned function should
+    return whatever we want to measure holding on to, which represents `units` IVs
+    or results.
+    """
+
+    def register(setup: Setup) -> Setup:
+        MEMORY_BENCHMARKS.append(MemoryBenchmark(name=name, setup=setup, units=units, unit=unit))
+        return setup
+
+    return register
+
+
+@memory_benchmark("iv_table.dict", units=16**3, unit="IV")
+def _memory_iv_table_dict():
+    species = get_species("Azumarill")
+    return lambda: compute_iv_possibilities(species, 1500)
+
+
+@memory_benchmark("iv_table.array", units=16**3, unit="IV")
+def _memory_iv_table_array():
+    species = get_species("Azumarill")
+
+    def run():
+        table = compute_iv_table(species, 1500)
+        _ = (table.attack_stat, table.defense_stat, table.stamina_stat, table.stat_product)
+        return table
+
+    return run
+
+
+@memory_benchmark("breakpoints.single", units=1, unit="result")
+def _memory_breakpoints_single():
+    return _breakpoints_single()
+
+
+@memory_benchmark("bulkpoints.single", units=1, unit="result")
+def _memory_bulkpoints_single():
+    return _bulkpoints_single()
+
+
+HELD_RESULTS = 10
+
+
+@memory_benchmark("breakpoints.held", units=HELD_RESULTS, unit="result")
+def _memory_breakpoints_held():
+    # what a sweep holds on to when it keeps the results for part of the meta
+    ape = get_species("Annihilape")
+    counter = get_move_by_name("Counter")
+    defenders = [compute_iv_table(species, 1500).rank1() for species, _ in GREAT_LEAGUE.meta[:HELD_RESULTS]]
+    return lambda: [compute_breakpoints(ape, defender, counter, 1500) for defender in defenders]
+
+
+def measure_memory(bench: MemoryBenchmark) -> dict[str, Any]:
+    func = bench.setup()
+    func()  # warm up, so one-time allocations (e.g., pydantic's) aren't counted
+    clear_iv_table_cache()
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = func()
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    retained = after - before
+    return {
+        "peak": peak - before,
+        "retained": retained,
+        "units": bench.units,
+        "unit": bench.unit,
+        "retained_per_unit": retained / bench.units,
+    }
+
+
+def compare_memory(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Like `compare`, but for memory; a regression is the retained memory growing."""
+
+    regressions: list[str] = []
+    print(f"{'benchmark':<24} {'peak':>10} {'retained':>10} {'per unit':>18} {'baseline':>18} {'change':>8}")
+    for name, result in results["memory"].items():
+        per_unit = f"{result['retained_per_unit']:,.0f} B/{result['unit']}"
+        line = f"{name:<24} {result['peak'] / 1024:>8.0f}KB {result['retained'] / 1024:>8.0f}KB {per_unit:>18}"
+        if name not in baseline.get("memory", {}):
+            print(f"{line} {'-':>18} {'-':>8}")
+            continue
+
+        base = baseline["memory"][name]["retained"]
+        change = result["retained"] / base - 1 if base else 0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        base_per_unit = f"{baseline['memory'][name]['retained_per_unit']:,.0f} B/{result['unit']}"
+        print(f"{line} {base_per_unit:>18} {change:>+7.1%}{flag}")
+
+    return regressions
+
+
+def time_benchmark(bench: Benchmark) -> dict[str, Any]:
+    func = bench.setup()
+    func()  # warm up
+
+    # like timeit, keep the garbage collector from landing in the middle of a round
+    times: list[float] = []
+    for _ in range(bench.rounds):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    return {"median": statistics.median(times), "min": min(times), "rounds": bench.rounds}
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Print a comparison table, and return the names of benchmarks that regressed."""
+
+    regressions: list[str] = []
+    print(f"{'benchmark':<28} {'best':>10} {'baseline':>10} {'change':>8}")
+    for name, result in results["benchmarks"].items():
+        best = result["min"]
+        if name not in baseline.get("benchmarks", {}):
+            print(f"{name:<28} {best * 1000:>8.1f}ms {'-':>10} {'-':>8}")
+            continue
+
+        base = baseline["benchmarks"][name]["min"]
+        change = best / base - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        print(f"{name:<28} {best * 1000:>8.1f}ms {base * 1000:>8.1f}ms {change:>+7.1%}{flag}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, help="allowed slowdown (or growth) before failing")
+    parser.add_argument("--memory", action="store_true", help="measure memory instead of time")
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {"python": platform.python_version(), "machine": platform.machine()}
+    if args.memory:
+        benchmarks = [bench for bench in MEMORY_BENCHMARKS if not args.only or args.only in bench.name]
+        results["memory"] = {bench.name: measure_memory(bench) for bench in benchmarks}
+    else:
+        benchmarks = [bench for bench in BENCHMARKS if not args.only or args.only in bench.name]
+        results["benchmarks"] = {bench.name: time_benchmark(bench) for bench in benchmarks}
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    baseline: dict[str, Any] = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save_baseline:
+        # timing and memory results are saved separately, so keep whichever one we didn't run
+        args.baseline.write_text(json.dumps(baseline | results, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if args.memory:
+        regressions = compare_memory(results, baseline, 0.10 if args.threshold is None else args.threshold)
+    else:
+        regressions = compare(results, baseline, 0.25 if args.threshold is None else args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
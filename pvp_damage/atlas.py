@@ -0,0 +1,183 @@
+"""
+An atlas of every breakpoint and bulkpoint within each league's meta, written as one
+tab-separated file so that atlases built from two gamemaster versions can be compared
+with a plain `diff`.
+
+For every ordered pair of meta entries (attacker with its fast move, defender), the
+atlas holds one row per damage value, but only for pairs where that damage depends on
+IVs:
+
+- breakpoint rows: the attacker's IVs vary, against the defender's rank 1
+- bulkpoint rows: the defender's IVs vary, against the attacker's rank 1
+
+Each row gives the range of the deciding stat (attack or defense) that deals or takes
+that much damage, and the share of IV spreads that do. Damage is computed once per
+distinct stat value with `calculate_damage_array`, and the leagues are built in parallel.
+
+    python scripts/build_atlas.py --output atlas.tsv
+"""
+
+import argparse
+import time
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+from pvp_damage.bounds import meta_pairs
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import ALL_IVS, FloatArray, IntArray, get_iv_table
+from pvp_damage.models.leagues import LEAGUES, League
+from pvp_damage.models.moves import Move
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+
+type Kind = Literal["breakpoint", "bulkpoint"]
+
+COLUMNS = ("league", "kind", "attacker", "move", "defender", "damage", "stat_min", "stat_max", "count", "share")
+
+
+@dataclass(frozen=True)
+class Threshold:
+    """
+    `count` of the IV spreads with a stat (attack for breakpoints, defense for bulkpoints)
+    from `stat_min` to `stat_max` deal (or take) `damage`. Species are given by their
+    `key` and moves by their ID.
+    """
+
+    kind: Kind
+    league: str
+    attacker: str
+    move: str
+    defender: str
+    damage: int
+    stat_min: float
+    stat_max: float
+    count: int
+
+
+def group_by_damage(stats: FloatArray, counts: IntArray, damage: IntArray) -> list[tuple[int, float, float, int]]:
+    """(damage, lowest stat, highest stat, count) for each damage value, given distinct stats."""
+
+    return [
+        (int(value), float(stats[mask].min()), float(stats[mask].max()), int(counts[mask].sum()))
+        for value in np.unique(damage)
+        for mask in [damage == value]
+    ]
+
+
+@cache
+def distinct_stats(species: PokemonSpecies, cp_limit: int) -> tuple[FloatArray, IntArray, FloatArray, IntArray]:
+    """The distinct attack stats of a species in a league and how many IVs have each; then the same for defense."""
+
+    table = get_iv_table(species, cp_limit)
+    attack, defense = table.attack_classes, table.defense_classes
+    return attack.values, attack.counts, defense.values, defense.counts
+
+
+@cache
+def _rank1(species: PokemonSpecies, cp_limit: int) -> Pokemon:
+    return get_iv_table(species, cp_limit).rank1()
+
+
+def pair_thresholds(
+    league: str, cp_limit: int, attacker: PokemonSpecies, move: Move, defender: PokemonSpecies
+) -> list[Threshold]:
+    """
+    The breakpoint rows (attacker's IVs vs. the defender's rank 1) and bulkpoint rows
+    (defender's IVs vs. the attacker's rank 1) for one pair, including pairs whose damage
+    doesn't vary (which have one row of each kind).
+    """
+
+    names = (league, attacker.key, move.move_id, defender.key)
+    attack_values, attack_counts, _, _ = distinct_stats(attacker, cp_limit)
+    _, _, defense_values, defense_counts = distinct_stats(defender, cp_limit)
+
+    damage = calculate_damage_array(move, attacker, attack_values, defender, _rank1(defender, cp_limit).defense_stat)
+    rows = [Threshold("breakpoint", *names, *group) for group in group_by_damage(attack_values, attack_counts, damage)]
+
+    damage = calculate_damage_array(move, attacker, _rank1(attacker, cp_limit).attack_stat, defender, defense_values)
+    rows += [
+        Threshold("bulkpoint", *names, *group) for group in group_by_damage(defense_values, defense_counts, damage)
+    ]
+    return rows
+
+
+def varying(rows: list[Threshold]) -> list[Threshold]:
+    """Only the rows of kinds (breakpoint or bulkpoint) with more than one damage value."""
+
+    kinds = Counter(row.kind for row in rows)
+    return [row for row in rows if kinds[row.kind] > 1]
+
+
+def compute_league_atlas(name: str, league: League | None = None) -> list[Threshold]:
+    """
+    The atlas rows for one league (by short name, e.g. "great"), sorted for diffing.
+    league: the league's meta; defaults to `LEAGUES[name]`.
+    """
+
+    league = league or LEAGUES[name]
+    rows: list[Threshold] = []
+    for attacker, move, defender in meta_pairs(league):
+        rows += varying(pair_thresholds(name, league.max_cp, attacker, move, defender))
+
+    rows.sort(key=lambda row: (row.kind, row.attacker, row.move, row.defender, row.damage))
+    return rows
+
+
+def format_row(row: Threshold) -> str:
+    fields = (
+        row.league,
+        row.kind,
+        row.attacker,
+        row.move,
+        row.defender,
+        str(row.damage),
+        f"{row.stat_min:.4f}",
+        f"{row.stat_max:.4f}",
+        str(row.count),
+        f"{row.count / len(ALL_IVS):.4f}",
+    )
+    return "\t".join(fields)
+
+
+def build_atlas(output: Path, leagues: Iterable[str] = LEAGUES, *, jobs: int | None = None) -> dict[str, int]:
+    """
+    Build the atlas for each league (one worker process per league, or all in this process
+    with `jobs=1`) and write it to `output`. Returns the number of rows per league.
+    """
+
+    names = list(leagues)
+    for name in names:
+        if name not in LEAGUES:
+            raise ValueError(f"Unknown league: {name}")
+
+    if jobs == 1:
+        results = [compute_league_atlas(name) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or len(names)) as pool:
+            results = list(pool.map(compute_league_atlas, names))
+
+    lines = ["\t".join(COLUMNS), *(format_row(row) for rows in results for row in rows)]
+    output.write_text("\n".join(lines) + "\n")
+    return {name: len(rows) for name, rows in zip(names, results, strict=True)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=Path("atlas.tsv"), help="file to write the atlas to")
+    parser.add_argument("--leagues", nargs="+", choices=list(LEAGUES), default=list(LEAGUES))
+    parser.add_argument("--jobs", type=int, help="worker processes (default: one per league)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    counts = build_atlas(args.output, args.leagues, jobs=args.jobs)
+    for name, count in counts.items():
+        print(f"{name}: {count} rows")
+    print(f"Built the atlas in {time.perf_counter() - start:.1f}s -> {args.output}")
+
+    return 0
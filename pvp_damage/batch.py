@@ -0,0 +1,286 @@
+"""
+Run many breakpoint / bulkpoint analyses from one spec file, instead of toggling
+hard-coded functions in scripts/main.py. A spec is a TOML or JSON file like -
+
+    [defaults]
+    league = "great"
+
+    [[analyses]]
+    name = "ape-counter-vs-clodsire"
+    kind = "breakpoints"
+    attacker = "Annihilape"
+    defender = "Clodsire"
+    move = "Counter"
+    defender_ivs = ["rank1", "min_defense", [0, 15, 15]]
+
+    [[analyses]]
+    name = "serperior-vine-whip-vs-swampert"
+    kind = "bulkpoints"
+    attacker = "Serperior"
+    attacker_ivs = [8, 15, 15]
+    defender = "Swampert"
+    defender_shadow = true
+    move = "Vine Whip"
+    league = "ultra"
+    iv_filter = { defense = [10, 15], stamina = [10, 15] }
+
+Every entry is merged on top of `defaults`. Analyses that check the same IV table (the
+attacker's for breakpoints, the defender's for bulkpoints) are grouped together, so
+each table is built once; the groups run in parallel, and each analysis writes its
+results to `<output>/<name>.jsonl` (or `.txt`, with `--format text`).
+
+    python scripts/batch.py spec.toml --output results/ --jobs 4
+"""
+
+import argparse
+import io
+import json
+import time
+import tomllib
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict
+
+from pvp_damage.damage import compute_breakpoints, compute_bulkpoints, compute_iv_possibilities
+from pvp_damage.models.constants import BuffDebuff, IVs, Level
+from pvp_damage.models.moves import Move, get_move_by_name
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies, get_species
+from pvp_damage.report import ConsoleReporter, JsonLinesReporter, Reporter
+from pvp_damage.utils import highest_defense, lowest_defense, rank1
+
+CP_LIMITS = {"great": 1500, "ultra": 2500, "master": 10_000}
+
+# which IVs to use for the side of the matchup that isn't being checked over all IVs
+type Candidate = IVs | Literal["rank1", "min_defense", "max_defense"]
+
+
+class IVFilter(BaseModel):
+    """Inclusive IV ranges; only IV combinations inside all of them are checked."""
+
+    attack: tuple[int, int] = (0, 15)
+    defense: tuple[int, int] = (0, 15)
+    stamina: tuple[int, int] = (0, 15)
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    def matches(self, ivs: IVs) -> bool:
+        return all(lo <= iv <= hi for iv, (lo, hi) in zip(ivs, (self.attack, self.defense, self.stamina), strict=True))
+
+
+class Analysis(BaseModel):
+    """
+    One entry in a spec file.
+
+    breakpoints: check every attacker IV (narrowed by `iv_filter`) against each of
+    `defender_ivs`. bulkpoints: check the attacker with `attacker_ivs` (at `attacker_level`,
+    or the max level for the league) against every defender IV (narrowed by `iv_filter`).
+    """
+
+    name: str
+    kind: Literal["breakpoints", "bulkpoints"]
+    attacker: str
+    defender: str
+    move: str
+    league: Literal["great", "ultra", "master"] = "great"
+    attacker_shadow: bool = False
+    defender_shadow: bool = False
+    attacker_buff: BuffDebuff = 0
+    attacker_ivs: Candidate = "rank1"
+    attacker_level: Level | None = None
+    defender_ivs: list[Candidate] = ["rank1"]
+    iv_filter: IVFilter | None = None
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    @property
+    def cp_limit(self) -> int:
+        return CP_LIMITS[self.league]
+
+    @property
+    def table_key(self) -> tuple[str, bool, int]:
+        """The IV table this analysis checks over; analyses with the same key share it."""
+
+        if self.kind == "breakpoints":
+            return (self.attacker, self.attacker_shadow, self.cp_limit)
+        return (self.defender, self.defender_shadow, self.cp_limit)
+
+
+def load_spec(path: Path) -> list[Analysis]:
+    """Read a TOML or JSON spec file (by extension) into a list of analyses."""
+
+    if path.suffix == ".toml":
+        data = tomllib.loads(path.read_text())
+    elif path.suffix == ".json":
+        data = json.loads(path.read_text())
+    else:
+        raise ValueError(f"Spec must be a .toml or .json file: {path}")
+
+    defaults: dict[str, Any] = data.get("defaults", {})
+    analyses = [Analysis.model_validate(defaults | entry) for entry in data.get("analyses", [])]
+
+    names = [analysis.name for analysis in analyses]
+    if duplicates := sorted({name for name in names if names.count(name) > 1}):
+        raise ValueError(f"Analysis names must be unique: {', '.join(duplicates)}")
+
+    return analyses
+
+
+@cache
+def _species(name: str, shadow: bool) -> PokemonSpecies:
+    return get_species(name, as_shadow=shadow)
+
+
+@cache
+def _move(name: str) -> Move:
+    return get_move_by_name(name)
+
+
+@cache
+def _iv_table(name: str, shadow: bool, cp_limit: int) -> list[Pokemon]:
+    # shared by every analysis (in this process) that needs this species in this league
+    return list(compute_iv_possibilities(_species(name, shadow), cp_limit).values())
+
+
+def _candidates(table: list[Pokemon], iv_filter: IVFilter | None) -> list[Pokemon]:
+    if iv_filter is None:
+        return table
+    return [mon for mon in table if iv_filter.matches(mon.ivs)]
+
+
+def _pick(table: Iterable[Pokemon], candidate: Candidate) -> Pokemon:
+    match candidate:
+        case "rank1":
+            return rank1(table)
+        case "min_defense":
+            return lowest_defense(table)
+        case "max_defense":
+            return highest_defense(table)
+        case ivs:
+            for mon in table:
+                if mon.ivs == ivs:
+                    return mon
+            raise ValueError(f"IVs not in table: {ivs}")
+
+
+def validate(analysis: Analysis) -> None:
+    """Look up the species and move, so that typos fail before anything runs."""
+
+    _species(analysis.attacker, analysis.attacker_shadow)
+    _species(analysis.defender, analysis.defender_shadow)
+    _move(analysis.move)
+
+
+def run_analysis(analysis: Analysis, reporter: Reporter) -> None:
+    move = _move(analysis.move)
+    attacker_species = _species(analysis.attacker, analysis.attacker_shadow)
+    attacker_table = _iv_table(analysis.attacker, analysis.attacker_shadow, analysis.cp_limit)
+    defender_table = _iv_table(analysis.defender, analysis.defender_shadow, analysis.cp_limit)
+
+    if analysis.kind == "breakpoints":
+        attackers = _candidates(attacker_table, analysis.iv_filter)
+        if not attackers:
+            raise ValueError(f"No attacker IVs match the filter in {analysis.name}")
+
+        for candidate in analysis.defender_ivs:
+            compute_breakpoints(
+                attacker_species,
+                _pick(defender_table, candidate),
+                move,
+                analysis.cp_limit,
+                attackers=attackers,
+                attacker_buff=analysis.attacker_buff,
+                reporter=reporter,
+            )
+        return
+
+    attacker = _pick(attacker_table, analysis.attacker_ivs)
+    if analysis.attacker_level is not None:
+        attacker = Pokemon(species=attacker_species, level=analysis.attacker_level, ivs=attacker.ivs)
+
+    defenders = _candidates(defender_table, analysis.iv_filter)
+    if not defenders:
+        raise ValueError(f"No defender IVs match the filter in {analysis.name}")
+
+    compute_bulkpoints(
+        attacker, defenders, move, analysis.cp_limit, attacker_buff=analysis.attacker_buff, reporter=reporter
+    )
+
+
+def run_group(analyses: list[Analysis], text: bool = False) -> list[tuple[str, str, float]]:
+    """Run analyses that share an IV table; returns (name, output, seconds) for each."""
+
+    results: list[tuple[str, str, float]] = []
+    for analysis in analyses:
+        start = time.perf_counter()
+        out = io.StringIO()
+        run_analysis(analysis, ConsoleReporter(out) if text else JsonLinesReporter(out))
+        results.append((analysis.name, out.getvalue(), time.perf_counter() - start))
+
+    return results
+
+
+def run_batch(analyses: list[Analysis], output: Path, *, jobs: int | None = None, text: bool = False) -> dict[str, Any]:
+    """
+    Run all the analyses and write each one's results to the output directory, along with
+    a `summary.json` of what ran and how long it took. Returns that summary.
+
+    jobs: number of worker processes; 1 runs everything in this process.
+    """
+
+    for analysis in analyses:
+        validate(analysis)
+
+    groups: dict[tuple[str, bool, int], list[Analysis]] = {}
+    for analysis in analyses:
+        groups.setdefault(analysis.table_key, []).append(analysis)
+
+    start = time.perf_counter()
+    if jobs == 1:
+        group_results = [run_group(group, text) for group in groups.values()]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_group, group, text) for group in groups.values()]
+            group_results = [future.result() for future in futures]
+
+    output.mkdir(parents=True, exist_ok=True)
+    suffix = ".txt" if text else ".jsonl"
+    timings: dict[str, float] = {}
+    for name, content, elapsed in (result for results in group_results for result in results):
+        (output / f"{name}{suffix}").write_text(content)
+        timings[name] = elapsed
+
+    summary = {
+        "analyses": [
+            {
+                "name": analysis.name,
+                "kind": analysis.kind,
+                "file": f"{analysis.name}{suffix}",
+                "seconds": timings[analysis.name],
+            }
+            for analysis in analyses
+        ],
+        "iv_tables": len(groups),
+        "seconds": time.perf_counter() - start,
+    }
+    (output / "summary.json").write_text(json.dumps(summary, indent=2) + "\n")
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("spec", type=Path, help="TOML or JSON spec file")
+    parser.add_argument("--output", type=Path, default=Path("results"), help="directory to write results to")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--format", choices=["json", "text"], default="json", help="output format")
+    args = parser.parse_args(argv)
+
+    analyses = load_spec(args.spec)
+    summary = run_batch(analyses, args.output, jobs=args.jobs, text=args.format == "text")
+    print(
+        f"Ran {len(analyses)} analyses ({summary["iv_tables"]} IV tables) in {summary["seconds"]:.1f}s -> {args.output}"
+    )
+    return 0
@@ -0,0 +1,164 @@
+"""
+Cheap bounds on damage, for skipping matchups that have no breakpoints (or bulkpoints)
+before building anyone's IV table.
+
+The lowest and highest attack a species can have in a league are found from just 32 IV
+combinations instead of 4096. For a given attack IV, lower defense and stamina IVs
+only ever allow a higher level, so the highest attack is among (a, 0, 0) and the lowest
+among (a, 15, 15), for a = 0..15; defense works the same way. These are the exact
+extremes over all IVs, not just estimates, and damage only goes up with attack (and
+down with defense), so they bound the damage exactly too.
+"""
+
+from dataclasses import dataclass
+from functools import cache
+
+from pvp_damage import instrument
+from pvp_damage.damage import (
+    DamageRanges,
+    calculate_damage,
+    compute_breakpoints,
+    compute_bulkpoints,
+    find_max_level_for_league,
+)
+from pvp_damage.iv_table import get_iv_table
+from pvp_damage.models.constants import BuffDebuff
+from pvp_damage.models.leagues import League
+from pvp_damage.models.moves import FastMove, Move
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+from pvp_damage.report import NULL_REPORTER, Reporter
+from pvp_damage.utils import highest_defense, lowest_defense
+
+
+@dataclass(frozen=True)
+class StatBounds:
+    """The Pokemon with the lowest and highest attack and defense for a species in a league."""
+
+    min_attack: Pokemon
+    max_attack: Pokemon
+    min_defense: Pokemon
+    max_defense: Pokemon
+
+
+@cache
+def compute_stat_bounds(species: PokemonSpecies, cp_limit: int) -> StatBounds:
+    instrument.count("stat_bounds")
+
+    ivs = range(16)
+    return StatBounds(
+        min_attack=min(
+            (find_max_level_for_league(species, (iv, 15, 15), cp_limit) for iv in ivs), key=lambda mon: mon.attack_stat
+        ),
+        max_attack=max(
+            (find_max_level_for_league(species, (iv, 0, 0), cp_limit) for iv in ivs), key=lambda mon: mon.attack_stat
+        ),
+        min_defense=lowest_defense(find_max_level_for_league(species, (15, iv, 15), cp_limit) for iv in ivs),
+        max_defense=highest_defense(find_max_level_for_league(species, (0, iv, 0), cp_limit) for iv in ivs),
+    )
+
+
+def breakpoint_bounds(
+    attacker_species: PokemonSpecies,
+    defender: Pokemon,
+    move: Move,
+    cp_limit: int,
+    *,
+    attacker_buff: BuffDebuff = 0,
+) -> tuple[int, int]:
+    """The min and max damage that `compute_breakpoints` would find, without running it."""
+
+    bounds = compute_stat_bounds(attacker_species, cp_limit)
+    return (
+        calculate_damage(move, bounds.min_attack, defender, attacker_buff=attacker_buff),
+        calculate_damage(move, bounds.max_attack, defender, attacker_buff=attacker_buff),
+    )
+
+
+def bulkpoint_bounds(
+    attacker: Pokemon,
+    defender_species: PokemonSpecies,
+    move: Move,
+    cp_limit: int,
+    *,
+    attacker_buff: BuffDebuff = 0,
+) -> tuple[int, int]:
+    """The min and max damage that `compute_bulkpoints` would find, without running it."""
+
+    bounds = compute_stat_bounds(defender_species, cp_limit)
+    return (
+        calculate_damage(move, attacker, bounds.max_defense, attacker_buff=attacker_buff),
+        calculate_damage(move, attacker, bounds.min_defense, attacker_buff=attacker_buff),
+    )
+
+
+@dataclass(frozen=True)
+class MetaSweep:
+    """
+    Results for pairs of meta entries, keyed by (attacker, move, defender) using species
+    keys and move IDs. Pairs that were skipped because their damage can't vary are left
+    out, and only counted in `pruned`.
+    """
+
+    results: dict[tuple[str, str, str], DamageRanges]
+    pruned: int
+
+    @property
+    def checked(self) -> int:
+        return len(self.results) + self.pruned
+
+
+def meta_pairs(league: League) -> list[tuple[PokemonSpecies, FastMove, PokemonSpecies]]:
+    """Every (attacker, fast move, defender) in the league's meta, attackers and defenders in meta order."""
+
+    # meta entries can repeat a species with different charged moves; only the fast move matters here
+    attackers = {(species.key, moveset.fast.move_id): (species, moveset.fast) for species, moveset in league.meta}
+    defenders = {species.key: species for species, _moveset in league.meta}
+    return [(attacker, move, defender) for attacker, move in attackers.values() for defender in defenders.values()]
+
+
+def sweep_meta_breakpoints(league: League, *, prune: bool = True, reporter: Reporter = NULL_REPORTER) -> MetaSweep:
+    """
+    `compute_breakpoints` for each meta entry's fast move against the rank 1 of each meta
+    species. With `prune`, matchups whose damage bounds are equal are skipped before the
+    attacker's Pokemon are built.
+    """
+
+    results: dict[tuple[str, str, str], DamageRanges] = {}
+    pruned = 0
+    for attacker, move, defender_species in meta_pairs(league):
+        defender = get_iv_table(defender_species, league.max_cp).rank1()
+        if prune:
+            min_damage, max_damage = breakpoint_bounds(attacker, defender, move, league.max_cp)
+            if min_damage == max_damage:
+                pruned += 1
+                continue
+
+        key = (attacker.key, move.move_id, defender_species.key)
+        results[key] = compute_breakpoints(attacker, defender, move, league.max_cp, reporter=reporter)
+
+    instrument.count("bounds.pruned", pruned)
+    return MetaSweep(results=results, pruned=pruned)
+
+
+def sweep_meta_bulkpoints(league: League, *, prune: bool = True, reporter: Reporter = NULL_REPORTER) -> MetaSweep:
+    """
+    `compute_bulkpoints` for the rank 1 of each meta entry, using its fast move, against
+    each meta species. With `prune`, matchups whose damage bounds are equal are skipped
+    before the defender's Pokemon are built.
+    """
+
+    results: dict[tuple[str, str, str], DamageRanges] = {}
+    pruned = 0
+    for attacker_species, move, defender in meta_pairs(league):
+        attacker = get_iv_table(attacker_species, league.max_cp).rank1()
+        if prune:
+            min_damage, max_damage = bulkpoint_bounds(attacker, defender, move, league.max_cp)
+            if min_damage == max_damage:
+                pruned += 1
+                continue
+
+        key = (attacker_species.key, move.move_id, defender.key)
+        results[key] = compute_bulkpoints(attacker, defender, move, league.max_cp, reporter=reporter)
+
+    instrument.count("bounds.pruned", pruned)
+    return MetaSweep(results=results, pruned=pruned)
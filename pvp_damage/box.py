@@ -0,0 +1,266 @@
+"""
+Evaluate a player's whole box (an exported CSV of their Pokemon) against league metas,
+without building a `Pokemon` per row.
+
+The CSV needs a header with `species` (a species ID like "medicham", or a name),
+`attack`, `defense`, `stamina` (IVs) and `level` columns, and optionally `shadow`
+(true/false) and `fast_move` (a move name). It's read `chunk_size` rows at a time; each
+chunk is grouped by species, each group becomes an `IVTable` (with the levels from the
+file, rather than the max level for a league), and every group is scored against each
+league's meta with vectorized damage, like `recommend_ivs`:
+
+- breakpoints: the extra fast move damage done to the rank 1 of each meta species,
+  compared to the weakest IVs at the league's max level, summed over the meta
+  (negative for Pokemon that aren't powered up far enough)
+- bulkpoints: the fast move damage avoided from the rank 1 of each meta entry, compared
+  to the frailest IVs at the league's max level, summed over the meta
+
+Each row is scored with its `fast_move`, or with every fast move its species learns.
+Results are written as CSV as each chunk finishes, so memory use depends on the chunk
+size and not on the size of the box. Rows over a league's CP limit are left out of
+that league, and rows that can't be read (e.g., unknown species) are skipped.
+
+    python scripts/evaluate_box.py box.csv --output box_results.csv
+"""
+
+import argparse
+import csv
+import itertools
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import TextIO
+
+import numpy as np
+
+from pvp_damage import instrument
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import FloatArray, IntArray, IVTable, get_iv_table
+from pvp_damage.models.leagues import LEAGUES
+from pvp_damage.models.moves import FastMove, get_fast_move
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies, get_species, get_species_by_id
+from pvp_damage.sweep import rank1_defenders
+
+COLUMNS = (
+    "row",
+    "species",
+    "attack",
+    "defense",
+    "stamina",
+    "level",
+    "league",
+    "cp",
+    "move",
+    "breakpoints",
+    "max_breakpoints",
+    "bulkpoints",
+    "max_bulkpoints",
+)
+
+
+@dataclass(frozen=True)
+class BoxRow:
+    row: int
+    species: PokemonSpecies
+    ivs: tuple[int, int, int]
+    level: float
+    fast_move: FastMove | None
+
+
+@dataclass
+class BoxSummary:
+    rows: int = 0
+    skipped: int = 0
+    ineligible: int = 0
+    written: int = 0
+    seconds: float = 0
+
+
+@cache
+def _species(name: str, shadow: bool) -> PokemonSpecies:
+    try:
+        return get_species_by_id(name, as_shadow=shadow)
+    except ValueError:
+        return get_species(name, as_shadow=shadow)
+
+
+def _parse(row: int, record: dict[str, str]) -> BoxRow:
+    shadow = record.get("shadow", "").strip().lower() in {"1", "true", "yes", "shadow"}
+    move = record.get("fast_move", "").strip()
+    return BoxRow(
+        row=row,
+        species=_species(record["species"].strip(), shadow),
+        ivs=(int(record["attack"]), int(record["defense"]), int(record["stamina"])),
+        level=float(record["level"]),
+        fast_move=get_fast_move(move) if move else None,
+    )
+
+
+def read_box(source: TextIO, summary: BoxSummary) -> Iterator[BoxRow]:
+    """Parse rows one at a time, counting (and skipping) the ones that can't be read."""
+
+    for row, record in enumerate(csv.DictReader(source)):
+        summary.rows += 1
+        try:
+            parsed = _parse(row, record)
+        except (KeyError, TypeError, ValueError):
+            summary.skipped += 1
+            continue
+
+        if not all(0 <= iv <= 15 for iv in parsed.ivs) or not (1 <= parsed.level <= 51 and parsed.level * 2 % 1 == 0):
+            summary.skipped += 1
+            continue
+
+        yield parsed
+
+
+@dataclass(frozen=True)
+class _MetaOpponents:
+    # the rank 1 of each meta species (for breakpoints), and of each meta entry with its fast move (for bulkpoints)
+    defenders: list[Pokemon]
+    attackers: list[tuple[Pokemon, FastMove]]
+
+
+@cache
+def _opponents(league: str) -> _MetaOpponents:
+    meta = LEAGUES[league]
+    rank1s = {mon.species: mon for mon in rank1_defenders(meta)}
+    return _MetaOpponents(
+        defenders=list(rank1s.values()),
+        attackers=[(rank1s[species], moveset.fast) for species, moveset in meta.meta],
+    )
+
+
+def _damage_dealt(species: PokemonSpecies, move: FastMove, attack: FloatArray, league: str) -> IntArray:
+    """(meta defenders, rows) fast move damage."""
+
+    return np.stack([
+        calculate_damage_array(move, species, attack, defender.species, defender.defense_stat)
+        for defender in _opponents(league).defenders
+    ])
+
+
+def _damage_taken(species: PokemonSpecies, defense: FloatArray, league: str) -> IntArray:
+    """(meta entries, rows) fast move damage."""
+
+    return np.stack([
+        calculate_damage_array(move, attacker.species, attacker.attack_stat, species, defense)
+        for attacker, move in _opponents(league).attackers
+    ])
+
+
+@cache
+def _dealt_range(species: PokemonSpecies, move: FastMove, league: str) -> tuple[IntArray, int]:
+    """Per meta defender, the least damage any IVs do at the max level; and the most breakpoints possible."""
+
+    table = get_iv_table(species, LEAGUES[league].max_cp)
+    attack = np.array([table.attack_stat.min(), table.attack_stat.max()])
+    low, high = _damage_dealt(species, move, attack, league).T
+    return low, int((high - low).sum())
+
+
+@cache
+def _taken_range(species: PokemonSpecies, league: str) -> tuple[IntArray, int]:
+    """Per meta attacker, the most damage any IVs take at the max level; and the most bulkpoints possible."""
+
+    table = get_iv_table(species, LEAGUES[league].max_cp)
+    defense = np.array([table.defense_stat.min(), table.defense_stat.max()])
+    high, low = _damage_taken(species, defense, league).T
+    return high, int((high - low).sum())
+
+
+def evaluate_group(species: PokemonSpecies, rows: list[BoxRow], league: str) -> Iterator[list[object]]:
+    """Score one species' rows (from one chunk) against one league, as output records."""
+
+    ivs = np.array([row.ivs for row in rows], dtype=np.int64)
+    levels = np.array([row.level for row in rows], dtype=np.float64)
+    table = IVTable(species=species, cp_limit=LEAGUES[league].max_cp, ivs=ivs, levels=levels)
+    eligible = np.flatnonzero(table.cp <= table.cp_limit)
+    if not len(eligible):
+        return
+
+    table = table.take(eligible)
+    rows = [rows[i] for i in eligible]
+
+    most_taken, max_bulkpoints = _taken_range(species, league)
+    bulkpoints = (most_taken[:, None] - _damage_taken(species, table.defense_stat, league)).sum(axis=0)
+
+    # rows without a fast move are scored with every fast move the species has
+    moves: set[FastMove] = {row.fast_move for row in rows if row.fast_move is not None}
+    if any(row.fast_move is None for row in rows):
+        moves |= species.fast_moves
+
+    for move in sorted(moves, key=lambda move: move.name):
+        least_dealt, max_breakpoints = _dealt_range(species, move, league)
+        breakpoints = (_damage_dealt(species, move, table.attack_stat, league) - least_dealt[:, None]).sum(axis=0)
+        for i, row in enumerate(rows):
+            if row.fast_move is not None and row.fast_move != move:
+                continue
+
+            yield [
+                row.row,
+                species.key,
+                *row.ivs,
+                row.level,
+                league,
+                int(table.cp[i]),
+                move.move_id,
+                int(breakpoints[i]),
+                max_breakpoints,
+                int(bulkpoints[i]),
+                max_bulkpoints,
+            ]
+
+
+def evaluate_box(
+    source: TextIO, output: TextIO, leagues: Iterable[str] = LEAGUES, *, chunk_size: int = 10_000
+) -> BoxSummary:
+    """Read the box from `source` a chunk at a time, and write each chunk's results to `output`."""
+
+    leagues = list(leagues)
+    if unknown := [league for league in leagues if league not in LEAGUES]:
+        raise ValueError(f"Unknown leagues: {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    summary = BoxSummary()
+    writer = csv.writer(output)
+    writer.writerow(COLUMNS)
+
+    rows = read_box(source, summary)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        with instrument.span("evaluate_box.chunk"):
+            groups: dict[PokemonSpecies, list[BoxRow]] = {}
+            for row in chunk:
+                groups.setdefault(row.species, []).append(row)
+
+            for league in leagues:
+                for species, group in groups.items():
+                    records = list(evaluate_group(species, group, league))
+                    summary.ineligible += len(group) - len({record[0] for record in records})
+                    summary.written += len(records)
+                    writer.writerows(records)
+
+        output.flush()
+
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("box", type=Path, help="CSV export of the box")
+    parser.add_argument("--output", type=Path, default=Path("box_results.csv"), help="CSV file to write results to")
+    parser.add_argument("--leagues", nargs="+", choices=list(LEAGUES), default=list(LEAGUES))
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="rows to read and evaluate at a time")
+    args = parser.parse_args(argv)
+
+    with args.box.open(newline="") as source, args.output.open("w", newline="") as output:
+        summary = evaluate_box(source, output, args.leagues, chunk_size=args.chunk_size)
+
+    print(
+        f"Read {summary.rows} rows ({summary.skipped} skipped) and wrote {summary.written} results in "
+        f"{summary.seconds:.1f}s -> {args.output}; {summary.ineligible} (row, league) pairs were over the CP limit"
+    )
+    return 0
@@ -0,0 +1,306 @@
+"""
+Checkpointing for long sweeps (e.g., every species in every league against the meta),
+so that a crash or a Ctrl-C doesn't throw away hours of work.
+
+A sweep is split into work units. Each finished unit is saved to a SQLite file along
+with its parameters and the hash of the gamemaster it was computed with. Rerunning the
+same sweep skips every unit that is already saved; a unit whose parameters changed (which
+include a hash of the league file), or that was computed with a different gamemaster, is
+run again (unless `carry_over` finds that a gamemaster refresh didn't affect it; see
+pvp_damage/refresh.py).
+
+    with CheckpointStore(Path("sweeps.sqlite")) as store:
+        run_units(sweep_units(POKEMON, ["great", "ultra"]), store, on_progress=print)
+        sweep = load_sweep(store, "azumarill:great")
+"""
+
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.constants import GAMEMASTER_HASH
+from pvp_damage.models.leagues import DATA_DIR, LEAGUES
+from pvp_damage.models.moves import ChargedMove, Move, get_charged_move_by_id, get_fast_move_by_id
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies, get_species_by_id
+from pvp_damage.sweep import MoveSweep, sweep_moves
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """One piece of a sweep: `run` computes it and returns the result to save."""
+
+    key: str
+    params: dict[str, Any]
+    run: Callable[[], bytes]
+
+
+def _params_json(params: dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+class CheckpointStore:
+    """Finished work units, saved in a SQLite file and keyed by unit and gamemaster hash."""
+
+    def __init__(self, path: Path, gamemaster_hash: str = GAMEMASTER_HASH):
+        self.gamemaster_hash = gamemaster_hash
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS units (
+                key TEXT NOT NULL,
+                gamemaster TEXT NOT NULL,
+                params TEXT NOT NULL,
+                result BLOB NOT NULL,
+                seconds REAL NOT NULL,
+                PRIMARY KEY (key, gamemaster)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def completed(self) -> dict[str, str]:
+        """Keys of the units finished with this gamemaster, and their parameters (as JSON)."""
+
+        rows = self.connection.execute("SELECT key, params FROM units WHERE gamemaster = ?", (self.gamemaster_hash,))
+        return dict(rows.fetchall())
+
+    def is_done(self, unit: WorkUnit) -> bool:
+        row = self.connection.execute(
+            "SELECT params FROM units WHERE key = ? AND gamemaster = ?", (unit.key, self.gamemaster_hash)
+        ).fetchone()
+        return row is not None and row[0] == _params_json(unit.params)
+
+    def save(self, unit: WorkUnit, result: bytes, seconds: float) -> None:
+        # one transaction per unit, so a crash loses at most the unit in progress
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?, ?)",
+                (unit.key, self.gamemaster_hash, _params_json(unit.params), result, seconds),
+            )
+
+    def load(self, key: str) -> tuple[dict[str, Any], bytes]:
+        """The parameters and result of a finished unit."""
+
+        row = self.connection.execute(
+            "SELECT params, result FROM units WHERE key = ? AND gamemaster = ?", (key, self.gamemaster_hash)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"No checkpoint for {key} with gamemaster {self.gamemaster_hash[:12]}")
+
+        return json.loads(row[0]), row[1]
+
+    def carry_over(self, old_hash: str, keep: Callable[[dict[str, Any], bytes], bool]) -> tuple[int, int]:
+        """
+        After a gamemaster refresh, copy the units saved with `old_hash` that are still valid
+        (`keep(params, result)`, e.g. `ChangeSet.keeps_sweep`) to this gamemaster, so they
+        aren't run again. Returns how many units were (kept, dropped); when the hash didn't
+        change (e.g., only a league's meta did), the dropped units are deleted.
+        """
+
+        rows = self.connection.execute(
+            "SELECT key, params, result, seconds FROM units WHERE gamemaster = ?", (old_hash,)
+        ).fetchall()
+
+        kept: list[tuple[Any, ...]] = []
+        dropped: list[tuple[Any, ...]] = []
+        for row in rows:
+            (kept if keep(json.loads(row[1]), row[2]) else dropped).append(row)
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO units VALUES (?, ?, ?, ?, ?)",
+                [(key, self.gamemaster_hash, params, result, seconds) for key, params, result, seconds in kept],
+            )
+            if old_hash == self.gamemaster_hash:
+                self.connection.executemany(
+                    "DELETE FROM units WHERE key = ? AND gamemaster = ?", [(row[0], old_hash) for row in dropped]
+                )
+
+        return len(kept), len(dropped)
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+@dataclass(frozen=True)
+class Progress:
+    """
+    How far along a sweep is. `done` includes the `skipped` units that were already in
+    the store, but the ETA only uses the units run this time, since skipping is free.
+    """
+
+    total: int
+    done: int
+    skipped: int
+    elapsed: float
+    cancelled: bool = False
+
+    @property
+    def eta(self) -> float | None:
+        ran = self.done - self.skipped
+        if not ran:
+            return None
+        return self.elapsed / ran * (self.total - self.done)
+
+    def __str__(self) -> str:
+        eta = "?" if self.eta is None else _format_seconds(self.eta)
+        status = " (cancelled)" if self.cancelled else ""
+        return (
+            f"{self.done}/{self.total} units ({self.skipped} from checkpoint), "
+            f"{_format_seconds(self.elapsed)} elapsed, ETA {eta}{status}"
+        )
+
+
+def run_units(
+    units: Sequence[WorkUnit],
+    store: CheckpointStore,
+    *,
+    on_progress: Callable[[Progress], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> Progress:
+    """
+    Run every unit that isn't already in the store, saving each one as it finishes.
+
+    on_progress: called after every unit that runs (and once at the start).
+    cancel: when set (e.g., from a signal handler or another thread), stop after the
+    unit in progress; everything finished so far stays saved, so the next run resumes.
+    """
+
+    pending = [unit for unit in units if not store.is_done(unit)]
+    skipped = len(units) - len(pending)
+
+    start = time.perf_counter()
+    progress = Progress(total=len(units), done=skipped, skipped=skipped, elapsed=0)
+    if on_progress is not None:
+        on_progress(progress)
+
+    for unit in pending:
+        if cancel is not None and cancel.is_set():
+            progress = Progress(progress.total, progress.done, skipped, time.perf_counter() - start, cancelled=True)
+            break
+
+        unit_start = time.perf_counter()
+        result = unit.run()
+        store.save(unit, result, time.perf_counter() - unit_start)
+
+        progress = Progress(progress.total, progress.done + 1, skipped, time.perf_counter() - start)
+        if on_progress is not None:
+            on_progress(progress)
+
+    return progress
+
+
+def _save_sweep(sweep: MoveSweep) -> bytes:
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        damage=sweep.damage.astype(np.int32),
+        moves=np.array([move.move_id for move in sweep.moves]),
+        charged=np.array([isinstance(move, ChargedMove) for move in sweep.moves], dtype=np.bool_),
+        defender_species=np.array([mon.species.id for mon in sweep.defenders]),
+        defender_shadow=np.array([mon.species.is_shadow for mon in sweep.defenders], dtype=np.bool_),
+        defender_ivs=np.array([mon.ivs for mon in sweep.defenders], dtype=np.int64).reshape(-1, 3),
+        defender_levels=np.array([mon.level for mon in sweep.defenders], dtype=np.float64),
+    )
+    return buffer.getvalue()
+
+
+@cache
+def _league_hash(league: str) -> str:
+    return hashlib.sha256((DATA_DIR / f"{league}.json").read_bytes()).hexdigest()
+
+
+def sweep_unit(species: PokemonSpecies, league: str, *, include_charged: bool = False) -> WorkUnit:
+    """`sweep_moves` for one species against the rank 1s of one league's meta."""
+
+    def run() -> bytes:
+        return _save_sweep(sweep_moves(species, LEAGUES[league], include_charged=include_charged))
+
+    return WorkUnit(
+        key=f"{species.key}:{league}",
+        params={
+            "species": species.id,
+            "shadow": species.is_shadow,
+            "league": league,
+            # the meta is loaded from this file, so a new meta means new results
+            "league_hash": _league_hash(league),
+            "include_charged": include_charged,
+        },
+        run=run,
+    )
+
+
+def sweep_units(
+    species: Iterable[PokemonSpecies], leagues: Iterable[str], *, include_charged: bool = False
+) -> list[WorkUnit]:
+    leagues = list(leagues)
+    if unknown := [league for league in leagues if league not in LEAGUES]:
+        raise ValueError(f"Unknown leagues: {', '.join(unknown)}")
+
+    return [sweep_unit(mon, league, include_charged=include_charged) for mon in species for league in leagues]
+
+
+def decode_sweep(result: bytes) -> dict[str, npt.NDArray[Any]]:
+    """
+    The arrays a `sweep_unit` saved, by name: `damage`, `moves` (IDs) and `charged`, and
+    `defender_species` (IDs), `defender_shadow`, `defender_ivs` and `defender_levels`.
+    """
+
+    with np.load(io.BytesIO(result)) as data:
+        return dict(data)
+
+
+def load_sweep(store: CheckpointStore, key: str) -> MoveSweep:
+    """Rebuild the `MoveSweep` that a `sweep_unit` saved."""
+
+    params, result = store.load(key)
+    data = decode_sweep(result)
+    species = get_species_by_id(params["species"], as_shadow=params["shadow"])
+    moves: list[Move] = [
+        get_charged_move_by_id(move_id) if charged else get_fast_move_by_id(move_id)
+        for move_id, charged in zip(data["moves"].tolist(), data["charged"].tolist(), strict=True)
+    ]
+    defenders = [
+        Pokemon(species=get_species_by_id(species_id, as_shadow=shadow), level=level, ivs=tuple(ivs))
+        for species_id, shadow, ivs, level in zip(
+            data["defender_species"].tolist(),
+            data["defender_shadow"].tolist(),
+            data["defender_ivs"].tolist(),
+            data["defender_levels"].tolist(),
+            strict=True,
+        )
+    ]
+
+    return MoveSweep(
+        attackers=compute_iv_table(species, LEAGUES[params["league"]].max_cp),
+        moves=moves,
+        defenders=defenders,
+        damage=data["damage"].astype(np.int64),
+    )
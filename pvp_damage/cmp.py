@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from pvp_damage.iv_table import FloatArray, IVTable, compute_iv_table, get_iv_table
+from pvp_damage.models.leagues import League
+from pvp_damage.models.moves import Moveset
+from pvp_damage.models.pokemon import PokemonSpecies
+
+
+@dataclass(frozen=True)
+class CMPMatrix:
+    """
+    Charge Move Priority against a league's meta. When both Pokemon throw a charged move
+    on the same turn, the one with the higher attack stat goes first (ties are random).
+
+    `wins[i, j]` is the fraction of meta entry j's IV spreads that row i of `attackers`
+    has strictly more attack than; `ties[i, j]` is the fraction with exactly the same
+    attack. Both are (len(attackers), len(meta)) arrays.
+    """
+
+    attackers: IVTable
+    meta: list[tuple[PokemonSpecies, Moveset]]
+    wins: FloatArray
+    ties: FloatArray
+
+    @property
+    def losses(self) -> FloatArray:
+        return 1 - self.wins - self.ties
+
+
+def compute_cmp_matrix(attacker: PokemonSpecies | IVTable, league: League) -> CMPMatrix:
+    """
+    Compute, for every IV spread of the attacker, what fraction of each meta opponent's
+    IV spreads it wins CMP against. Each opponent's attack stats are sorted once, and
+    then all of our attack stats are placed into them with a binary search.
+
+    attacker: either a `PokemonSpecies` (we will check over all IVs) or an `IVTable` of
+    candidates.
+    """
+
+    attackers = compute_iv_table(attacker, league.max_cp) if isinstance(attacker, PokemonSpecies) else attacker
+    wins = np.empty((len(attackers), len(league.meta)))
+    ties = np.empty((len(attackers), len(league.meta)))
+
+    # the same species can show up with different movesets; only sort its attack stats once
+    sorted_attack: dict[PokemonSpecies, FloatArray] = {}
+    for j, (species, _moveset) in enumerate(league.meta):
+        if species not in sorted_attack:
+            sorted_attack[species] = np.sort(get_iv_table(species, league.max_cp).attack_stat)
+        opponents = sorted_attack[species]
+
+        weaker = np.searchsorted(opponents, attackers.attack_stat, side="left")
+        weaker_or_tied = np.searchsorted(opponents, attackers.attack_stat, side="right")
+        wins[:, j] = weaker / len(opponents)
+        ties[:, j] = (weaker_or_tied - weaker) / len(opponents)
+
+    return CMPMatrix(attackers=attackers, meta=league.meta, wins=wins, ties=ties)
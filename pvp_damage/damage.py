@@ -2,8 +2,12 @@ import itertools
 from collections.abc import Iterable, Mapping
 from math import floor, sqrt
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel
 
+from pvp_damage import instrument
+from pvp_damage.iv_table import IntArray
 from pvp_damage.models.constants import (
     CP_MULTIPLIERS,
     MAX_CPM,
@@ -16,7 +20,8 @@ from pvp_damage.models.constants import (
 )
 from pvp_damage.models.moves import Move, get_move_effectiveness
 from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
-from pvp_damage.utils import format_defense_range, groupby, sort_attack
+from pvp_damage.report import NULL_REPORTER, Reporter
+from pvp_damage.utils import groupby, sort_attack
 
 
 class DamageRanges(BaseModel):
@@ -42,6 +47,9 @@ def calculate_damage(
     attacker_buff: BuffDebuff = 0,
     defender_buff: BuffDebuff = 0,
 ) -> int:
+    if instrument.active is not None:
+        instrument.active.counters["calculate_damage"] += 1
+
     # type effectiveness, stab
     stab_bonus = STAB_BONUS if is_stab(move, attacker.species) else 1
     type_effectiveness = get_move_effectiveness(move.type, defender.species.types)
@@ -61,6 +69,52 @@ def calculate_damage(
     return floor(damage)
 
 
+def calculate_damage_array(
+    move: Move,
+    attacker_species: PokemonSpecies,
+    attack_stat: npt.ArrayLike,
+    defender_species: PokemonSpecies,
+    defense_stat: npt.ArrayLike,
+    *,
+    attacker_buff: BuffDebuff = 0,
+    defender_buff: BuffDebuff = 0,
+    power: npt.ArrayLike | None = None,
+) -> IntArray:
+    """
+    Vectorized version of `calculate_damage`, for arrays of attack and defense stats.
+    The arrays are broadcast against each other, so an (N, 1) array of attack stats and
+    a (1, M) array of defense stats give an N x M damage matrix.
+
+    power: replaces `move.power`, e.g. with a (P, 1) array of hypothetical values (which
+    is broadcast against the stats too).
+
+    The arithmetic happens in the same order as in `calculate_damage`, so the results
+    are identical (and not just close) to calling it on each pair of Pokemon.
+    """
+
+    if instrument.active is not None:
+        instrument.active.counters["calculate_damage_array"] += 1
+
+    stab_bonus = STAB_BONUS if is_stab(move, attacker_species) else 1
+    type_effectiveness = get_move_effectiveness(move.type, defender_species.types)
+    multipliers = stab_bonus * type_effectiveness
+
+    effective_attack = (
+        np.asarray(attack_stat, dtype=np.float64)
+        * (SHADOW_ATTACK_MULT if attacker_species.is_shadow else 1)
+        * stat_modifier(attacker_buff)
+    )
+    effective_defense = (
+        np.asarray(defense_stat, dtype=np.float64)
+        * (SHADOW_DEF_MULT if defender_species.is_shadow else 1)
+        * stat_modifier(defender_buff)
+    )
+
+    move_power = move.power if power is None else np.asarray(power, dtype=np.float64)
+    damage = (0.5 * 1.3 * effective_attack / effective_defense * multipliers * move_power) + 1
+    return np.floor(damage).astype(np.int64)
+
+
 def find_max_level_for_league(species: PokemonSpecies, ivs: IVs, cp_limit: int) -> Pokemon:
     """
     For a given league, find the max level that a given species with given IVs can be
@@ -80,6 +134,10 @@ def find_max_level_for_league(species: PokemonSpecies, ivs: IVs, cp_limit: int)
     therefore level.
     """
 
+    if instrument.active is not None:
+        instrument.active.counters["find_max_level_for_league"] += 1
+        instrument.active.counters["pokemon"] += 1
+
     att = species.attack + ivs[0]
     dfn = species.defense + ivs[1]
     sta = species.stamina + ivs[2]
@@ -113,8 +171,9 @@ def compute_iv_possibilities(species: PokemonSpecies, cp_limit: int) -> dict[IVs
     from IV combinations to Pokemon instances.
     """
 
-    iv_combinations = itertools.product(range(16), range(16), range(16))
-    out = {ivs: find_max_level_for_league(species, ivs, cp_limit) for ivs in iv_combinations}
+    with instrument.span("compute_iv_possibilities"):
+        iv_combinations = itertools.product(range(16), range(16), range(16))
+        out = {ivs: find_max_level_for_league(species, ivs, cp_limit) for ivs in iv_combinations}
 
     return out
 
@@ -124,6 +183,9 @@ def compute_bulkpoints(
     defender: PokemonSpecies | Iterable[Pokemon],
     move: Move,
     cp_limit: int,
+    *,
+    attacker_buff: BuffDebuff = 0,
+    reporter: Reporter = NULL_REPORTER,
 ) -> DamageRanges:
     """
     Compute the damage that a given attacker does to all possible defenders of a
@@ -132,6 +194,11 @@ def compute_bulkpoints(
 
     defender: either a `PokemonSpecies` (we will check over all IVs) or an iterable of
     `Pokemon` (we will check over the provided candidates).
+
+    attacker_buff: attack stage of the attacker (e.g., after a Power-Up Punch).
+
+    reporter: where to send the results (e.g., `ConsoleReporter()` to print them);
+    by default, nothing is reported.
     """
 
     if isinstance(defender, PokemonSpecies):
@@ -139,19 +206,17 @@ def compute_bulkpoints(
         defenders = sorted(iv_table.values(), key=lambda mon: mon.defense_stat)
     else:
         defenders = sorted(defender, key=lambda mon: mon.defense_stat)
+    if not defenders:
+        raise ValueError("There are no defenders to compute bulkpoints against")
 
-    lowest_defense, *_, highest_defense = defenders
+    lowest_defense, highest_defense = defenders[0], defenders[-1]
     highest_stat_product = sorted(defenders, key=lambda mon: mon.stat_product)[-1]
 
     # first, check if the min and max damage are different at all
-    min_damage = calculate_damage(move, attacker, highest_defense)
-    max_damage = calculate_damage(move, attacker, lowest_defense)
+    min_damage = calculate_damage(move, attacker, highest_defense, attacker_buff=attacker_buff)
+    max_damage = calculate_damage(move, attacker, lowest_defense, attacker_buff=attacker_buff)
     if min_damage == max_damage:
-        print(
-            f"The given {attacker.species.name} ({attacker.ivs}, level {attacker.level}) will always do {min_damage} damage to these {len(defenders)} {defenders[0].species.name}. "
-            + "There are no bulkpoints."
-        )
-        return DamageRanges(
+        result = DamageRanges(
             min_damage=min_damage,
             max_damage=max_damage,
             ranges={min_damage: (lowest_defense, highest_defense)},
@@ -159,30 +224,28 @@ def compute_bulkpoints(
             rank1=highest_stat_product,
             damage_rank1=min_damage,
         )
+        reporter.bulkpoints(attacker, move, result)
+        return result
 
-    # otherwise, brute force the bulkpoints by computing the damage
-    damage_rank1 = calculate_damage(move, attacker, highest_stat_product)
-    damage_vs_all = {defender: calculate_damage(move, attacker, defender) for defender in defenders}
+    # otherwise, group by defense (damage only depends on it), then partition damage vs. the attacker
+    damage_rank1 = calculate_damage(move, attacker, highest_stat_product, attacker_buff=attacker_buff)
     damage_partition: dict[int, set[Pokemon]] = {damage: set() for damage in range(min_damage, max_damage + 1)}
-    for mon, damage in damage_vs_all.items():
-        damage_partition[damage].add(mon)
-
-    print(f"{attacker.species.full_name} using {move}; CP {attacker.cp} (level {attacker.level}, {attacker.ivs})")
-    print(
-        f"vs. {defenders[0].species.full_name} ({format_defense_range(defenders)}); rank 1 {highest_stat_product.defense_stat:.2f} def)"
-    )
+    for defenders_with_this_stat in groupby(defenders, lambda mon: mon.defense_stat).values():
+        damage = calculate_damage(move, attacker, defenders_with_this_stat[0], attacker_buff=attacker_buff)
+        damage_partition[damage].update(defenders_with_this_stat)
 
     ranges: dict[int, tuple[Pokemon, Pokemon]] = {}
     ranges_all: dict[int, set[Pokemon]] = {}
-    for damage in range(min_damage, max_damage + 1):
-        lowest, *_, highest = sorted(damage_partition[damage], key=lambda mon: mon.defense_stat)
-        ranges[damage] = (lowest, highest)
-        ranges_all[damage] = damage_partition[damage]
+    for damage, mons in damage_partition.items():
+        # with only some of the IVs (e.g., a filtered table), a damage value can have no defenders
+        if not mons:
+            continue
 
-        percent = len(damage_partition[damage]) / len(defenders) * 100
-        print(f"- {damage}: {percent:.2f}% of IVs; {format_defense_range([lowest, highest])}")
+        sorted_mons = sorted(mons, key=lambda mon: mon.defense_stat)
+        ranges[damage] = (sorted_mons[0], sorted_mons[-1])
+        ranges_all[damage] = mons
 
-    return DamageRanges(
+    result = DamageRanges(
         min_damage=min_damage,
         max_damage=max_damage,
         ranges=ranges,
@@ -190,6 +253,8 @@ def compute_bulkpoints(
         rank1=highest_stat_product,
         damage_rank1=damage_rank1,
     )
+    reporter.bulkpoints(attacker, move, result)
+    return result
 
 
 def compute_breakpoints(
@@ -198,7 +263,9 @@ def compute_breakpoints(
     move: Move,
     cp_limit: int,
     *,
+    attackers: Iterable[Pokemon] | None = None,
     attacker_buff: BuffDebuff = 0,
+    reporter: Reporter = NULL_REPORTER,
 ) -> DamageRanges:
     """
     Compute the damage that all possible attackers will do to a given defender.
@@ -207,24 +274,34 @@ def compute_breakpoints(
 
     Use case: finding which attackers will do at least X damage to e.g., the rank 1
     Clodsire.
+
+    attackers: the candidates to check (e.g., only IVs we own); by default, all IVs of
+    the attacker species.
+
+    reporter: where to send the results (e.g., `ConsoleReporter()` to print them);
+    by default, nothing is reported.
     """
 
-    iv_table = compute_iv_possibilities(attacker_species, cp_limit)
-    attackers = sort_attack(iv_table.values())
+    if attackers is None:
+        attackers = compute_iv_possibilities(attacker_species, cp_limit).values()
+    attackers = sort_attack(attackers)
+    if not attackers:
+        raise ValueError("There are no attackers to compute breakpoints for")
 
-    lowest_attack, *_, highest_attack = attackers
+    lowest_attack, highest_attack = attackers[0], attackers[-1]
 
     # first, check if the min and max damage are different at all
     min_damage = calculate_damage(move, lowest_attack, defender, attacker_buff=attacker_buff)
     max_damage = calculate_damage(move, highest_attack, defender, attacker_buff=attacker_buff)
     if min_damage == max_damage:
-        print(f"- {min_damage} damage guaranteed (no breakpoints)")
-        return DamageRanges(
+        result = DamageRanges(
             min_damage=min_damage,
             max_damage=max_damage,
             ranges={min_damage: (lowest_attack, highest_attack)},
             ranges_all={min_damage: set(attackers)},
         )
+        reporter.breakpoints(attacker_species, defender, move, result)
+        return result
 
     # sort by attack, then partition damage vs. the defender
     damage_partition: dict[int, set[Pokemon]] = {damage: set() for damage in range(min_damage, max_damage + 1)}
@@ -237,24 +314,22 @@ def compute_breakpoints(
         # For debugging - print every distinct attack value.
         # print(f"Attack {stat:.3f} (level {attacker.level:.1f} & {attacker.attack_iv:2d} IV) | {damage} damage")
 
-    print(
-        f"{attacker_species.full_name} ({lowest_attack.attack_stat:.3f} - {highest_attack.attack_stat:.3f}) using {move}"
-    )
-    print(f"vs. {defender.species.full_name} ({defender.ivs}, level {defender.level})")
-
     ranges: dict[int, tuple[Pokemon, Pokemon]] = {}
     ranges_all: dict[int, set[Pokemon]] = {}
     for damage, mons in sorted(damage_partition.items(), key=lambda x: x[0]):
-        lowest, *_, highest = sorted(mons, key=lambda mon: mon.attack_stat)
-        ranges[damage] = (lowest, highest)
-        ranges_all[damage] = mons
+        # a big jump in damage can skip values, and a value can come from a single IV spread
+        if not mons:
+            continue
 
-        percent = len(mons) / len(iv_table) * 100
-        print(f"- {damage}: {percent:.2f}% of IVs; atk: {lowest.attack_stat:.3f} - {highest.attack_stat:.3f}")
+        sorted_mons = sorted(mons, key=lambda mon: mon.attack_stat)
+        ranges[damage] = (sorted_mons[0], sorted_mons[-1])
+        ranges_all[damage] = mons
 
-    return DamageRanges(
+    result = DamageRanges(
         min_damage=min_damage,
         max_damage=max_damage,
         ranges=ranges,
         ranges_all=ranges_all,
     )
+    reporter.breakpoints(attacker_species, defender, move, result)
+    return result
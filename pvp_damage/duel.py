@@ -0,0 +1,182 @@
+"""
+Simulate one-on-one duels turn by turn, for every IV spread of a Pokemon at once.
+
+Breakpoints and bulkpoints only matter when they change who wins, which damage alone
+can't tell. `simulate_duel` plays out a matchup with fast moves (`FastMove.turns`,
+`energy` and `power`), optionally one charged move per side (thrown as soon as there's
+enough energy), and a fixed number of shields per side (used on the first charged moves
+taken). Either side can be an `IVTable`, so one call simulates e.g. all 4096 attackers
+against one defender -
+
+    result = simulate_duel(
+        Side(get_iv_table(medicham, 1500), counter, ice_punch),
+        Side(defender, dragon_breath, shields=1),
+    )
+    result.outcome      # 1 where Medicham wins, -1 where it loses, 0 for a tie
+    result.hp[0]        # Medicham's HP left
+
+Everything but HP (move timing, energy and shields) is the same for every row, so the
+turns are a Python loop and each turn is a few array operations over the rows that are
+still battling. It's deterministic and simpler than the game: fast moves land at the
+end of their last turn, a charged move takes one turn and doesn't interrupt the other
+side's fast move, and when both sides throw on the same turn the higher attack goes
+first (CMP) and on a tie both land. A duel that runs past `max_turns` is a tie.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from pvp_damage import instrument
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import FloatArray, IntArray, IVTable
+from pvp_damage.models.moves import ChargedMove, FastMove
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+
+MAX_ENERGY = 100
+# 4 minutes, at 0.5 seconds per turn
+MAX_TURNS = 480
+
+
+@dataclass(frozen=True)
+class Side:
+    """One side of a duel; `charged` None means fast moves only."""
+
+    pokemon: Pokemon | IVTable
+    fast: FastMove
+    charged: ChargedMove | None = None
+    shields: int = 0
+
+    @property
+    def species(self) -> PokemonSpecies:
+        return self.pokemon.species
+
+    def stats(self) -> tuple[FloatArray, FloatArray, IntArray]:
+        """Attack, defense and HP, as arrays (with one row for a single Pokemon)."""
+
+        if isinstance(self.pokemon, IVTable):
+            return self.pokemon.attack_stat, self.pokemon.defense_stat, self.pokemon.stamina_stat
+
+        return (
+            np.array([self.pokemon.attack_stat]),
+            np.array([self.pokemon.defense_stat]),
+            np.array([int(self.pokemon.stamina_stat)]),
+        )
+
+
+@dataclass(frozen=True)
+class DuelResult:
+    """
+    One entry per row (the rows of the `IVTable` side, or 1 for two Pokemon): `outcome`
+    is 1 if the first side won, -1 if the second side did and 0 for a tie; `hp` has the
+    HP each side had left, and `turns` how long the duel lasted.
+    """
+
+    outcome: IntArray
+    hp: tuple[IntArray, IntArray]
+    turns: IntArray
+
+    def __len__(self) -> int:
+        return len(self.outcome)
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of rows that the first side wins."""
+
+        return float((self.outcome == 1).mean())
+
+    def hp_distribution(self, side: int = 0) -> dict[int, int]:
+        """How many rows end with each amount of HP left for one side (0 or 1)."""
+
+        values, counts = np.unique(self.hp[side], return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist(), strict=True))
+
+
+def simulate_duel(first: Side, second: Side, *, max_turns: int = MAX_TURNS) -> DuelResult:
+    sides = (first, second)
+    if any(not 0 <= side.shields <= 2 for side in sides):
+        raise ValueError(f"Shields must be between 0 and 2, not {first.shields} and {second.shields}")
+
+    instrument.count("simulate_duel")
+
+    (attack_0, defense_0, hp_0), (attack_1, defense_1, hp_1) = first.stats(), second.stats()
+    rows = np.broadcast_shapes(hp_0.shape, hp_1.shape)
+    hp = [np.broadcast_to(hp_0, rows).copy(), np.broadcast_to(hp_1, rows).copy()]
+
+    # damage each side does to the other, per row
+    def damage(move: FastMove | ChargedMove, k: int) -> IntArray:
+        attacker, defender = (attack_0, defense_1) if k == 0 else (attack_1, defense_0)
+        dealt = calculate_damage_array(move, sides[k].species, attacker, sides[1 - k].species, defender)
+        return np.broadcast_to(dealt, rows)
+
+    fast_damage = [damage(side.fast, k) for k, side in enumerate(sides)]
+    charged_damage = [
+        damage(side.charged, k) if side.charged else np.zeros(rows, dtype=np.int64) for k, side in enumerate(sides)
+    ]
+    goes_first = [np.broadcast_to(attack_0 > attack_1, rows), np.broadcast_to(attack_1 > attack_0, rows)]
+
+    energy = [0, 0]
+    shields = [first.shields, second.shields]
+    cooldown = [0, 0]
+
+    active = np.ones(rows, dtype=np.bool_)
+    outcome = np.zeros(rows, dtype=np.int64)
+    turns = np.full(rows, max_turns, dtype=np.int64)
+
+    for turn in range(1, max_turns + 1):
+        # charged moves, from sides that aren't in the middle of a fast move
+        throwing = [
+            cooldown[k] == 0 and side.charged is not None and energy[k] >= side.charged.energy
+            for k, side in enumerate(sides)
+        ]
+        dealt: list[int | IntArray] = []
+        for k, side in enumerate(sides):
+            charged = side.charged
+            if not throwing[k] or charged is None:
+                dealt.append(0)
+                continue
+
+            energy[k] -= charged.energy
+            if shields[1 - k]:
+                shields[1 - k] -= 1
+                dealt.append(1)
+            else:
+                dealt.append(charged_damage[k])
+
+        if all(throwing):
+            # the second move only lands if the one that went first didn't faint its thrower
+            lands_on_1 = ~goes_first[1] | (hp[0] - dealt[1] > 0)
+            lands_on_0 = ~goes_first[0] | (hp[1] - dealt[0] > 0)
+            hp[1] -= np.where(active & lands_on_1, dealt[0], 0)
+            hp[0] -= np.where(active & lands_on_0, dealt[1], 0)
+        else:
+            hp[1] -= np.where(active, dealt[0], 0)
+            hp[0] -= np.where(active, dealt[1], 0)
+
+        # fast moves start on free turns, and land at the end of their last turn
+        landed: list[bool] = []
+        for k, side in enumerate(sides):
+            if cooldown[k] == 0 and not throwing[k]:
+                cooldown[k] = side.fast.turns
+            if cooldown[k]:
+                cooldown[k] -= 1
+            landed.append(cooldown[k] == 0 and not throwing[k])
+
+        for k, side in enumerate(sides):
+            if landed[k]:
+                hp[1 - k] -= np.where(active, fast_damage[k], 0)
+                energy[k] = min(MAX_ENERGY, energy[k] + side.fast.energy)
+
+        fainted = [hp[0] <= 0, hp[1] <= 0]
+        over = active & (fainted[0] | fainted[1])
+        outcome[over] = fainted[1][over].astype(np.int64) - fainted[0][over].astype(np.int64)
+        turns[over] = turn
+        active &= ~over
+        if not active.any():
+            break
+
+    return DuelResult(
+        outcome=outcome,
+        hp=(np.maximum(hp[0], 0), np.maximum(hp[1], 0)),
+        turns=turns,
+    )
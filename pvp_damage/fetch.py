@@ -0,0 +1,157 @@
+"""
+Download the gamemaster and league files from PVPoke's GitHub into `data/`.
+
+Every file (the three parts of the gamemaster, and each league group) is requested
+concurrently over one client. The ETag and Last-Modified of each response are kept in
+`data/fetch_state.json` and sent back next time, so files that haven't changed upstream
+come back as 304s without a body; a local file is only rewritten if its contents changed.
+A 304 for one part of the gamemaster is filled in from the gamemaster already on disk.
+
+Like before, what changed is written to `data/changes.json` (see pvp_damage/refresh.py).
+
+    python scripts/fetch_data.py
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from pvp_damage.refresh import ChangeSet
+
+PVPOKE_URL = "https://raw.githubusercontent.com/pvpoke/pvpoke/master/src/data/"
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+GAMEMASTER_PARTS = ("base", "pokemon", "moves")
+LEAGUE_GROUPS = ("great", "ultra", "master")
+
+
+@dataclass(frozen=True)
+class Fetched:
+    """One response: `data` is None if the file hasn't changed since `validators` were saved."""
+
+    path: str
+    data: Any | None
+    validators: dict[str, str]
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """The files that were rewritten (by name, e.g. "great.json"), and what changed in them."""
+
+    written: list[str]
+    not_modified: list[str]
+    changes: ChangeSet
+
+
+async def _fetch(client: httpx.AsyncClient, path: str, validators: dict[str, str]) -> Fetched:
+    headers: dict[str, str] = {}
+    if etag := validators.get("etag"):
+        headers["If-None-Match"] = etag
+    if last_modified := validators.get("last_modified"):
+        headers["If-Modified-Since"] = last_modified
+
+    response = await client.get(path, headers=headers)
+    if response.status_code == int(httpx.codes.NOT_MODIFIED):
+        return Fetched(path=path, data=None, validators=validators)
+
+    response.raise_for_status()
+    saved = {
+        key: value
+        for key, value in (
+            ("etag", response.headers.get("ETag")),
+            ("last_modified", response.headers.get("Last-Modified")),
+        )
+        if value
+    }
+    return Fetched(path=path, data=response.json(), validators=saved)
+
+
+async def fetch_all(base_url: str, state: dict[str, dict[str, str]]) -> dict[str, Fetched]:
+    """Request every gamemaster part and league group at once; keyed by path (e.g. "groups/great.json")."""
+
+    paths = [f"gamemaster/{part}.json" for part in GAMEMASTER_PARTS] + [f"groups/{name}.json" for name in LEAGUE_GROUPS]
+    limits = httpx.Limits(max_connections=len(paths), max_keepalive_connections=len(paths))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        responses = await asyncio.gather(*(_fetch(client, path, state.get(path, {})) for path in paths))
+
+    return {fetched.path: fetched for fetched in responses}
+
+
+def _dump(data: Any) -> bytes:
+    return json.dumps(data, indent=2).encode()
+
+
+def _gamemaster(fetched: dict[str, Fetched], current: bytes) -> bytes | None:
+    """
+    Start with base.json, then merge in pokemon.json and moves.json; those are stored
+    separately upstream (probably for clearer diffs?), but it's easier for us to keep it
+    all together. Parts that weren't modified are taken from the current gamemaster, and
+    if none were, there's nothing to write (None).
+    """
+
+    parts = {part: fetched[f"gamemaster/{part}.json"].data for part in GAMEMASTER_PARTS}
+    if all(data is None for data in parts.values()):
+        return None
+
+    old: dict[str, Any] = json.loads(current) if any(data is None for data in parts.values()) else {}
+    base: dict[str, Any] = (
+        parts["base"] if parts["base"] is not None else {k: v for k, v in old.items() if k not in {"pokemon", "moves"}}
+    )
+    base["pokemon"] = parts["pokemon"] if parts["pokemon"] is not None else old["pokemon"]
+    base["moves"] = parts["moves"] if parts["moves"] is not None else old["moves"]
+    return _dump(base)
+
+
+def refresh(data_dir: Path = DATA_DIR, base_url: str = PVPOKE_URL) -> FetchResult:
+    """
+    Fetch everything, rewrite the files in `data_dir` whose contents changed, and save the
+    validators and the change set next to them.
+    """
+
+    state_path = data_dir / "fetch_state.json"
+    state: dict[str, dict[str, str]] = json.loads(state_path.read_text()) if state_path.exists() else {}
+    fetched = asyncio.run(fetch_all(base_url, state))
+
+    gamemaster_path = data_dir / "gamemaster.json"
+    old_gamemaster = gamemaster_path.read_bytes()
+    old_leagues = {name: (data_dir / f"{name}.json").read_bytes() for name in LEAGUE_GROUPS}
+
+    new_files = {"gamemaster.json": _gamemaster(fetched, old_gamemaster)}
+    for name in LEAGUE_GROUPS:
+        data = fetched[f"groups/{name}.json"].data
+        new_files[f"{name}.json"] = None if data is None else _dump(data)
+
+    written: list[str] = []
+    for filename, content in new_files.items():
+        path = data_dir / filename
+        if content is not None and content != path.read_bytes():
+            path.write_bytes(content)
+            written.append(filename)
+
+    state_path.write_text(json.dumps({path: f.validators for path, f in fetched.items()}, indent=2, sort_keys=True))
+
+    # so that saved results can be updated instead of recomputed (see pvp_damage/refresh.py)
+    changes = ChangeSet.compare(
+        old_gamemaster,
+        gamemaster_path.read_bytes(),
+        old_leagues,
+        {name: (data_dir / f"{name}.json").read_bytes() for name in LEAGUE_GROUPS},
+    )
+    changes.save(data_dir / "changes.json")
+
+    return FetchResult(
+        written=written,
+        not_modified=[path for path, f in fetched.items() if f.data is None],
+        changes=changes,
+    )
+
+
+def main() -> int:
+    result = refresh()
+    print(f"Wrote {', '.join(result.written) or 'nothing'} ({len(result.not_modified)} files not modified upstream)")
+    print(result.changes)
+    return 0
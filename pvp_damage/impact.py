@@ -0,0 +1,189 @@
+"""
+Which meta breakpoints and bulkpoints a balance patch adds, removes or moves, found by
+comparing two gamemaster versions loaded side by side as `Registry`s.
+
+Only the pairs (attacker with its fast move, defender) that involve a changed species or
+move are recomputed, once with each version; every other pair's damage can't have
+changed, so it's skipped. Pairs in either version's meta are checked, so a pair that
+only entered or left the meta is still compared (as long as both versions have it).
+
+    git show HEAD~1:data/gamemaster.json > old_gamemaster.json
+    python scripts/patch_impact.py old_gamemaster.json
+"""
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from pvp_damage.atlas import Kind, Threshold, pair_thresholds, varying
+from pvp_damage.bounds import meta_pairs
+from pvp_damage.iv_table import ALL_IVS
+from pvp_damage.models.leagues import DATA_DIR, LEAGUES, League
+from pvp_damage.models.moves import Move
+from pvp_damage.models.registry import Registry
+from pvp_damage.refresh import ChangeSet
+
+type Status = Literal["appeared", "disappeared", "changed"]
+
+
+def compare_registries(old: Registry, new: Registry) -> ChangeSet:
+    """
+    Like `ChangeSet.compare`, for gamemasters that are already loaded (leaving out
+    movepool changes, since only the move each pair uses matters here).
+    """
+
+    def species_changed(species_id: str) -> bool:
+        old_mon, new_mon = old.pokemon.get(species_id), new.pokemon.get(species_id)
+        if old_mon is None or new_mon is None:
+            return True
+        return (old_mon.types, old_mon.attack, old_mon.defense, old_mon.stamina) != (
+            new_mon.types,
+            new_mon.attack,
+            new_mon.defense,
+            new_mon.stamina,
+        )
+
+    old_moves: dict[str, Move] = {**old.fast_moves, **old.charged_moves}
+    new_moves: dict[str, Move] = {**new.fast_moves, **new.charged_moves}
+
+    def move_changed(move_id: str) -> bool:
+        old_move, new_move = old_moves.get(move_id), new_moves.get(move_id)
+        if old_move is None or new_move is None:
+            return True
+        return (old_move.type, old_move.power) != (new_move.type, new_move.power)
+
+    return ChangeSet(
+        old_hash=old.gamemaster_hash,
+        new_hash=new.gamemaster_hash,
+        species=frozenset(filter(species_changed, old.pokemon.keys() | new.pokemon.keys())),
+        moves=frozenset(filter(move_changed, old_moves.keys() | new_moves.keys())),
+        leagues=frozenset(name for name in old.leagues if _meta_ids(old.leagues[name]) != _meta_ids(new.leagues[name])),
+    )
+
+
+def _meta_ids(league: League) -> list[tuple[str, str, tuple[str, ...]]]:
+    # by ID, since the species and moves themselves differ between versions when their stats do
+    return [
+        (species.key, moveset.fast.move_id, tuple(move.move_id for move in moveset.charged))
+        for species, moveset in league.meta
+    ]
+
+
+@dataclass(frozen=True)
+class PairDiff:
+    """How one pair's breakpoints (or bulkpoints) differ between the old and new versions."""
+
+    kind: Kind
+    attacker: str
+    move: str
+    defender: str
+    old: list[Threshold]
+    new: list[Threshold]
+
+    @property
+    def status(self) -> Status:
+        if len(self.old) <= 1 < len(self.new):
+            return "appeared"
+        if len(self.new) <= 1 < len(self.old):
+            return "disappeared"
+        return "changed"
+
+
+@dataclass(frozen=True)
+class LeagueImpact:
+    league: str
+    meta_changed: bool
+    reused: int
+    recomputed: int
+    diffs: list[PairDiff]
+
+
+def _thresholds(registry: Registry, name: str, attacker: str, move: str, defender: str) -> dict[Kind, list[Threshold]]:
+    """The rows for a pair in one version, or none if that version doesn't have it."""
+
+    try:
+        attacker_species = registry.species_by_id(attacker)
+        defender_species = registry.species_by_id(defender)
+        fast_move = registry.fast_moves[move]
+    except (ValueError, KeyError):
+        return {"breakpoint": [], "bulkpoint": []}
+
+    rows = pair_thresholds(name, registry.leagues[name].max_cp, attacker_species, fast_move, defender_species)
+    return {
+        "breakpoint": [row for row in rows if row.kind == "breakpoint"],
+        "bulkpoint": [row for row in rows if row.kind == "bulkpoint"],
+    }
+
+
+def league_impact(old: Registry, new: Registry, name: str, changes: ChangeSet) -> LeagueImpact:
+    pairs = {
+        (attacker.key, move.move_id, defender.key)
+        for registry in (old, new)
+        for attacker, move, defender in meta_pairs(registry.leagues[name])
+    }
+    affected = sorted(pair for pair in pairs if changes.affects_pair(*pair))
+
+    diffs: list[PairDiff] = []
+    for pair in affected:
+        old_rows, new_rows = _thresholds(old, name, *pair), _thresholds(new, name, *pair)
+        for kind in ("breakpoint", "bulkpoint"):
+            # only pairs whose damage varies (in either version) have breakpoints to compare
+            if (varying(old_rows[kind]) or varying(new_rows[kind])) and _key(old_rows[kind]) != _key(new_rows[kind]):
+                diffs.append(PairDiff(kind, *pair, old=old_rows[kind], new=new_rows[kind]))
+
+    return LeagueImpact(
+        league=name,
+        meta_changed=name in changes.leagues,
+        reused=len(pairs) - len(affected),
+        recomputed=len(affected),
+        diffs=diffs,
+    )
+
+
+def _key(rows: list[Threshold]) -> list[tuple[int, float, float, int]]:
+    return [(row.damage, row.stat_min, row.stat_max, row.count) for row in rows]
+
+
+def patch_impact(old: Registry, new: Registry, leagues: list[str] | None = None) -> dict[str, LeagueImpact]:
+    changes = compare_registries(old, new)
+    return {name: league_impact(old, new, name, changes) for name in leagues or list(LEAGUES)}
+
+
+def _format_rows(sign: str, rows: list[Threshold]) -> list[str]:
+    stat = "attack" if rows and rows[0].kind == "breakpoint" else "defense"
+    return [
+        f"  {sign} {row.damage} damage: {row.stat_min:.2f} - {row.stat_max:.2f} {stat} ({row.count / len(ALL_IVS):.1%} of IVs)"
+        for row in rows
+    ]
+
+
+def format_impact(impact: LeagueImpact) -> str:
+    lines = [
+        f"{impact.league}: {len(impact.diffs)} changed ({impact.recomputed} pairs recomputed, {impact.reused} unchanged)"
+        + (" [meta changed]" if impact.meta_changed else "")
+    ]
+    for diff in impact.diffs:
+        lines.append(f"{diff.kind} {diff.status}: {diff.attacker} {diff.move} vs. {diff.defender}")
+        lines += _format_rows("-", diff.old)
+        lines += _format_rows("+", diff.new)
+
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old", type=Path, help="the gamemaster before the patch")
+    parser.add_argument("--old-leagues", type=Path, default=DATA_DIR, help="directory with the old league files")
+    parser.add_argument("--new", type=Path, help="the gamemaster after the patch (default: the current one)")
+    parser.add_argument("--new-leagues", type=Path, default=DATA_DIR, help="directory with the new league files")
+    parser.add_argument("--leagues", nargs="+", choices=list(LEAGUES), default=list(LEAGUES))
+    args = parser.parse_args(argv)
+
+    old = Registry.load(args.old, args.old_leagues)
+    new = Registry.current() if args.new is None else Registry.load(args.new, args.new_leagues)
+    for impact in patch_impact(old, new, args.leagues).values():
+        print(format_impact(impact))
+        print()
+
+    return 0
@@ -0,0 +1,226 @@
+"""
+A precomputed index of breakpoints and bulkpoints within each league's meta, stored in
+SQLite, so that questions like "which meta attackers need how much attack for another
+point of damage against the rank 1 Clodsire" are lookups instead of recomputation.
+
+For every attacker and defender in a league's meta, and every move in the attacker's
+meta moveset, the index holds one row per damage value:
+
+- breakpoint rows: the range of attack stats (over all the attacker's IVs) that does
+  this much damage to the defender's rank 1
+- bulkpoint rows: the range of defense stats (over all the defender's IVs) that takes
+  this much damage from the attacker's rank 1
+
+Rows are keyed by the gamemaster hash, so an index built before a gamemaster refresh
+isn't silently used after it.
+
+    with MetaIndex(Path("meta_index.sqlite")) as index:
+        index.build()
+        index.query("breakpoint", "great", defender="clodsire", move="COUNTER")
+"""
+
+import itertools
+import sqlite3
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from pvp_damage.atlas import Kind, Threshold, pair_thresholds
+from pvp_damage.models.constants import GAMEMASTER_HASH
+from pvp_damage.models.leagues import LEAGUES
+from pvp_damage.models.moves import Move
+from pvp_damage.models.pokemon import PokemonSpecies
+from pvp_damage.refresh import ChangeSet
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    gamemaster TEXT NOT NULL,
+    league TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (gamemaster, league)
+);
+CREATE TABLE IF NOT EXISTS thresholds (
+    gamemaster TEXT NOT NULL,
+    league TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    attacker TEXT NOT NULL,
+    move TEXT NOT NULL,
+    defender TEXT NOT NULL,
+    damage INTEGER NOT NULL,
+    stat_min REAL NOT NULL,
+    stat_max REAL NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS thresholds_by_attacker ON thresholds (gamemaster, league, kind, attacker, move);
+CREATE INDEX IF NOT EXISTS thresholds_by_defender ON thresholds (gamemaster, league, kind, defender);
+CREATE INDEX IF NOT EXISTS thresholds_by_move ON thresholds (gamemaster, league, kind, move);
+CREATE INDEX IF NOT EXISTS thresholds_by_stat ON thresholds (gamemaster, league, kind, stat_min, stat_max);
+"""
+
+
+def _key(value: PokemonSpecies | Move | str) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, PokemonSpecies):
+        return value.key
+    return value.move_id
+
+
+class MetaIndex:
+    def __init__(self, path: Path, gamemaster_hash: str = GAMEMASTER_HASH):
+        self.gamemaster_hash = gamemaster_hash
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "MetaIndex":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def is_built(self, league: str) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM builds WHERE gamemaster = ? AND league = ?", (self.gamemaster_hash, league)
+        ).fetchone()
+        return row is not None
+
+    def build(self, leagues: Iterable[str] = LEAGUES, *, force: bool = False) -> dict[str, int]:
+        """
+        Compute and store the thresholds for each league (skipping leagues that are already
+        built for this gamemaster, unless `force`). Returns the number of rows per league.
+        """
+
+        built: dict[str, int] = {}
+        for name in leagues:
+            if name not in LEAGUES:
+                raise ValueError(f"Unknown league: {name}")
+            if self.is_built(name) and not force:
+                continue
+
+            start = time.perf_counter()
+            rows, _reused = self._compute(name)
+            self._store(name, rows, time.perf_counter() - start)
+            built[name] = len(rows)
+
+        return built
+
+    def update(self, changes: ChangeSet) -> dict[str, tuple[int, int]]:
+        """
+        Bring the index up to date after a gamemaster refresh: for each league that was built
+        with `changes.old_hash`, copy the rows of every pair that `changes` doesn't affect,
+        and only compute the rest. Leagues that weren't built before are left to `build`.
+        Returns the number of (reused, computed) pairs per league.
+        """
+
+        updated: dict[str, tuple[int, int]] = {}
+        for name in LEAGUES:
+            rows = self.connection.execute(
+                "SELECT * FROM thresholds WHERE gamemaster = ? AND league = ?", (changes.old_hash, name)
+            ).fetchall()
+            if not rows or (self.is_built(name) and changes.old_hash != self.gamemaster_hash):
+                continue
+
+            reuse: dict[tuple[str, str, str], list[tuple[Any, ...]]] = {}
+            for row in rows:
+                attacker, move, defender = row[3:6]
+                if not changes.affects_pair(attacker, move, defender):
+                    reuse.setdefault((attacker, move, defender), []).append(row[2:])
+
+            start = time.perf_counter()
+            rows, reused = self._compute(name, reuse)
+            self._store(name, rows, time.perf_counter() - start)
+            pairs = len({row[3:6] for row in rows})
+            updated[name] = (reused, pairs - reused)
+
+        return updated
+
+    def _store(self, name: str, rows: list[tuple[Any, ...]], seconds: float) -> None:
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM thresholds WHERE gamemaster = ? AND league = ?", (self.gamemaster_hash, name)
+            )
+            self.connection.executemany("INSERT INTO thresholds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?)",
+                (self.gamemaster_hash, name, len(rows), seconds),
+            )
+
+    def _compute(
+        self, name: str, reuse: Mapping[tuple[str, str, str], list[tuple[Any, ...]]] | None = None
+    ) -> tuple[list[tuple[Any, ...]], int]:
+        """
+        The rows for a league, and how many pairs were taken from `reuse` (rows without the
+        gamemaster and league, keyed by attacker, move and defender) instead of computed.
+        """
+
+        reuse = reuse or {}
+        league = LEAGUES[name]
+        species = list({mon.key: mon for mon, _moveset in league.meta}.values())
+        attacks = list({(mon, move) for mon, moveset in league.meta for move in (moveset.fast, *moveset.charged)})
+        attacks.sort(key=lambda attack: (attack[0].key, attack[1].move_id))
+
+        prefix = (self.gamemaster_hash, name)
+        rows: list[tuple[Any, ...]] = []
+        reused = 0
+        for attacker, move in attacks:
+            for defender in species:
+                names = (attacker.key, move.move_id, defender.key)
+                if names in reuse:
+                    rows += [(*prefix, *row) for row in reuse[names]]
+                    reused += 1
+                    continue
+
+                rows += [
+                    (*prefix, row.kind, *names, row.damage, row.stat_min, row.stat_max, row.count)
+                    for row in pair_thresholds(name, league.max_cp, attacker, move, defender)
+                ]
+
+        return rows, reused
+
+    def query(
+        self,
+        kind: Kind,
+        league: str,
+        *,
+        attacker: PokemonSpecies | str | None = None,
+        move: Move | str | None = None,
+        defender: PokemonSpecies | str | None = None,
+        stat_at_least: float | None = None,
+        stat_at_most: float | None = None,
+    ) -> list[Threshold]:
+        """
+        Look up thresholds, optionally narrowed down by species (a `PokemonSpecies` or its
+        `key`), move (a `Move` or its ID), or a range of the stat that decides the damage
+        (rows whose stat range overlaps it).
+        """
+
+        if not self.is_built(league):
+            raise ValueError(f"The index for {league} isn't built for gamemaster {self.gamemaster_hash[:12]}")
+
+        conditions = ["gamemaster = ?", "league = ?", "kind = ?"]
+        params: list[Any] = [self.gamemaster_hash, league, kind]
+        for column, value in (("attacker", attacker), ("move", move), ("defender", defender)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(_key(value))
+        if stat_at_least is not None:
+            conditions.append("stat_max >= ?")
+            params.append(stat_at_least)
+        if stat_at_most is not None:
+            conditions.append("stat_min <= ?")
+            params.append(stat_at_most)
+
+        rows = self.connection.execute(
+            "SELECT kind, league, attacker, move, defender, damage, stat_min, stat_max, count FROM thresholds "
+            f"WHERE {' AND '.join(conditions)} ORDER BY attacker, move, defender, damage",
+            params,
+        )
+        return list(itertools.starmap(Threshold, rows))
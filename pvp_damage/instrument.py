@@ -0,0 +1,133 @@
+"""
+Counters and timing spans for the hot paths: how many times `calculate_damage` ran, how
+many `Pokemon` were built, how many IV tables were built (and how often the cache saved
+us from building one), and how long each of those took.
+
+Nothing is recorded unless instrumentation is turned on, either for a block of code -
+
+    with instrumented() as recorder:
+        compute_breakpoints(...)
+    print(recorder.summary())
+
+- or for a whole run, with the PVP_DAMAGE_INSTRUMENT environment variable: set it to 1 to
+print a summary to stderr on exit, or to a path ending in .json to write a JSON dump there.
+
+When it's off, a counter costs one `is not None` check; the hottest call sites do that
+check inline (`if instrument.active is not None`) rather than calling `count`.
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+from collections import Counter
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class SpanStats:
+    calls: int = 0
+    total: float = 0
+    longest: float = 0
+
+
+@dataclass
+class Recorder:
+    counters: Counter[str] = field(default_factory=Counter[str])
+    spans: dict[str, SpanStats] = field(default_factory=dict[str, SpanStats])
+
+    def add_span(self, name: str, elapsed: float, calls: int = 1) -> None:
+        stats = self.spans.setdefault(name, SpanStats())
+        stats.calls += calls
+        stats.total += elapsed
+        stats.longest = max(stats.longest, elapsed)
+
+    def merge(self, other: "Recorder") -> None:
+        self.counters.update(other.counters)
+        for name, stats in other.spans.items():
+            self.add_span(name, stats.total, stats.calls)
+            self.spans[name].longest = max(self.spans[name].longest, stats.longest)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "spans": {
+                name: {"calls": stats.calls, "total": stats.total, "longest": stats.longest}
+                for name, stats in sorted(self.spans.items())
+            },
+        }
+
+    def summary(self) -> str:
+        lines = ["counters:"]
+        lines += [f"  {name:<32} {value:>12,}" for name, value in sorted(self.counters.items())]
+        lines += ["spans:"]
+        lines += [
+            f"  {name:<32} {stats.calls:>6} calls {stats.total * 1000:>10.1f}ms total {stats.longest * 1000:>8.1f}ms max"
+            for name, stats in sorted(self.spans.items())
+        ]
+        return "\n".join(lines)
+
+
+# the recorder that counters and spans go to; None when instrumentation is off
+active: Recorder | None = None
+
+
+def count(name: str, n: int = 1) -> None:
+    if active is not None:
+        active.counters[name] += n
+
+
+@contextmanager
+def _timed(recorder: Recorder, name: str) -> Generator[None, None, None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_span(name, time.perf_counter() - start)
+
+
+_NULL_SPAN = nullcontext()
+
+
+def span(name: str) -> AbstractContextManager[None]:
+    """Time a block of code (and count how many times it ran)."""
+
+    if active is None:
+        return _NULL_SPAN
+    return _timed(active, name)
+
+
+@contextmanager
+def instrumented() -> Generator[Recorder, None, None]:
+    """
+    Record counters and spans for the duration of the block. If instrumentation was
+    already on (e.g., from the environment variable), the block's numbers are also
+    added to the outer recorder when the block ends.
+    """
+
+    global active
+    outer, recorder = active, Recorder()
+    active = recorder
+    try:
+        yield recorder
+    finally:
+        active = outer
+        if outer is not None:
+            outer.merge(recorder)
+
+
+def _report_at_exit(recorder: Recorder, destination: str) -> None:
+    if destination.endswith(".json"):
+        Path(destination).write_text(json.dumps(recorder.to_json(), indent=2) + "\n")
+    else:
+        print(recorder.summary(), file=sys.stderr)
+
+
+if (_destination := os.environ.get("PVP_DAMAGE_INSTRUMENT", "0")) != "0":
+    active = Recorder()
+    atexit.register(_report_at_exit, active, _destination)
@@ -0,0 +1,173 @@
+"""
+Find the IVs and level of a Pokemon from what the game shows: its CP, HP, and sometimes
+its level.
+
+`get_cp_index` builds the CP and HP of every IV combination of a species at every level
+(about 400k Pokemon), with the same arithmetic as `Pokemon.cp` and `Pokemon.stamina_stat`,
+and keeps the indexes of recently used species. They're sorted by (CP, HP), so each (CP, HP) pair maps to a
+contiguous block of candidates -
+
+    index = get_cp_index(get_species("Altaria"))
+    index.lookup(1488, 137)                 # every matching Pokemon
+    index.lookup(1488, 137, level=28.5)     # only at that level
+    index.lookup_many(cps, hps, levels)     # thousands at once (levels: NaN if unknown)
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from pvp_damage import instrument
+from pvp_damage.iv_table import ALL_IVS, CPMS, LEVELS, BoolArray, IntArray
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+
+
+def _key(cp: npt.ArrayLike, hp: npt.ArrayLike) -> IntArray:
+    # HP never reaches 2^16, so (CP, HP) packs into one integer that sorts by CP, then HP
+    return (np.asarray(cp, dtype=np.int64) << 16) | np.asarray(hp, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class Matches:
+    """
+    The candidates for many observations at once, as flat arrays: row j is a candidate
+    for observation `observation[j]`, with IVs `ivs[j]` at level `levels[j]`. `counts`
+    has how many candidates each observation has (0 for no match).
+    """
+
+    species: PokemonSpecies
+    observation: IntArray
+    ivs: npt.NDArray[np.uint8]
+    levels: npt.NDArray[np.float32]
+    counts: IntArray
+
+    def __len__(self) -> int:
+        return len(self.observation)
+
+    def pokemon(self, observation: int) -> list[Pokemon]:
+        rows = np.flatnonzero(self.observation == observation)
+        return [_pokemon(self.species, self.ivs[row], self.levels[row]) for row in rows]
+
+
+def _pokemon(species: PokemonSpecies, ivs: npt.NDArray[np.uint8], level: np.float32) -> Pokemon:
+    a, d, s = ivs
+    return Pokemon(species=species, level=float(level), ivs=(int(a), int(d), int(s)))
+
+
+@dataclass(frozen=True, eq=False)
+class CPIndex:
+    """
+    Every IV combination of a species at every level, sorted by (CP, HP). `blocks` maps
+    a packed (CP, HP) key to the [start, stop) rows that have it. IVs are stored as uint8
+    and levels as float32 (both exact), since there are ~100 times more rows than in an
+    `IVTable`.
+    """
+
+    species: PokemonSpecies
+    ivs: npt.NDArray[np.uint8]
+    levels: npt.NDArray[np.float32]
+    keys: IntArray
+    starts: IntArray
+    blocks: dict[int, tuple[int, int]]
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def lookup(self, cp: int, hp: int, level: float | None = None) -> list[Pokemon]:
+        """Every Pokemon of this species with this CP and HP (and level, if known)."""
+
+        start, stop = self.blocks.get(int(_key(cp, hp)), (0, 0))
+        rows = range(start, stop)
+        if level is not None:
+            rows = [row for row in rows if self.levels[row] == level]
+
+        return [_pokemon(self.species, self.ivs[row], self.levels[row]) for row in rows]
+
+    def lookup_many(self, cp: npt.ArrayLike, hp: npt.ArrayLike, level: npt.ArrayLike | None = None) -> Matches:
+        """
+        `lookup` for arrays of observations, without a Python loop. `level` may be NaN
+        where the level isn't known.
+        """
+
+        instrument.count("cp_index.lookup_many")
+
+        keys = _key(cp, hp)
+        position = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        found = self.keys[position] == keys
+        starts = self.starts[position]
+        counts = np.where(found, self.starts[position + 1] - starts, 0)
+
+        # expand each observation into its block of rows
+        observation = np.repeat(np.arange(len(keys)), counts)
+        offsets = np.arange(len(observation)) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = np.repeat(starts, counts) + offsets
+
+        if level is not None:
+            wanted = np.asarray(level, dtype=np.float64)[observation]
+            keep: BoolArray = np.isnan(wanted) | (self.levels[rows] == wanted)
+            observation, rows = observation[keep], rows[keep]
+
+        return Matches(
+            species=self.species,
+            observation=observation,
+            ivs=self.ivs[rows],
+            levels=self.levels[rows],
+            counts=np.bincount(observation, minlength=len(keys)),
+        )
+
+
+def build_cp_index(species: PokemonSpecies) -> CPIndex:
+    with instrument.span("build_cp_index"):
+        # (levels, IVs) grid, flattened level-major
+        cpm = np.repeat(CPMS, len(ALL_IVS))
+        ivs = np.tile(ALL_IVS, (len(CPMS), 1))
+
+        attack = (species.attack + ivs[:, 0]) * cpm
+        defense = (species.defense + ivs[:, 1]) * cpm
+        stamina = np.floor((species.stamina + ivs[:, 2]) * cpm)
+        cp = np.maximum(10, np.floor(0.1 * np.sqrt(attack * attack * defense * stamina))).astype(np.int64)
+
+        keys = _key(cp, stamina.astype(np.int64))
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        unique_keys, starts = np.unique(keys, return_index=True)
+        starts = np.append(starts, len(keys))
+
+    return CPIndex(
+        species=species,
+        ivs=ivs[order].astype(np.uint8),
+        levels=np.repeat(LEVELS, len(ALL_IVS))[order].astype(np.float32),
+        keys=unique_keys,
+        starts=starts,
+        blocks={
+            key: (start, stop)
+            for key, start, stop in zip(unique_keys.tolist(), starts[:-1].tolist(), starts[1:].tolist(), strict=True)
+        },
+    )
+
+
+# about 4 MB each, so only keep the species that were looked up recently
+_CP_INDEX_CACHE: OrderedDict[PokemonSpecies, CPIndex] = OrderedDict()
+CP_INDEX_CACHE_SIZE = 16
+
+
+def get_cp_index(species: PokemonSpecies) -> CPIndex:
+    """Same as `build_cp_index`, but reuses indexes that were built recently."""
+
+    if (index := _CP_INDEX_CACHE.get(species)) is not None:
+        instrument.count("cp_index_cache.hit")
+        _CP_INDEX_CACHE.move_to_end(species)
+        return index
+
+    instrument.count("cp_index_cache.miss")
+    index = _CP_INDEX_CACHE[species] = build_cp_index(species)
+    if len(_CP_INDEX_CACHE) > CP_INDEX_CACHE_SIZE:
+        _CP_INDEX_CACHE.popitem(last=False)
+
+    return index
+
+
+def clear_cp_index_cache() -> None:
+    _CP_INDEX_CACHE.clear()
@@ -0,0 +1,313 @@
+import itertools
+import operator
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import numpy.typing as npt
+
+from pvp_damage import instrument
+from pvp_damage.models.constants import CP_MULTIPLIERS, IVs
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+
+type FloatArray = npt.NDArray[np.float64]
+type IntArray = npt.NDArray[np.int64]
+type BoolArray = npt.NDArray[np.bool_]
+
+# Every IV combination, in the same order that compute_iv_possibilities uses.
+ALL_IVS: IntArray = np.array(list(itertools.product(range(16), range(16), range(16))), dtype=np.int64)
+ALL_IVS.flags.writeable = False
+
+# Every level (in steps of 0.5) and its CP multiplier, in order.
+LEVELS: FloatArray = np.array(list(CP_MULTIPLIERS.keys()), dtype=np.float64)
+LEVELS.flags.writeable = False
+CPMS: FloatArray = np.array(list(CP_MULTIPLIERS.values()), dtype=np.float64)
+CPMS.flags.writeable = False
+
+
+def cpm_for_levels(levels: FloatArray) -> FloatArray:
+    """Look up the CP multiplier for an array of levels (which are all multiples of 0.5)."""
+
+    return CPMS[((levels - 1) * 2).astype(np.int64)]
+
+
+def max_levels_for_league(species: PokemonSpecies, ivs: IntArray, cp_limit: int) -> FloatArray:
+    """
+    Vectorized version of `find_max_level_for_league`, for an (N, 3) array of IVs.
+
+    This follows the same steps (and does the arithmetic in the same order) as the scalar
+    version, so the levels it finds are identical: compute the largest CP multiplier that
+    stays under the CP limit, find the first level that passes it, then step back half
+    a level unless the floor in the CP formula keeps us within the limit.
+    """
+
+    att = species.attack + ivs[:, 0]
+    dfn = species.defense + ivs[:, 1]
+    sta = species.stamina + ivs[:, 2]
+    stat_product = np.sqrt(att * att * dfn * sta)
+
+    cpm_2 = 10 * cp_limit / stat_product
+    cpm_limit = np.sqrt(cpm_2)
+
+    # index of the first CP multiplier that _passes_ our target; past the end means level 51
+    index = np.searchsorted(CPMS, cpm_limit, side="left")
+    is_max_level = index >= len(CPMS)
+    index = np.minimum(index, len(CPMS) - 1)
+
+    computed_cp = 0.1 * CPMS[index] ** 2 * stat_product
+    index = np.where(~is_max_level & (np.floor(computed_cp) > cp_limit), index - 1, index)
+
+    return LEVELS[index]
+
+
+@dataclass(frozen=True, eq=False)
+class StatClasses:
+    """
+    The rows of an IV table grouped by equal stats: `values[k]` is one class (a stat, or a
+    row of stats), `counts[k]` how many rows are in it, and `inverse[i]` the class of row
+    i. Anything that only depends on those stats can be computed once per class, and
+    `expand` broadcasts it back to every row.
+    """
+
+    values: FloatArray
+    inverse: IntArray
+    counts: IntArray
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def expand[T: np.generic](self, per_class: npt.NDArray[T]) -> npt.NDArray[T]:
+        """(..., classes) -> (..., rows)"""
+
+        return per_class[..., self.inverse]
+
+
+def _classes(stats: FloatArray) -> StatClasses:
+    values, inverse, counts = np.unique(stats, axis=0, return_inverse=True, return_counts=True)
+    return StatClasses(values=values, inverse=inverse.reshape(-1), counts=counts)
+
+
+@dataclass(frozen=True, eq=False)
+class IVTable:
+    """
+    IV combinations of one species, each powered up to the max level for a league, stored
+    as arrays (one row per IV combination) rather than as `Pokemon` objects. The stat
+    properties mirror the ones on `Pokemon`, so `table.attack_stat[i]` is the same number
+    as `table.pokemon(i).attack_stat`.
+
+    Iterating over the table yields `Pokemon`, so it can be used anywhere an iterable of
+    Pokemon is expected (e.g., as defenders in `compute_bulkpoints`).
+
+    Many IV spreads share a stat, so the `*_classes` properties group the rows by the
+    stats that damage depends on: compute per class, then `expand` back to the rows.
+    """
+
+    species: PokemonSpecies
+    cp_limit: int
+    ivs: IntArray
+    levels: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __iter__(self) -> Iterator[Pokemon]:
+        return (self.pokemon(i) for i in range(len(self)))
+
+    @cached_property
+    def cpm(self) -> FloatArray:
+        return cpm_for_levels(self.levels)
+
+    @cached_property
+    def attack_stat(self) -> FloatArray:
+        return (self.species.attack + self.ivs[:, 0]) * self.cpm
+
+    @cached_property
+    def defense_stat(self) -> FloatArray:
+        return (self.species.defense + self.ivs[:, 1]) * self.cpm
+
+    @cached_property
+    def stamina_stat(self) -> IntArray:
+        return np.floor((self.species.stamina + self.ivs[:, 2]) * self.cpm).astype(np.int64)
+
+    @cached_property
+    def stat_product(self) -> FloatArray:
+        return self.attack_stat * self.defense_stat * self.stamina_stat
+
+    @cached_property
+    def rank(self) -> IntArray:
+        """Stat product rank, where 1 is the highest (ties share a rank)."""
+
+        descending = np.sort(-self.stat_product)
+        return np.searchsorted(descending, -self.stat_product, side="left") + 1
+
+    @cached_property
+    def attack_classes(self) -> StatClasses:
+        """The distinct attack stats; damage dealt only depends on these."""
+
+        return _classes(self.attack_stat)
+
+    @cached_property
+    def defense_classes(self) -> StatClasses:
+        """The distinct defense stats; damage taken only depends on these."""
+
+        return _classes(self.defense_stat)
+
+    @cached_property
+    def bulk_classes(self) -> StatClasses:
+        """The distinct (defense, stamina) pairs, as (classes, 2) values; hits to faint depends on both."""
+
+        return _classes(np.stack([self.defense_stat, self.stamina_stat.astype(np.float64)], axis=1))
+
+    @cached_property
+    def cp(self) -> IntArray:
+        a, d, s = self.attack_stat, self.defense_stat, self.stamina_stat
+        return np.maximum(10, np.floor(0.1 * np.sqrt(a * a * d * s))).astype(np.int64)
+
+    def pokemon(self, index: int) -> Pokemon:
+        if instrument.active is not None:
+            instrument.active.counters["pokemon"] += 1
+
+        a, d, s = self.ivs[index]
+        return Pokemon(species=self.species, level=float(self.levels[index]), ivs=(int(a), int(d), int(s)))
+
+    def index_of(self, ivs: IVs) -> int:
+        matches = np.flatnonzero((self.ivs == ivs).all(axis=1))
+        if not len(matches):
+            raise ValueError(f"IVs not in table: {ivs}")
+
+        return int(matches[0])
+
+    def take(self, indices: IntArray | BoolArray) -> "IVTable":
+        """Return a smaller table with only the given rows (indices or a boolean mask)."""
+
+        return IVTable(species=self.species, cp_limit=self.cp_limit, ivs=self.ivs[indices], levels=self.levels[indices])
+
+    def filter(self, *predicates: "Predicate") -> "IVTable":
+        """
+        The rows that match every predicate (e.g., `table.filter(ATTACK >= 127.18, RANK <= 100)`),
+        as a smaller table; it can be passed anywhere Pokemon are expected, like the full one.
+        """
+
+        mask = np.ones(len(self), dtype=np.bool_)
+        for predicate in predicates:
+            mask &= predicate(self)
+
+        return self.take(mask)
+
+    def rank1(self) -> Pokemon:
+        return self.pokemon(int(np.argmax(self.stat_product)))
+
+    def to_dict(self) -> dict[IVs, Pokemon]:
+        return {mon.ivs: mon for mon in self}
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """A condition on the rows of an IV table, as a boolean mask; combine them with `&`, `|` and `~`."""
+
+    mask: Callable[[IVTable], BoolArray]
+
+    def __call__(self, table: IVTable) -> BoolArray:
+        return self.mask(table)
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return Predicate(lambda table: self(table) & other(table))
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Predicate(lambda table: self(table) | other(table))
+
+    def __invert__(self) -> "Predicate":
+        return Predicate(lambda table: ~self(table))
+
+
+@dataclass(frozen=True, eq=False)
+class Column:
+    """One value per row of an IV table; comparing it to a number gives a `Predicate`."""
+
+    name: str
+    values: Callable[[IVTable], npt.NDArray[np.generic]]
+
+    # == makes a predicate rather than comparing columns, so they can't be hashed either
+    __hash__ = None  # pyright: ignore[reportAssignmentType]
+
+    def _compare(self, op: Callable[[npt.NDArray[np.generic], float], BoolArray], value: float) -> Predicate:
+        return Predicate(lambda table: op(self.values(table), value))
+
+    def __lt__(self, value: float) -> Predicate:
+        return self._compare(operator.lt, value)
+
+    def __le__(self, value: float) -> Predicate:
+        return self._compare(operator.le, value)
+
+    def __gt__(self, value: float) -> Predicate:
+        return self._compare(operator.gt, value)
+
+    def __ge__(self, value: float) -> Predicate:
+        return self._compare(operator.ge, value)
+
+    def __eq__(self, value: float) -> Predicate:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return self._compare(operator.eq, value)
+
+    def __ne__(self, value: float) -> Predicate:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return self._compare(operator.ne, value)
+
+    def between(self, low: float, high: float) -> Predicate:
+        """low <= value <= high"""
+
+        return (self >= low) & (self <= high)
+
+    def isin(self, values: Iterable[float]) -> Predicate:
+        return Predicate(lambda table: np.isin(self.values(table), list(values)))
+
+
+ATTACK = Column("attack", lambda table: table.attack_stat)
+DEFENSE = Column("defense", lambda table: table.defense_stat)
+STAMINA = Column("stamina", lambda table: table.stamina_stat)
+STAT_PRODUCT = Column("stat_product", lambda table: table.stat_product)
+RANK = Column("rank", lambda table: table.rank)
+LEVEL = Column("level", lambda table: table.levels)
+CP = Column("cp", lambda table: table.cp)
+ATTACK_IV = Column("attack_iv", lambda table: table.ivs[:, 0])
+DEFENSE_IV = Column("defense_iv", lambda table: table.ivs[:, 1])
+STAMINA_IV = Column("stamina_iv", lambda table: table.ivs[:, 2])
+
+
+def compute_iv_table(species: PokemonSpecies, cp_limit: int) -> IVTable:
+    """
+    Vectorized version of `compute_iv_possibilities`: for every IV combination, find the
+    max level that stays under the CP limit, and return them all as one `IVTable`.
+    """
+
+    with instrument.span("compute_iv_table"):
+        levels = max_levels_for_league(species, ALL_IVS, cp_limit)
+        levels.flags.writeable = False
+
+    return IVTable(species=species, cp_limit=cp_limit, ivs=ALL_IVS, levels=levels)
+
+
+# IV tables are immutable, so they can be shared between analyses; keep the most recent ones
+_IV_TABLE_CACHE: OrderedDict[tuple[PokemonSpecies, int], IVTable] = OrderedDict()
+IV_TABLE_CACHE_SIZE = 256
+
+
+def get_iv_table(species: PokemonSpecies, cp_limit: int) -> IVTable:
+    """Same as `compute_iv_table`, but reuses tables that were built recently."""
+
+    key = (species, cp_limit)
+    if (table := _IV_TABLE_CACHE.get(key)) is not None:
+        instrument.count("iv_table_cache.hit")
+        _IV_TABLE_CACHE.move_to_end(key)
+        return table
+
+    instrument.count("iv_table_cache.miss")
+    table = _IV_TABLE_CACHE[key] = compute_iv_table(species, cp_limit)
+    if len(_IV_TABLE_CACHE) > IV_TABLE_CACHE_SIZE:
+        _IV_TABLE_CACHE.popitem(last=False)
+
+    return table
+
+
+def clear_iv_table_cache() -> None:
+    _IV_TABLE_CACHE.clear()
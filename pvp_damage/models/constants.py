@@ -1,3 +1,4 @@
+import hashlib
 import json
 from enum import Enum
 from pathlib import Path
@@ -352,10 +353,19 @@ TYPE_MATCHUPS: dict[PokemonType, OneTypeMatchups] = {
 }
 
 
+_GAMEMASTER_PATH = Path(__file__).parent.parent.parent / "data/gamemaster.json"
+
+
 def _load_gamemaster() -> Any:
-    cwd = Path(__file__).parent
-    gamemaster = json.loads((cwd.parent.parent / "data/gamemaster.json").read_text())
+    gamemaster = json.loads(_GAMEMASTER_PATH.read_text())
     return gamemaster
 
 
+def hash_gamemaster(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
 GAMEMASTER = _load_gamemaster()
+
+# identifies the gamemaster that saved results were computed with, so stale ones can be told apart
+GAMEMASTER_HASH = hash_gamemaster(_GAMEMASTER_PATH.read_bytes())
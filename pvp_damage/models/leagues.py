@@ -1,9 +1,13 @@
 import json
+from collections.abc import Callable, Mapping
 from pathlib import Path
+from typing import Self
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
-from .moves import Moveset, get_charged_move_by_id, get_fast_move_by_id
+from pvp_damage import instrument
+
+from .moves import ChargedMove, FastMove, Moveset, get_charged_move_by_id, get_fast_move_by_id
 from .pokemon import PokemonSpecies, get_species_by_id
 
 
@@ -11,25 +15,77 @@ class League(BaseModel):
     name: str
     max_cp: int
     meta: list[tuple[PokemonSpecies, Moveset]]
+    # one per meta entry (e.g., its usage share); None counts every entry the same
+    weights: list[float] | None = None
+
+    @model_validator(mode="after")
+    def _check_weights(self) -> Self:
+        if self.weights is not None:
+            if len(self.weights) != len(self.meta):
+                raise ValueError(f"Got {len(self.weights)} weights for {len(self.meta)} meta entries")
+            if any(weight < 0 for weight in self.weights):
+                raise ValueError("Weights can't be negative")
+
+        return self
+
+    @property
+    def meta_weights(self) -> list[float]:
+        return self.weights if self.weights is not None else [1.0] * len(self.meta)
+
+    def with_weights(self, weights: Mapping[str, float], default: float = 0.0) -> "League":
+        """
+        The same league, weighted by species key (e.g. "swampert_shadow"); entries of a
+        species that isn't in `weights` get `default`.
+        """
+
+        return self.model_copy(update={"weights": [weights.get(species.key, default) for species, _ in self.meta]})
+
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def load_league(
+    name: str,
+    display_name: str,
+    max_cp: int,
+    data_dir: Path = DATA_DIR,
+    get_species: Callable[..., PokemonSpecies] = get_species_by_id,
+    get_fast_move: Callable[[str], FastMove] = get_fast_move_by_id,
+    get_charged_move: Callable[[str], ChargedMove] = get_charged_move_by_id,
+) -> League:
+    """
+    Load a league's meta (and weights) from its file, e.g. `great.json`.
+
+    The lookups default to this gamemaster's species and moves; they are overridden to
+    load the leagues of another gamemaster alongside it (see `Registry`).
+
+    PVPoke's files don't have weights, but a league file can give its entries a "weight"
+    (entries without one count as 1); if none of them do, the league has no weights.
+    """
+
+    p = data_dir / f"{name}.json"
+
+    with instrument.span("load_league"):
+        data = json.loads(p.read_text())
 
+        meta_list: list[tuple[PokemonSpecies, Moveset]] = []
+        for item in data:
+            is_shadow = item.get("shadowType") == "shadow"
+            species = get_species(item["speciesId"], as_shadow=is_shadow)
 
-def _get_meta_from_file(name: str) -> list[tuple[PokemonSpecies, Moveset]]:
-    cwd = Path(__file__).parent
-    p = cwd.parent.parent / "data" / f"{name}.json"
-    data = json.loads(p.read_text())
+            fast = get_fast_move(item["fastMove"])
+            charged = [get_charged_move(move) for move in item["chargedMoves"]]
+            meta_list.append((species, Moveset(fast=fast, charged=charged)))  # pyright: ignore[reportArgumentType]
 
-    meta_list: list[tuple[PokemonSpecies, Moveset]] = []
-    for item in data:
-        is_shadow = item.get("shadowType") == "shadow"
-        species = get_species_by_id(item["speciesId"], as_shadow=is_shadow)
+        weights: list[float] | None = None
+        if any("weight" in item for item in data):
+            weights = [float(item.get("weight", 1.0)) for item in data]
 
-        fast = get_fast_move_by_id(item["fastMove"])
-        charged = [get_charged_move_by_id(move) for move in item["chargedMoves"]]
-        meta_list.append((species, Moveset(fast=fast, charged=charged)))  # pyright: ignore[reportArgumentType]
+    return League(name=display_name, max_cp=max_cp, meta=meta_list, weights=weights)
 
-    return meta_list
 
+GREAT_LEAGUE = load_league("great", "Great League", 1500)
+ULTRA_LEAGUE = load_league("ultra", "Ultra League", 2500)
+MASTER_LEAGUE = load_league("master", "Master League", 10_000)
 
-GREAT_LEAGUE = League(name="Great League", max_cp=1500, meta=_get_meta_from_file("great"))
-ULTRA_LEAGUE = League(name="Ultra League", max_cp=2500, meta=_get_meta_from_file("ultra"))
-MASTER_LEAGUE = League(name="Master League", max_cp=10_000, meta=_get_meta_from_file("master"))
+LEAGUES = {"great": GREAT_LEAGUE, "ultra": ULTRA_LEAGUE, "master": MASTER_LEAGUE}
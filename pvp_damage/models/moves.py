@@ -15,6 +15,9 @@ class FastMove(BaseModel):
     turns: int = Field(ge=1, le=5)
     model_config = ConfigDict(frozen=True)
 
+    def __hash__(self) -> int:
+        return hash(self.move_id)
+
     def __repr__(self) -> str:
         return f"{self.name} ({self.type.value}; {self.power} power, {self.energy} energy, {self.turns} turns)"
 
@@ -30,6 +33,9 @@ class ChargedMove(BaseModel):
     energy: int
     model_config = ConfigDict(frozen=True)
 
+    def __hash__(self) -> int:
+        return hash(self.move_id)
+
     def __repr__(self) -> str:
         return f"{self.name} ({self.type.value}; {self.power} power, {self.energy} energy)"
 
@@ -121,7 +127,7 @@ def get_move_effectiveness(attack: PokemonType, defender: Iterable[PokemonType])
     return multiplier
 
 
-def _load_moves_from_gamemaster(gamemaster: Any) -> tuple[list[FastMove], list[ChargedMove]]:
+def load_moves_from_gamemaster(gamemaster: Any) -> tuple[list[FastMove], list[ChargedMove]]:
     """
     Fast moves and charged moves are represented with the same structure, except
     fast moves have energyGain > 0 and energy = 0, and charged moves have the
@@ -167,7 +173,7 @@ def _load_moves_from_gamemaster(gamemaster: Any) -> tuple[list[FastMove], list[C
     return fast_moves, charged_moves
 
 
-FAST_MOVES, CHARGED_MOVES = _load_moves_from_gamemaster(GAMEMASTER)
+FAST_MOVES, CHARGED_MOVES = load_moves_from_gamemaster(GAMEMASTER)
 _FAST_NAME_LOOKUP = {move.name: move for move in FAST_MOVES}
 _FAST_ID_LOOKUP = {move.move_id: move for move in FAST_MOVES}
 _CHARGED_NAME_LOOKUP = {move.name: move for move in CHARGED_MOVES}
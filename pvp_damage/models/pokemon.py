@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from math import floor, sqrt
 from typing import Any
 
@@ -32,12 +33,23 @@ class PokemonSpecies(BaseModel):
             return all(getattr(self, x) == getattr(other, x) for x in self.model_fields)
         return super().__eq__(other)
 
+    def __hash__(self) -> int:
+        return hash((self.id, self.is_shadow))
+
     @property
     def full_name(self) -> str:
         if self.is_shadow:
             return f"{self.name} (Shadow)"
         return self.name
 
+    @property
+    def key(self) -> str:
+        """The ID, with a suffix for shadows; `get_species_by_id` accepts it back."""
+
+        if self.is_shadow:
+            return f"{self.id}_shadow"
+        return self.id
+
     def cp(self, level: float, att_iv: int, def_iv: int, sta_iv: int):  # unused
         attack, defense, stamina = (
             self.attack + att_iv,
@@ -122,7 +134,16 @@ def get_species_by_id(species_id: str, as_shadow: bool = False) -> PokemonSpecie
     return maybe_mon
 
 
-def _load_pokemon_from_gamemaster(gamemaster: Any) -> list[PokemonSpecies]:
+def load_pokemon_from_gamemaster(
+    gamemaster: Any,
+    get_fast_move: Callable[[str], FastMove] = get_fast_move_by_id,
+    get_charged_move: Callable[[str], ChargedMove] = get_charged_move_by_id,
+) -> list[PokemonSpecies]:
+    """
+    get_fast_move / get_charged_move: how to look up moves by ID; these default to the
+    moves from this gamemaster file, and are overridden to load another one alongside it.
+    """
+
     all_pokemon = gamemaster["pokemon"]
     non_shadow_pokemon = [
         mon
@@ -138,8 +159,8 @@ def _load_pokemon_from_gamemaster(gamemaster: Any) -> list[PokemonSpecies]:
             attack=pokemon["baseStats"]["atk"],
             defense=pokemon["baseStats"]["def"],
             stamina=pokemon["baseStats"]["hp"],
-            fast_moves=frozenset(get_fast_move_by_id(move) for move in pokemon["fastMoves"]),
-            charged_moves=frozenset(get_charged_move_by_id(move) for move in pokemon["chargedMoves"]),
+            fast_moves=frozenset(get_fast_move(move) for move in pokemon["fastMoves"]),
+            charged_moves=frozenset(get_charged_move(move) for move in pokemon["chargedMoves"]),
         )
         for pokemon in non_shadow_pokemon
     ]
@@ -147,6 +168,6 @@ def _load_pokemon_from_gamemaster(gamemaster: Any) -> list[PokemonSpecies]:
     return pokemon
 
 
-POKEMON = _load_pokemon_from_gamemaster(GAMEMASTER)
+POKEMON = load_pokemon_from_gamemaster(GAMEMASTER)
 _POKEMON_LOOKUP = {pokemon.name: pokemon for pokemon in POKEMON}
 _POKEMON_ID_LOOKUP = {pokemon.id: pokemon for pokemon in POKEMON}
@@ -0,0 +1,83 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from .constants import GAMEMASTER_HASH, hash_gamemaster
+from .leagues import DATA_DIR, LEAGUES, League, load_league
+from .moves import CHARGED_MOVES, FAST_MOVES, ChargedMove, FastMove, load_moves_from_gamemaster
+from .pokemon import POKEMON, PokemonSpecies, load_pokemon_from_gamemaster
+
+
+@dataclass(frozen=True)
+class Registry:
+    """
+    The species, moves and league metas of one gamemaster version. The module-level
+    lookups (`get_species_by_id` and friends) always use `data/gamemaster.json`; a registry
+    lets another version (e.g., the one before a balance patch) be loaded next to it.
+    """
+
+    gamemaster_hash: str
+    pokemon: dict[str, PokemonSpecies]
+    fast_moves: dict[str, FastMove]
+    charged_moves: dict[str, ChargedMove]
+    leagues: dict[str, League]
+
+    @classmethod
+    def current(cls) -> "Registry":
+        """The registry for the gamemaster that's already loaded."""
+
+        return cls(
+            gamemaster_hash=GAMEMASTER_HASH,
+            pokemon={mon.id: mon for mon in POKEMON},
+            fast_moves={move.move_id: move for move in FAST_MOVES},
+            charged_moves={move.move_id: move for move in CHARGED_MOVES},
+            leagues=LEAGUES,
+        )
+
+    @classmethod
+    def load(cls, gamemaster_path: Path, leagues_dir: Path = DATA_DIR) -> "Registry":
+        """Load a gamemaster file, and the league files (e.g. `great.json`) in `leagues_dir`."""
+
+        content = gamemaster_path.read_bytes()
+        gamemaster = json.loads(content)
+        fast, charged = load_moves_from_gamemaster(gamemaster)
+        fast_moves = {move.move_id: move for move in fast}
+        charged_moves = {move.move_id: move for move in charged}
+        pokemon = {
+            mon.id: mon
+            for mon in load_pokemon_from_gamemaster(gamemaster, fast_moves.__getitem__, charged_moves.__getitem__)
+        }
+        registry = cls(
+            gamemaster_hash=hash_gamemaster(content),
+            pokemon=pokemon,
+            fast_moves=fast_moves,
+            charged_moves=charged_moves,
+            leagues={},
+        )
+
+        for name, league in LEAGUES.items():
+            registry.leagues[name] = load_league(
+                name,
+                league.name,
+                league.max_cp,
+                leagues_dir,
+                registry.species_by_id,
+                fast_moves.__getitem__,
+                charged_moves.__getitem__,
+            )
+
+        return registry
+
+    def species_by_id(self, species_id: str, as_shadow: bool = False) -> PokemonSpecies:
+        """Same as `get_species_by_id`, in this registry."""
+
+        is_shadow = ("_shadow" in species_id) or as_shadow
+        species_id = species_id.replace("_shadow", "")
+
+        if not (maybe_mon := self.pokemon.get(species_id)):
+            raise ValueError(f"Species not found: {species_id}")
+
+        if is_shadow:
+            maybe_mon = maybe_mon.model_copy(update={"is_shadow": True})
+
+        return maybe_mon
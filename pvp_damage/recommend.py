@@ -0,0 +1,156 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import FloatArray, IntArray, IVTable, compute_iv_table
+from pvp_damage.models.leagues import League
+from pvp_damage.models.moves import FastMove
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+from pvp_damage.sweep import rank1_defenders, sweep_moves
+
+
+@dataclass(frozen=True)
+class IVRecommendations:
+    """
+    Per-IV breakpoint and bulkpoint counts against a meta, and the IVs that are on the
+    Pareto frontier of (stat product, breakpoints, bulkpoints).
+
+    `breakpoints[i]` counts the extra fast move damage that row i of `table` does over
+    the weakest IVs, summed across the meta; `bulkpoints[i]` counts the fast move damage
+    it avoids compared to the frailest IVs.
+    """
+
+    table: IVTable
+    breakpoints: IntArray
+    bulkpoints: IntArray
+    stat_product: FloatArray
+    pareto: IntArray
+
+    def frontier(self) -> IVTable:
+        return self.table.take(self.pareto)
+
+
+def pareto_front(first: FloatArray, second: IntArray, third: IntArray) -> IntArray:
+    """
+    Find the points that are not dominated when maximizing all three objectives, and
+    return their indices (ordered by `first`, descending). `second` and `third` must be
+    non-negative integers.
+
+    This is a sort-and-sweep skyline: after sorting the distinct points in descending
+    lexicographic order, anything that dominates a point comes before it, so we only have
+    to remember the best `third` seen so far for each value of `second` (or higher).
+    """
+
+    points = np.stack([first, second, third], axis=1)
+    distinct, inverse = np.unique(points, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # best_third[s] = the best `third` among points on the frontier with `second` >= s
+    best_third = np.full(int(distinct[:, 1].max()) + 1, -1, dtype=np.int64)
+    on_front = np.zeros(len(distinct), dtype=np.bool_)
+    for k in np.lexsort((-distinct[:, 2], -distinct[:, 1], -distinct[:, 0])):
+        s, t = int(distinct[k, 1]), int(distinct[k, 2])
+        if best_third[s] >= t:
+            continue
+
+        on_front[k] = True
+        best_third[: s + 1] = np.maximum(best_third[: s + 1], t)
+
+    indices = np.flatnonzero(on_front[inverse])
+    return indices[np.argsort(-first[indices], kind="stable")]
+
+
+def _damage_points(table: IVTable, fast_move: FastMove, league: League) -> tuple[IntArray, IntArray]:
+    """
+    (meta, IVs) fast move damage gained over the weakest IVs against each meta entry, and
+    damage prevented compared to the frailest IVs.
+
+    Breakpoints are computed against the rank 1 of each meta species, and bulkpoints
+    against the rank 1 of each meta entry using its fast move.
+    """
+
+    rank1s = {mon.species: mon for mon in rank1_defenders(league)}
+    opponents = [rank1s[opponent] for opponent, _moveset in league.meta]
+
+    # damage we do to each meta entry: (meta, IVs)
+    damage_dealt = sweep_moves(table, opponents, moves=[fast_move]).damage[0]
+
+    # damage each meta entry does to us: (meta, IVs), computed per distinct defense stat
+    classes = table.defense_classes
+    damage_taken = classes.expand(
+        np.stack([
+            calculate_damage_array(moveset.fast, opponent.species, opponent.attack_stat, table.species, classes.values)
+            for opponent, (_species, moveset) in zip(opponents, league.meta, strict=True)
+        ])
+    )
+
+    return (
+        damage_dealt - damage_dealt.min(axis=1, keepdims=True),
+        damage_taken.max(axis=1, keepdims=True) - damage_taken,
+    )
+
+
+def recommend_ivs(species: PokemonSpecies, fast_move: FastMove, league: League) -> IVRecommendations:
+    """
+    Score every IV spread of a species against a league's meta, then find the spreads
+    worth looking for: the ones where no other spread has at least as much stat product
+    *and* hits at least as many breakpoints and bulkpoints.
+    """
+
+    table = compute_iv_table(species, league.max_cp)
+    gained, prevented = _damage_points(table, fast_move, league)
+    breakpoints = gained.sum(axis=0)
+    bulkpoints = prevented.sum(axis=0)
+
+    return IVRecommendations(
+        table=table,
+        breakpoints=breakpoints,
+        bulkpoints=bulkpoints,
+        stat_product=table.stat_product,
+        pareto=pareto_front(table.stat_product, breakpoints, bulkpoints),
+    )
+
+
+@dataclass(frozen=True)
+class IVScores:
+    """
+    Per-IV scores against a meta, weighted by the league's `weights`: `breakpoints[i]` is
+    the weighted sum of the damage row i of `table` gains over the weakest IVs against
+    each meta entry, `bulkpoints[i]` of the damage it prevents compared to the frailest,
+    and `score` their sum (with bulkpoints times `bulk_weight`). `order` ranks the rows,
+    best first (ties go to the higher stat product).
+    """
+
+    table: IVTable
+    breakpoints: FloatArray
+    bulkpoints: FloatArray
+    score: FloatArray
+    order: IntArray
+
+    def ranked(self, n: int | None = None) -> list[tuple[Pokemon, float]]:
+        return [(self.table.pokemon(int(i)), float(self.score[i])) for i in self.order[:n]]
+
+
+def score_ivs(species: PokemonSpecies, fast_move: FastMove, league: League, *, bulk_weight: float = 1.0) -> IVScores:
+    """
+    Like `recommend_ivs`, but each meta entry counts by its weight (see `League.weights`),
+    and the spreads are ranked by one score. Stacking the damage gained and prevented
+    into one (2 * meta, IVs) matrix, the score is a single matrix-vector product with
+    the weights.
+    """
+
+    table = compute_iv_table(species, league.max_cp)
+    gained, prevented = _damage_points(table, fast_move, league)
+
+    weights = np.array(league.meta_weights, dtype=np.float64)
+    points = np.concatenate([gained, prevented]).astype(np.float64)
+    score = np.concatenate([weights, bulk_weight * weights]) @ points
+
+    return IVScores(
+        table=table,
+        breakpoints=weights @ gained,
+        bulkpoints=weights @ prevented,
+        score=score,
+        order=np.lexsort((-table.stat_product, -score)),
+    )
@@ -0,0 +1,137 @@
+"""
+What changed between two versions of the gamemaster and league files, so that a data
+refresh only recomputes what it has to.
+
+`scripts/fetch_data.py` compares the files it downloads against the ones on disk and
+writes a `ChangeSet` next to them (`data/changes.json`). Saved results are keyed by the
+gamemaster hash, so after a refresh they would all be recomputed; instead, the change
+set is used to carry over everything that doesn't depend on what changed -
+
+    changes = ChangeSet.load(Path("data/changes.json"))
+    with MetaIndex(Path("meta_index.sqlite")) as index:
+        index.update(changes)
+    with CheckpointStore(Path("sweeps.sqlite")) as store:
+        store.carry_over(changes.old_hash, changes.keeps_sweep)
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+def hash_gamemaster(content: bytes) -> str:
+    """
+    The same hash as `constants.hash_gamemaster`, without importing the models (which load
+    the gamemaster on disk, and a fetch has to work before there is one).
+    """
+
+    return hashlib.sha256(content).hexdigest()
+
+
+def _by_key(items: list[dict[str, Any]], key: str, fields: tuple[str, ...]) -> dict[str, tuple[Any, ...]]:
+    return {item[key]: tuple(json.dumps(item.get(field), sort_keys=True) for field in fields) for item in items}
+
+
+def _changed_keys(old: Mapping[str, Any], new: Mapping[str, Any]) -> set[str]:
+    """Keys that were added, removed, or whose values differ."""
+
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+class ChangeSet(BaseModel):
+    """
+    species: IDs (without a shadow suffix) of species that were added or removed, or
+    whose base stats, types or movepool changed.
+    moves: IDs of moves that were added or removed, or whose power or type changed.
+    leagues: short names (e.g. "great") of leagues whose meta changed.
+    """
+
+    old_hash: str
+    new_hash: str
+    species: frozenset[str] = frozenset()
+    moves: frozenset[str] = frozenset()
+    leagues: frozenset[str] = frozenset()
+
+    model_config = ConfigDict(frozen=True)
+
+    @classmethod
+    def compare(
+        cls,
+        old_gamemaster: bytes,
+        new_gamemaster: bytes,
+        old_leagues: Mapping[str, bytes],
+        new_leagues: Mapping[str, bytes],
+    ) -> "ChangeSet":
+        """Compare the raw contents of the gamemaster and league files."""
+
+        old, new = json.loads(old_gamemaster), json.loads(new_gamemaster)
+        species_fields = ("baseStats", "types", "fastMoves", "chargedMoves")
+        move_fields = ("power", "type")
+
+        return cls(
+            old_hash=hash_gamemaster(old_gamemaster),
+            new_hash=hash_gamemaster(new_gamemaster),
+            species=frozenset(
+                _changed_keys(
+                    _by_key(old["pokemon"], "speciesId", species_fields),
+                    _by_key(new["pokemon"], "speciesId", species_fields),
+                )
+            ),
+            moves=frozenset(
+                _changed_keys(
+                    _by_key(old["moves"], "moveId", move_fields), _by_key(new["moves"], "moveId", move_fields)
+                )
+            ),
+            leagues=frozenset(
+                _changed_keys(
+                    {name: json.loads(content) for name, content in old_leagues.items()},
+                    {name: json.loads(content) for name, content in new_leagues.items()},
+                )
+            ),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ChangeSet":
+        return cls.model_validate_json(path.read_text())
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(self.model_dump(mode="json"), indent=2, sort_keys=True) + "\n")
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.species or self.moves or self.leagues) and self.old_hash == self.new_hash
+
+    def affects_pair(self, attacker: str, move: str, defender: str) -> bool:
+        """Whether damage between two species (by ID or key) with a move (by ID) may have changed."""
+
+        species = {attacker.removesuffix("_shadow"), defender.removesuffix("_shadow")}
+        return bool(species & self.species) or move in self.moves
+
+    def keeps_sweep(self, params: dict[str, Any], result: bytes) -> bool:
+        """Whether a saved `sweep_unit` result is still valid, for `CheckpointStore.carry_over`."""
+
+        if params["league"] in self.leagues or params["species"] in self.species:
+            return False
+
+        # imported here since checkpoint loads the gamemaster, which fetching doesn't need
+        from pvp_damage.checkpoint import decode_sweep
+
+        data = decode_sweep(result)
+        moves = set(data["moves"].tolist())
+        defenders = set(data["defender_species"].tolist())
+        return not (moves & self.moves or defenders & self.species)
+
+    def __str__(self) -> str:
+        def names(values: frozenset[str]) -> str:
+            return ", ".join(sorted(values)) or "none"
+
+        return (
+            f"gamemaster {self.old_hash[:12]} -> {self.new_hash[:12]}\n"
+            f"  species: {names(self.species)}\n"
+            f"  moves: {names(self.moves)}\n"
+            f"  leagues: {names(self.leagues)}"
+        )
@@ -0,0 +1,171 @@
+import json
+from typing import TYPE_CHECKING, Any, Protocol, TextIO
+
+from pvp_damage.models.moves import Move
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+
+if TYPE_CHECKING:
+    from pvp_damage.damage import DamageRanges
+
+
+class Reporter(Protocol):
+    """
+    Receives the results of `compute_bulkpoints` and `compute_breakpoints`. The engines
+    hand over the raw results and don't format anything themselves, so any formatting
+    cost is only paid by reporters that actually output something.
+    """
+
+    def bulkpoints(self, attacker: Pokemon, move: Move, ranges: "DamageRanges") -> None: ...
+
+    def breakpoints(
+        self, attacker_species: PokemonSpecies, defender: Pokemon, move: Move, ranges: "DamageRanges"
+    ) -> None: ...
+
+
+class NullReporter:
+    """Reports nothing; the default for library use."""
+
+    def bulkpoints(self, attacker: Pokemon, move: Move, ranges: "DamageRanges") -> None:
+        pass
+
+    def breakpoints(
+        self, attacker_species: PokemonSpecies, defender: Pokemon, move: Move, ranges: "DamageRanges"
+    ) -> None:
+        pass
+
+
+NULL_REPORTER = NullReporter()
+
+
+def _count(ranges: "DamageRanges") -> int:
+    return sum(len(mons) for mons in ranges.ranges_all.values())
+
+
+class ConsoleReporter:
+    """Human-readable summaries, one line per damage value."""
+
+    def __init__(self, file: TextIO | None = None):
+        self.file = file
+
+    def _print(self, line: str) -> None:
+        print(line, file=self.file)
+
+    def bulkpoints(self, attacker: Pokemon, move: Move, ranges: "DamageRanges") -> None:
+        # more defense means less damage, so the extremes are at the ends of the damage range
+        lowest_defense = ranges.ranges[ranges.max_damage][0]
+        highest_defense = ranges.ranges[ranges.min_damage][1]
+        total = _count(ranges)
+
+        if ranges.min_damage == ranges.max_damage:
+            self._print(
+                f"The given {attacker.species.name} ({attacker.ivs}, level {attacker.level}) will always do {ranges.min_damage} damage to these {total} {lowest_defense.species.name}. "
+                + "There are no bulkpoints."
+            )
+            return
+
+        rank1 = f"{ranges.rank1.defense_stat:.2f}" if ranges.rank1 else "?"
+        self._print(
+            f"{attacker.species.full_name} using {move}; CP {attacker.cp} (level {attacker.level}, {attacker.ivs})"
+        )
+        self._print(
+            f"vs. {lowest_defense.species.full_name} ({lowest_defense.defense_stat:.2f} - {highest_defense.defense_stat:.2f} defense); rank 1 {rank1} def)"
+        )
+
+        for damage, (lowest, highest) in sorted(ranges.ranges.items()):
+            percent = len(ranges.ranges_all[damage]) / total * 100
+            self._print(
+                f"- {damage}: {percent:.2f}% of IVs; {lowest.defense_stat:.2f} - {highest.defense_stat:.2f} defense"
+            )
+
+    def breakpoints(
+        self, attacker_species: PokemonSpecies, defender: Pokemon, move: Move, ranges: "DamageRanges"
+    ) -> None:
+        if ranges.min_damage == ranges.max_damage:
+            self._print(f"- {ranges.min_damage} damage guaranteed (no breakpoints)")
+            return
+
+        # more attack means more damage, so the extremes are at the ends of the damage range
+        lowest_attack = ranges.ranges[ranges.min_damage][0]
+        highest_attack = ranges.ranges[ranges.max_damage][1]
+        total = _count(ranges)
+
+        self._print(
+            f"{attacker_species.full_name} ({lowest_attack.attack_stat:.3f} - {highest_attack.attack_stat:.3f}) using {move}"
+        )
+        self._print(f"vs. {defender.species.full_name} ({defender.ivs}, level {defender.level})")
+
+        for damage, (lowest, highest) in sorted(ranges.ranges.items()):
+            percent = len(ranges.ranges_all[damage]) / total * 100
+            self._print(f"- {damage}: {percent:.2f}% of IVs; atk: {lowest.attack_stat:.3f} - {highest.attack_stat:.3f}")
+
+
+def _pokemon_json(mon: Pokemon) -> dict[str, Any]:
+    return {"species": mon.species.id, "shadow": mon.species.is_shadow, "ivs": list(mon.ivs), "level": mon.level}
+
+
+def _damage_records(ranges: "DamageRanges", stat: str) -> list[dict[str, Any]]:
+    total = _count(ranges)
+    return [
+        {
+            "damage": damage,
+            "count": len(ranges.ranges_all[damage]),
+            "share": len(ranges.ranges_all[damage]) / total,
+            "min": getattr(lowest, stat),
+            "max": getattr(highest, stat),
+        }
+        for damage, (lowest, highest) in sorted(ranges.ranges.items())
+    ]
+
+
+def bulkpoints_record(attacker: Pokemon, move: Move, ranges: "DamageRanges") -> dict[str, Any]:
+    """A JSON-serializable summary of a `compute_bulkpoints` result."""
+
+    defender = ranges.ranges[ranges.min_damage][0].species
+    return {
+        "analysis": "bulkpoints",
+        "attacker": _pokemon_json(attacker),
+        "defender": {"species": defender.id, "shadow": defender.is_shadow},
+        "move": move.move_id,
+        "min_damage": ranges.min_damage,
+        "max_damage": ranges.max_damage,
+        "rank1": _pokemon_json(ranges.rank1) if ranges.rank1 else None,
+        "damage_rank1": ranges.damage_rank1,
+        "ranges": _damage_records(ranges, "defense_stat"),
+    }
+
+
+def breakpoints_record(
+    attacker_species: PokemonSpecies, defender: Pokemon, move: Move, ranges: "DamageRanges"
+) -> dict[str, Any]:
+    """A JSON-serializable summary of a `compute_breakpoints` result."""
+
+    return {
+        "analysis": "breakpoints",
+        "attacker": {"species": attacker_species.id, "shadow": attacker_species.is_shadow},
+        "defender": _pokemon_json(defender),
+        "move": move.move_id,
+        "min_damage": ranges.min_damage,
+        "max_damage": ranges.max_damage,
+        "ranges": _damage_records(ranges, "attack_stat"),
+    }
+
+
+class JsonLinesReporter:
+    """
+    One JSON object per analysis, for pipelines. Each damage value in the result gets
+    the number of IVs that do that damage and the range of the stat that decides it.
+    """
+
+    def __init__(self, file: TextIO):
+        self.file = file
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self.file.write(json.dumps(record) + "\n")
+
+    def bulkpoints(self, attacker: Pokemon, move: Move, ranges: "DamageRanges") -> None:
+        self._write(bulkpoints_record(attacker, move, ranges))
+
+    def breakpoints(
+        self, attacker_species: PokemonSpecies, defender: Pokemon, move: Move, ranges: "DamageRanges"
+    ) -> None:
+        self._write(breakpoints_record(attacker_species, defender, move, ranges))
@@ -0,0 +1,291 @@
+"""
+A small HTTP service for breakpoint and bulkpoint lookups, so tools that ask questions
+all day don't each pay for parsing the gamemaster and building IV tables from cold.
+The models, league metas, and IV tables stay loaded in the worker processes.
+
+    python scripts/serve.py --port 8157
+
+Every endpoint is a GET with query parameters, and returns JSON:
+
+    /breakpoints?attacker=Annihilape&defender=Clodsire&move=Counter&league=great
+        optional: attacker_shadow, defender_shadow, buff, defender_ivs (e.g., 0,15,15; default rank 1)
+    /bulkpoints?attacker=Serperior&attacker_ivs=8,15,15&defender=Swampert&move=Vine Whip&league=ultra
+        optional: attacker_shadow, defender_shadow, buff, level (default: max level for the league)
+    /rank?species=Azumarill&ivs=0,15,15&league=great
+    /meta-matrix?league=great
+        fast move damage of every meta entry against the rank 1 of every meta species
+
+The service only listens on loopback addresses; it's meant for one machine, not a network.
+Requests are parsed on the event loop, and the computations run in a worker pool.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import ipaddress
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import cache, lru_cache
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from pvp_damage.damage import calculate_damage, compute_breakpoints, compute_bulkpoints, compute_iv_possibilities
+from pvp_damage.iv_table import get_iv_table
+from pvp_damage.models.constants import BuffDebuff, IVs
+from pvp_damage.models.leagues import LEAGUES, League
+from pvp_damage.models.moves import Move, get_move_by_name
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies, get_species
+from pvp_damage.report import breakpoints_record, bulkpoints_record
+from pvp_damage.sweep import rank1_defenders
+
+type Params = dict[str, str]
+
+
+def _param(params: Params, name: str) -> str:
+    if name not in params:
+        raise ValueError(f"Missing parameter: {name}")
+    return params[name]
+
+
+def _flag(params: Params, name: str) -> bool:
+    return params.get(name, "false").lower() in {"1", "true", "yes"}
+
+
+def _ivs(text: str) -> IVs:
+    ivs = tuple(int(iv) for iv in text.split(","))
+    if len(ivs) != 3 or not all(0 <= iv <= 15 for iv in ivs):
+        raise ValueError(f"IVs must be three numbers from 0 to 15: {text}")
+    return ivs  # pyright: ignore[reportReturnType]
+
+
+def _buff(params: Params) -> BuffDebuff:
+    buff = int(params.get("buff", 0))
+    if not -4 <= buff <= 4:
+        raise ValueError(f"Buffs must be from -4 to 4: {buff}")
+    return buff  # pyright: ignore[reportReturnType]
+
+
+def _league_name(params: Params) -> str:
+    name = params.get("league", "great")
+    if name not in LEAGUES:
+        raise ValueError(f"Unknown league: {name}")
+    return name
+
+
+def _league(params: Params) -> League:
+    return LEAGUES[_league_name(params)]
+
+
+@cache
+def _species(name: str, shadow: bool) -> PokemonSpecies:
+    return get_species(name, as_shadow=shadow)
+
+
+@cache
+def _move(name: str) -> Move:
+    return get_move_by_name(name)
+
+
+# 4096 Pokemon per entry, so only keep the species that were asked about recently
+@lru_cache(maxsize=32)
+def _candidates(species: PokemonSpecies, cp_limit: int) -> list[Pokemon]:
+    return list(compute_iv_possibilities(species, cp_limit).values())
+
+
+def breakpoints(params: Params) -> dict[str, Any]:
+    league = _league(params)
+    attacker = _species(_param(params, "attacker"), _flag(params, "attacker_shadow"))
+    defender_species = _species(_param(params, "defender"), _flag(params, "defender_shadow"))
+    move = _move(_param(params, "move"))
+
+    table = get_iv_table(defender_species, league.max_cp)
+    if "defender_ivs" in params:
+        defender = table.pokemon(table.index_of(_ivs(params["defender_ivs"])))
+    else:
+        defender = table.rank1()
+
+    result = compute_breakpoints(
+        attacker,
+        defender,
+        move,
+        league.max_cp,
+        attackers=_candidates(attacker, league.max_cp),
+        attacker_buff=_buff(params),
+    )
+    return breakpoints_record(attacker, defender, move, result)
+
+
+def bulkpoints(params: Params) -> dict[str, Any]:
+    league = _league(params)
+    attacker_species = _species(_param(params, "attacker"), _flag(params, "attacker_shadow"))
+    defender = _species(_param(params, "defender"), _flag(params, "defender_shadow"))
+    move = _move(_param(params, "move"))
+
+    table = get_iv_table(attacker_species, league.max_cp)
+    attacker = table.pokemon(table.index_of(_ivs(_param(params, "attacker_ivs"))))
+    if "level" in params:
+        attacker = Pokemon(species=attacker_species, level=float(params["level"]), ivs=attacker.ivs)
+
+    result = compute_bulkpoints(
+        attacker,
+        _candidates(defender, league.max_cp),
+        move,
+        league.max_cp,
+        attacker_buff=_buff(params),
+    )
+    return bulkpoints_record(attacker, move, result)
+
+
+def rank(params: Params) -> dict[str, Any]:
+    league = _league(params)
+    species = _species(_param(params, "species"), _flag(params, "shadow"))
+    table = get_iv_table(species, league.max_cp)
+    i = table.index_of(_ivs(_param(params, "ivs")))
+
+    stat_product = table.stat_product[i]
+    return {
+        "species": species.id,
+        "ivs": list(table.ivs[i].tolist()),
+        "level": float(table.levels[i]),
+        "cp": int(table.cp[i]),
+        "stat_product": float(stat_product),
+        "rank": int(table.rank[i]),
+        "percent_of_rank1": float(stat_product / table.stat_product.max() * 100),
+    }
+
+
+@cache
+def _meta_matrix(name: str) -> dict[str, Any]:
+    # leagues aren't hashable, so cache by name
+    league = LEAGUES[name]
+    defenders = rank1_defenders(league)
+
+    rows: list[list[int]] = []
+    for species, moveset in league.meta:
+        attacker = get_iv_table(species, league.max_cp).rank1()
+        rows.append([calculate_damage(moveset.fast, attacker, defender) for defender in defenders])
+
+    return {
+        "league": league.name,
+        "attackers": [{"species": species.id, "move": moveset.fast.move_id} for species, moveset in league.meta],
+        "defenders": [mon.species.id for mon in defenders],
+        "damage": rows,
+    }
+
+
+def meta_matrix(params: Params) -> dict[str, Any]:
+    return _meta_matrix(_league_name(params))
+
+
+ROUTES: dict[str, Callable[[Params], dict[str, Any]]] = {
+    "/breakpoints": breakpoints,
+    "/bulkpoints": bulkpoints,
+    "/rank": rank,
+    "/meta-matrix": meta_matrix,
+}
+
+
+def handle(path: str, params: Params) -> tuple[int, dict[str, Any]]:
+    """Run one request (in a worker); returns the HTTP status and the JSON body."""
+
+    if path not in ROUTES:
+        return 404, {"error": f"Not found: {path}"}
+
+    try:
+        return 200, ROUTES[path](params)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+
+def warm_up() -> None:
+    """Build the IV tables for every meta species ahead of the first request."""
+
+    for league in LEAGUES.values():
+        rank1_defenders(league)
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class Service:
+    def __init__(self, executor: Executor):
+        self.executor = executor
+
+    async def respond(self, method: str, target: str) -> tuple[int, dict[str, Any]]:
+        if method != "GET":
+            return 405, {"error": f"Method not allowed: {method}"}
+
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, handle, url.path, params)
+        except Exception as e:
+            return 500, {"error": repr(e)}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # HTTP/1.1 with keep-alive: read requests until the client closes the connection
+        try:
+            while request_line := await reader.readline():
+                method, target, _version = request_line.decode().split(" ", 2)
+
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if length := int(headers.get("content-length", 0)):
+                    await reader.readexactly(length)
+
+                status, body = await self.respond(method, target)
+                payload = json.dumps(body).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                connection = "keep-alive" if keep_alive else "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {connection}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass  # a malformed request or a client that went away
+        finally:
+            writer.close()
+
+
+def check_loopback(host: str) -> None:
+    if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+        raise ValueError(f"Only loopback addresses are allowed: {host}")
+
+
+async def start(host: str, port: int, executor: Executor) -> asyncio.Server:
+    """Start serving on the given loopback address (port 0 picks a free port)."""
+
+    check_loopback(host)
+    return await asyncio.start_server(Service(executor).handle_connection, host, port)
+
+
+async def _serve(host: str, port: int, workers: int) -> None:
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up) as executor:
+        server = await start(host, port, executor)
+        print(f"Serving on http://{host}:{port} with {workers} workers")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address to listen on")
+    parser.add_argument("--port", type=int, default=8157)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args(argv)
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args.host, args.port, args.workers))
+
+    return 0
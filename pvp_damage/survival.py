@@ -0,0 +1,108 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import IntArray, IVTable, compute_iv_table
+from pvp_damage.models.constants import BuffDebuff
+from pvp_damage.models.moves import Move, Moveset
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+
+
+@dataclass(frozen=True)
+class HitsToFaint:
+    """
+    How many uses of one move it takes to faint each defender in an IV table.
+
+    `damage` and `hits` have one entry per row of the defender table; `partitions`
+    splits the defenders by the number of hits it takes to faint them.
+    """
+
+    move: Move
+    damage: IntArray
+    hits: IntArray
+    partitions: Mapping[int, IVTable]
+
+    @property
+    def min_hits(self) -> int:
+        return int(self.hits.min())
+
+    @property
+    def max_hits(self) -> int:
+        return int(self.hits.max())
+
+
+@dataclass(frozen=True)
+class SurvivalAnalysis:
+    attacker: Pokemon
+    defenders: IVTable
+    fast: HitsToFaint
+    charged: tuple[HitsToFaint, ...]
+
+
+def _hits_to_faint(
+    move: Move,
+    attacker: Pokemon,
+    defenders: IVTable,
+    *,
+    attacker_buff: BuffDebuff,
+    defender_buff: BuffDebuff,
+) -> HitsToFaint:
+    # both only depend on the defender's defense and HP, so compute them once per distinct pair
+    classes = defenders.bulk_classes
+    defense, stamina = classes.values[:, 0], classes.values[:, 1].astype(np.int64)
+    damage_by_class = calculate_damage_array(
+        move,
+        attacker.species,
+        attacker.attack_stat,
+        defenders.species,
+        defense,
+        attacker_buff=attacker_buff,
+        defender_buff=defender_buff,
+    )
+
+    # damage is always at least 1, so this is ceil(hp / damage) without going through floats
+    damage = classes.expand(damage_by_class)
+    hits = classes.expand((stamina + damage_by_class - 1) // damage_by_class)
+    partitions = {int(n): defenders.take(hits == n) for n in np.unique(hits)}
+
+    return HitsToFaint(move=move, damage=damage, hits=hits, partitions=partitions)
+
+
+def compute_hits_to_faint(
+    attacker: Pokemon,
+    defender: PokemonSpecies | IVTable,
+    cp_limit: int,
+    *,
+    moveset: Moveset | None = None,
+    attacker_buff: BuffDebuff = 0,
+    defender_buff: BuffDebuff = 0,
+) -> SurvivalAnalysis:
+    """
+    Compute how many fast moves (and how many of each charged move) the attacker needs
+    to faint every possible defender. This combines the damage per hit with each
+    defender's HP, which is what decides whether a bulkpoint actually matters: a
+    bulkpoint that doesn't change the number of hits to faint doesn't buy anything.
+
+    defender: either a `PokemonSpecies` (we will check over all IVs, powered up to the
+    max level for the league) or an `IVTable` of candidates.
+
+    moveset: the attacker's moves; defaults to `attacker.moveset`.
+    """
+
+    moveset = moveset or attacker.moveset
+    if moveset is None:
+        raise ValueError(f"No moveset given for {attacker.species.name}")
+
+    defenders = compute_iv_table(defender, cp_limit) if isinstance(defender, PokemonSpecies) else defender
+
+    def hits_to_faint(move: Move) -> HitsToFaint:
+        return _hits_to_faint(move, attacker, defenders, attacker_buff=attacker_buff, defender_buff=defender_buff)
+
+    return SurvivalAnalysis(
+        attacker=attacker,
+        defenders=defenders,
+        fast=hits_to_faint(moveset.fast),
+        charged=tuple(hits_to_faint(move) for move in moveset.charged),
+    )
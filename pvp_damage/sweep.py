@@ -0,0 +1,104 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import BoolArray, IntArray, IVTable, compute_iv_table, get_iv_table
+from pvp_damage.models.constants import BuffDebuff
+from pvp_damage.models.leagues import League
+from pvp_damage.models.moves import ChargedMove, Move
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies
+
+
+@dataclass(frozen=True)
+class MoveSweep:
+    """
+    The damage every attacker IV does with each move against each defender.
+    `damage[m, d, i]` is the damage that row i of `attackers` does using `moves[m]`
+    against `defenders[d]`.
+    """
+
+    attackers: IVTable
+    moves: list[Move]
+    defenders: list[Pokemon]
+    damage: IntArray
+
+    @property
+    def has_breakpoints(self) -> BoolArray:
+        """(moves, defenders) array; True where the damage depends on the attacker's IVs."""
+
+        return self.damage.min(axis=2) != self.damage.max(axis=2)
+
+    def partition(self, move: Move, defender: int = 0) -> dict[int, IVTable]:
+        """Split the attackers by how much damage they do with `move` to `defenders[defender]`."""
+
+        damage = self.damage[self.moves.index(move), defender]
+        return {int(value): self.attackers.take(damage == value) for value in np.unique(damage)}
+
+
+def rank1_defenders(league: League) -> list[Pokemon]:
+    """The rank 1 (highest stat product) IVs of each species in the league's meta."""
+
+    rank1s: dict[PokemonSpecies, Pokemon] = {}
+    for species, _moveset in league.meta:
+        if species not in rank1s:
+            rank1s[species] = get_iv_table(species, league.max_cp).rank1()
+
+    return list(rank1s.values())
+
+
+def sweep_moves(
+    attacker: PokemonSpecies | IVTable,
+    defender: Pokemon | Sequence[Pokemon] | League,
+    cp_limit: int | None = None,
+    *,
+    moves: Sequence[Move] | None = None,
+    include_charged: bool = False,
+    attacker_buff: BuffDebuff = 0,
+) -> MoveSweep:
+    """
+    Compute the damage that all possible attackers do with every move they learn, against
+    one defender, a list of defenders, or the rank 1 of each species in a league's meta.
+    This is the same as calling `compute_breakpoints` once per move and defender, except
+    that the IV table is only built once, and damage is only computed once per distinct
+    attack stat (many IV spreads share one) and then broadcast back to every IV.
+
+    moves: the moves to check; defaults to all the attacker's fast moves (and charged
+    moves too, with `include_charged`).
+
+    cp_limit: required unless it can be taken from the league or the attacker's IV table.
+    """
+
+    if isinstance(defender, League):
+        cp_limit = defender.max_cp
+        defenders = rank1_defenders(defender)
+    else:
+        defenders = [defender] if isinstance(defender, Pokemon) else list(defender)
+
+    if isinstance(attacker, IVTable):
+        attackers = attacker
+    elif cp_limit is None:
+        raise ValueError("A CP limit is needed to build the attacker's IV table")
+    else:
+        attackers = compute_iv_table(attacker, cp_limit)
+
+    species = attackers.species
+    if moves is None:
+        charged = species.charged_moves if include_charged else frozenset[ChargedMove]()
+        moves = [
+            *sorted(species.fast_moves, key=lambda move: move.name),
+            *sorted(charged, key=lambda move: move.name),
+        ]
+
+    # damage only depends on the attack stat, so compute it once per distinct value
+    classes = attackers.attack_classes
+    damage = np.empty((len(moves), len(defenders), len(attackers)), dtype=np.int64)
+    for m, move in enumerate(moves):
+        for d, mon in enumerate(defenders):
+            damage_by_value = calculate_damage_array(
+                move, species, classes.values, mon.species, mon.defense_stat, attacker_buff=attacker_buff
+            )
+            damage[m, d] = classes.expand(damage_by_value)
+
+    return MoveSweep(attackers=attackers, moves=list(moves), defenders=defenders, damage=damage)
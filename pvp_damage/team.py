@@ -0,0 +1,228 @@
+"""
+Pick IVs for a whole team at once: which combination of IV spreads, one per team member,
+hits the most meta breakpoints and bulkpoints between them?
+
+Each meta entry is two matchups: a breakpoint (our fast move against its rank 1) and a
+bulkpoint (its fast move from its rank 1 against us), like in `recommend_ivs`. An IV
+spread "wins" a matchup on damage if it does the most damage (or takes the least) that
+any spread of its species can, and not every spread does; a team covers a matchup if any
+member wins it. So each spread becomes a bitmask of the matchups it wins, and a team's
+coverage is the number of bits in the union of its members' masks.
+
+Instead of trying all 4096^3 combinations, the spreads of each member are grouped by
+mask (there are usually a few dozen distinct ones), masks that are a subset of another
+mask of the same member are dropped (they can't do better), and the combinations are
+searched best-first, skipping any branch whose union with everything the remaining
+members could add can't beat the best teams found so far.
+
+    python scripts/team_ivs.py "Medicham:Counter" Azumarill "Altaria:Dragon Breath" --league great
+"""
+
+import argparse
+import heapq
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from pvp_damage import instrument
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import BoolArray, IntArray, IVTable, get_iv_table
+from pvp_damage.models.leagues import LEAGUES, League
+from pvp_damage.models.moves import FastMove, get_fast_move
+from pvp_damage.models.pokemon import Pokemon, PokemonSpecies, get_species
+from pvp_damage.sweep import rank1_defenders
+
+type Member = tuple[PokemonSpecies, FastMove]
+
+
+def matchups(league: League) -> list[str]:
+    """What each bit of a coverage mask stands for: the breakpoints, then the bulkpoints."""
+
+    return [
+        f"{kind} vs. {species.key} ({moveset.fast})"
+        for kind in ("breakpoint", "bulkpoint")
+        for species, moveset in league.meta
+    ]
+
+
+def win_matrix(species: PokemonSpecies, fast_move: FastMove, league: League) -> tuple[IVTable, BoolArray]:
+    """(IVs, matchups) booleans: whether each spread wins each matchup on damage."""
+
+    table = get_iv_table(species, league.max_cp)
+    rank1s = {mon.species: mon for mon in rank1_defenders(league)}
+    opponents = [rank1s[opponent] for opponent, _moveset in league.meta]
+
+    # (meta, IVs) damage we do, and damage we take, computed per distinct stat
+    attack, defense = table.attack_classes, table.defense_classes
+    dealt: IntArray = attack.expand(
+        np.stack([
+            calculate_damage_array(fast_move, species, attack.values, opponent.species, opponent.defense_stat)
+            for opponent in opponents
+        ])
+    )
+    taken: IntArray = defense.expand(
+        np.stack([
+            calculate_damage_array(moveset.fast, opponent.species, opponent.attack_stat, species, defense.values)
+            for opponent, (_species, moveset) in zip(opponents, league.meta, strict=True)
+        ])
+    )
+
+    # a matchup where every spread does the same damage doesn't set a bit for anyone
+    best_dealt, best_taken = dealt.max(axis=1, keepdims=True), taken.min(axis=1, keepdims=True)
+    wins: BoolArray = np.concatenate([
+        (dealt == best_dealt) & (best_dealt > dealt.min(axis=1, keepdims=True)),
+        (taken == best_taken) & (best_taken < taken.max(axis=1, keepdims=True)),
+    ])
+    return table, wins.T
+
+
+@dataclass(frozen=True)
+class Candidates:
+    """
+    The distinct coverage masks of one team member that aren't a subset of another, with
+    the spreads that have each one (`rows[k]`, indices into `table`), best-covering first.
+    """
+
+    table: IVTable
+    fast_move: FastMove
+    masks: list[int]
+    rows: list[IntArray]
+
+    def pokemon(self, k: int) -> Pokemon:
+        """The spread with the highest stat product among the ones with mask k."""
+
+        rows = self.rows[k]
+        return self.table.pokemon(int(rows[np.argmax(self.table.stat_product[rows])]))
+
+
+def coverage_candidates(species: PokemonSpecies, fast_move: FastMove, league: League) -> Candidates:
+    table, wins = win_matrix(species, fast_move, league)
+
+    # group the spreads by mask, then turn each distinct mask into an int (bit j = matchup j)
+    distinct, inverse = np.unique(wins, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    weights = 1 << np.arange(wins.shape[1], dtype=object)
+    masks = [int((weights * row).sum()) for row in distinct.astype(object)]
+
+    kept = [k for k, mask in enumerate(masks) if not any(other != mask and other | mask == other for other in masks)]
+    kept.sort(key=lambda k: -masks[k].bit_count())
+    return Candidates(
+        table=table,
+        fast_move=fast_move,
+        masks=[masks[k] for k in kept],
+        rows=[np.flatnonzero(inverse == k) for k in kept],
+    )
+
+
+@dataclass(frozen=True)
+class TeamPick:
+    coverage: int
+    mask: int
+    choices: tuple[int, ...]  # per member, an index into its `Candidates`
+
+
+@dataclass(frozen=True)
+class TeamSearch:
+    league: League
+    members: list[Candidates]
+    picks: list[TeamPick]  # best first
+    checked: int  # partial and full teams looked at
+
+    @property
+    def reachable(self) -> int:
+        """How many matchups some spread of some member wins."""
+
+        union = 0
+        for member in self.members:
+            for mask in member.masks:
+                union |= mask
+        return union.bit_count()
+
+    def pokemon(self, pick: TeamPick) -> list[Pokemon]:
+        return [member.pokemon(k) for member, k in zip(self.members, pick.choices, strict=True)]
+
+    def covered(self, pick: TeamPick) -> list[str]:
+        return [name for j, name in enumerate(matchups(self.league)) if pick.mask >> j & 1]
+
+
+def search_team(team: Sequence[Member], league: League, *, top: int = 5) -> TeamSearch:
+    """The `top` combinations of spreads (one per member) that cover the most matchups."""
+
+    if not team:
+        raise ValueError("A team needs at least one member")
+
+    with instrument.span("search_team"):
+        members = [coverage_candidates(species, move, league) for species, move in team]
+
+        # everything members i, i + 1, ... could still add
+        remaining = [0] * (len(members) + 1)
+        for i in reversed(range(len(members))):
+            remaining[i] = remaining[i + 1]
+            for mask in members[i].masks:
+                remaining[i] |= mask
+
+        best: list[tuple[int, tuple[int, ...], int]] = []  # a min-heap of (coverage, choices, mask)
+        checked = 0
+
+        def search(i: int, union: int, choices: tuple[int, ...]) -> None:
+            nonlocal checked
+            checked += 1
+            if i == len(members):
+                entry = (union.bit_count(), tuple(-k for k in choices), union)
+                if len(best) < top:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+                return
+
+            for k, mask in enumerate(members[i].masks):
+                bound = (union | mask | remaining[i + 1]).bit_count()
+                if len(best) == top and bound <= best[0][0]:
+                    # masks are sorted by size, but a smaller one can still add more new bits
+                    if (union | remaining[i + 1]).bit_count() + mask.bit_count() <= best[0][0]:
+                        break
+                    continue
+                search(i + 1, union | mask, (*choices, k))
+
+        search(0, 0, ())
+
+    picks = [
+        TeamPick(coverage=coverage, mask=mask, choices=tuple(-k for k in choices))
+        for coverage, choices, mask in sorted(best, reverse=True)
+    ]
+    return TeamSearch(league=league, members=members, picks=picks, checked=checked)
+
+
+def _member(arg: str, league: League) -> Member:
+    name, _, move = arg.partition(":")
+    species = get_species(name)
+    if move:
+        return species, get_fast_move(move)
+
+    for meta_species, moveset in league.meta:
+        if meta_species == species:
+            return species, moveset.fast
+
+    raise ValueError(f"{name} isn't in the meta; give its fast move as {name}:<move>")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "team", nargs="+", help='species names, with an optional fast move (e.g., "Altaria:Dragon Breath")'
+    )
+    parser.add_argument("--league", choices=list(LEAGUES), default="great")
+    parser.add_argument("--top", type=int, default=5, help="how many teams to show")
+    args = parser.parse_args(argv)
+
+    league = LEAGUES[args.league]
+    search = search_team([_member(arg, league) for arg in args.team], league, top=args.top)
+
+    print(
+        f"{' / '.join(str(len(member.masks)) for member in search.members)} candidate spreads, {search.checked} checked"
+    )
+    for pick in search.picks:
+        team = ", ".join(f"{mon.species.name} {mon.ivs} L{mon.level}" for mon in search.pokemon(pick))
+        print(f"{pick.coverage}/{search.reachable}: {team}")
+    return 0
@@ -28,22 +28,25 @@ def lowest_stamina(pokemons: Iterable[Pokemon]) -> Pokemon:
 
 
 def format_attack_range(pokemons: Iterable[Pokemon]) -> str:
-    lowest = f"{lowest_attack(pokemons).attack_stat:.2f}"
-    highest = f"{highest_attack(pokemons).attack_stat:.2f}"
+    stats = [mon.attack_stat for mon in pokemons]
+    lowest = f"{min(stats):.2f}"
+    highest = f"{max(stats):.2f}"
 
     return f"{lowest} - {highest} attack"
 
 
 def format_defense_range(pokemons: Iterable[Pokemon]) -> str:
-    lowest = f"{lowest_defense(pokemons).defense_stat:.2f}"
-    highest = f"{highest_defense(pokemons).defense_stat:.2f}"
+    stats = [mon.defense_stat for mon in pokemons]
+    lowest = f"{min(stats):.2f}"
+    highest = f"{max(stats):.2f}"
 
     return f"{lowest} - {highest} defense"
 
 
 def format_stamina_range(pokemons: Iterable[Pokemon]) -> str:
-    lowest = f"{lowest_stamina(pokemons).stamina_stat:d}"
-    highest = f"{highest_stamina(pokemons).stamina_stat:d}"
+    stats = [mon.stamina_stat for mon in pokemons]
+    lowest = f"{min(stats):d}"
+    highest = f"{max(stats):d}"
 
     return f"{lowest} - {highest} stamina"
 
@@ -0,0 +1,164 @@
+"""
+What would a fast move's breakpoints look like across a league's meta if its power
+changed? `sweep_power` answers this for a range of hypothetical powers at once, without
+editing the gamemaster.
+
+Every meta entry that uses the move is paired with every meta species, and each pair's
+damage is computed for all the powers in one `calculate_damage_array` call (powers along
+one axis, the distinct stat values of the species along the other), reusing the cached
+IV tables. Like the atlas, breakpoints are the attacker's IVs against the defender's
+rank 1, and bulkpoints the defender's IVs against the attacker's rank 1.
+
+    python scripts/power_whatif.py "Counter" --powers 3 5 6 --league great
+"""
+
+import argparse
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+
+from pvp_damage.atlas import Kind, Threshold, distinct_stats, group_by_damage, varying
+from pvp_damage.damage import calculate_damage_array
+from pvp_damage.iv_table import ALL_IVS, get_iv_table
+from pvp_damage.models.leagues import LEAGUES
+from pvp_damage.models.moves import FastMove, get_fast_move
+
+type Pair = tuple[Kind, str, str]
+
+
+@dataclass(frozen=True)
+class Shift:
+    """How one matchup's breakpoints (or bulkpoints) change at a hypothetical power."""
+
+    kind: Kind
+    attacker: str
+    defender: str
+    before: list[Threshold]
+    after: list[Threshold]
+
+    @property
+    def status(self) -> Literal["gained", "lost", "moved"]:
+        """
+        Each row is one damage value, so a matchup with more rows has more breakpoints:
+        "gained" and "lost" are about how many there are, "moved" is the same number at
+        different stats.
+        """
+
+        if len(self.after) > len(self.before):
+            return "gained"
+        if len(self.after) < len(self.before):
+            return "lost"
+        return "moved"
+
+
+@dataclass(frozen=True)
+class PowerSweep:
+    """
+    `partitions[power][(kind, attacker, defender)]` has the damage partition of one
+    matchup (by species key) at one power; `powers` always includes the move's current
+    power, which the shifts are measured against.
+    """
+
+    move: FastMove
+    league: str
+    powers: list[int]
+    partitions: dict[int, dict[Pair, list[Threshold]]]
+
+    def shifts(self, power: int) -> list[Shift]:
+        """
+        The matchups whose partitions differ at `power` from the current power; a matchup
+        that does the same damage to every IV spread at both powers has no breakpoints to
+        shift, even if that damage changed.
+        """
+
+        current, changed = self.partitions[self.move.power], self.partitions[power]
+        return [
+            Shift(*pair, before=current[pair], after=changed[pair])
+            for pair in current
+            if (varying(current[pair]) or varying(changed[pair])) and _key(current[pair]) != _key(changed[pair])
+        ]
+
+
+def _key(rows: list[Threshold]) -> list[tuple[int, float, float, int]]:
+    return [(row.damage, row.stat_min, row.stat_max, row.count) for row in rows]
+
+
+def sweep_power(move: FastMove, powers: Iterable[int], league: str = "great") -> PowerSweep:
+    meta = LEAGUES[league]
+    all_powers = sorted({*powers, move.power})
+    power = np.array(all_powers, dtype=np.float64)[:, None]
+
+    attackers = {species.key: species for species, moveset in meta.meta if moveset.fast.move_id == move.move_id}
+    defenders = {species.key: species for species, _moveset in meta.meta}
+    if not attackers:
+        raise ValueError(f"Nothing in the {league} meta uses {move.name}")
+
+    partitions: dict[int, dict[Pair, list[Threshold]]] = {p: {} for p in all_powers}
+    for attacker in attackers.values():
+        attack_values, attack_counts, _, _ = distinct_stats(attacker, meta.max_cp)
+        attacker_rank1 = get_iv_table(attacker, meta.max_cp).rank1()
+        for defender in defenders.values():
+            _, _, defense_values, defense_counts = distinct_stats(defender, meta.max_cp)
+            defender_rank1 = get_iv_table(defender, meta.max_cp).rank1()
+            names = (league, attacker.key, move.move_id, defender.key)
+
+            # (powers, distinct stats)
+            dealt = calculate_damage_array(
+                move, attacker, attack_values[None, :], defender, defender_rank1.defense_stat, power=power
+            )
+            taken = calculate_damage_array(
+                move, attacker, attacker_rank1.attack_stat, defender, defense_values[None, :], power=power
+            )
+            for i, p in enumerate(all_powers):
+                partitions[p][("breakpoint", attacker.key, defender.key)] = [
+                    Threshold("breakpoint", *names, *group)
+                    for group in group_by_damage(attack_values, attack_counts, dealt[i])
+                ]
+                partitions[p][("bulkpoint", attacker.key, defender.key)] = [
+                    Threshold("bulkpoint", *names, *group)
+                    for group in group_by_damage(defense_values, defense_counts, taken[i])
+                ]
+
+    return PowerSweep(move=move, league=league, powers=all_powers, partitions=partitions)
+
+
+def format_power_sweep(sweep: PowerSweep) -> str:
+    lines: list[str] = []
+    for power in sweep.powers:
+        if power == sweep.move.power:
+            continue
+
+        shifts = sweep.shifts(power)
+        counts = {status: sum(shift.status == status for shift in shifts) for status in ("gained", "lost", "moved")}
+        lines.append(
+            f"{sweep.move.name} at {power} power (now {sweep.move.power}), {sweep.league}: "
+            f"{counts['gained']} matchups gain breakpoints, {counts['lost']} lose some, {counts['moved']} move"
+        )
+        for shift in shifts:
+            stat = "attack" if shift.kind == "breakpoint" else "defense"
+            lines.append(f"  {shift.kind} {shift.status}: {shift.attacker} vs. {shift.defender}")
+            for sign, rows in (("-", shift.before), ("+", shift.after)):
+                lines += [
+                    f"    {sign} {row.damage} damage: {row.stat_min:.2f} - {row.stat_max:.2f} {stat} "
+                    f"({row.count / len(ALL_IVS):.1%} of IVs)"
+                    for row in rows
+                ]
+
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("move", help="fast move name, e.g. Counter")
+    parser.add_argument(
+        "--powers", nargs="+", type=int, help="hypothetical powers (default: current power +/- 1 and 2)"
+    )
+    parser.add_argument("--league", choices=list(LEAGUES), default="great")
+    args = parser.parse_args(argv)
+
+    move = get_fast_move(args.move)
+    powers = args.powers or [move.power + delta for delta in (-2, -1, 1, 2) if move.power + delta >= 0]
+    print(format_power_sweep(sweep_power(move, powers, args.league)))
+    return 0
@@ -0,0 +1,41 @@
+"""
+Build the SQLite index of breakpoints and bulkpoints within each league's meta (see
+pvp_damage/index.py). Leagues already built for the current gamemaster are skipped.
+After `scripts/fetch_data.py`, pass the change set it wrote to only recompute the pairs
+that the refresh affected.
+
+    python scripts/build_index.py --db meta_index.sqlite
+    python scripts/build_index.py --db meta_index.sqlite --changes data/changes.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from pvp_damage.index import MetaIndex
+from pvp_damage.models.leagues import LEAGUES
+from pvp_damage.refresh import ChangeSet
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=Path("meta_index.sqlite"), help="index file")
+    parser.add_argument("--leagues", nargs="+", choices=list(LEAGUES), default=list(LEAGUES))
+    parser.add_argument("--force", action="store_true", help="rebuild leagues that are already built")
+    parser.add_argument("--changes", type=Path, help="change set from a data refresh, to update the index from")
+    args = parser.parse_args()
+
+    with MetaIndex(args.db) as index:
+        if args.changes is not None:
+            for league, (reused, computed) in index.update(ChangeSet.load(args.changes)).items():
+                print(f"{league}: updated ({reused} pairs reused, {computed} recomputed)")
+        built = index.build(args.leagues, force=args.force)
+
+    for league in args.leagues:
+        print(f"{league}: {built[league]} rows" if league in built else f"{league}: already built")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Load test for the query service (scripts/serve.py): send a mix of requests from many
+concurrent clients, and report latency percentiles and throughput per endpoint.
+
+    python scripts/serve.py &
+    python scripts/load_test.py --requests 500 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+# a mix of what the team tools ask for, weighted towards the cheap lookups
+REQUESTS = [
+    ("/rank", {"species": "Azumarill", "ivs": "0,15,15", "league": "great"}),
+    ("/rank", {"species": "Swampert", "ivs": "0,14,15", "league": "ultra"}),
+    ("/rank", {"species": "Medicham", "ivs": "15,15,15", "league": "great"}),
+    ("/breakpoints", {"attacker": "Annihilape", "defender": "Clodsire", "move": "Counter"}),
+    ("/breakpoints", {"attacker": "Altaria", "defender": "Lanturn", "move": "Dragon Breath", "buff": "1"}),
+    (
+        "/bulkpoints",
+        {
+            "attacker": "Serperior",
+            "attacker_ivs": "8,15,15",
+            "defender": "Swampert",
+            "move": "Vine Whip",
+            "league": "ultra",
+        },
+    ),
+    ("/meta-matrix", {"league": "great"}),
+]
+
+
+def percentile(latencies: list[float], p: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+async def run(base_url: str, total: int, concurrency: int) -> dict[str, list[float]]:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    queue: asyncio.Queue[tuple[str, dict[str, str]]] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(REQUESTS[i % len(REQUESTS)])
+
+    async def client() -> None:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+            while not queue.empty():
+                path, params = queue.get_nowait()
+                start = time.perf_counter()
+                response = await http.get(path, params=params)
+                latencies[path].append(time.perf_counter() - start)
+                response.raise_for_status()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8157")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    latencies = asyncio.run(run(args.url, args.requests, args.concurrency))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'endpoint':<16} {'requests':>8} {'p50':>10} {'p99':>10} {'mean':>10}")
+    everything = [latency for path in latencies for latency in latencies[path]]
+    for path, times in [*sorted(latencies.items()), ("all", everything)]:
+        print(
+            f"{path:<16} {len(times):>8} {percentile(times, 50) * 1000:>8.1f}ms "
+            f"{percentile(times, 99) * 1000:>8.1f}ms {statistics.mean(times) * 1000:>8.1f}ms"
+        )
+    print(f"\n{len(everything)} requests in {elapsed:.1f}s ({len(everything) / elapsed:.0f} requests/s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
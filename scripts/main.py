@@ -1,9 +1,11 @@
 from dataclasses import dataclass
 
 import pvp_damage.damage as dmg
+from pvp_damage.iv_table import ATTACK, compute_iv_table
 from pvp_damage.models import pokemon as pkm
 from pvp_damage.models.constants import BuffDebuff
 from pvp_damage.models.moves import get_move_by_name
+from pvp_damage.report import ConsoleReporter
 from pvp_damage.utils import (
     format_attack_range,
     format_defense_range,
@@ -31,6 +33,9 @@ class Battler:
         return name
 
 
+console = ConsoleReporter()
+
+
 def compute_vs_defender(attacker: Battler, defender: Battler, move_name: str):
     attacker_species = pkm.get_species(attacker.name, as_shadow=attacker.shadow)
     defender_species = pkm.get_species(defender.name, as_shadow=defender.shadow)
@@ -46,15 +51,19 @@ def compute_vs_defender(attacker: Battler, defender: Battler, move_name: str):
     move = get_move_by_name(move_name)
 
     print(f"vs. min defense ({defender_mindef.defense_stat:.2f})")
-    dmg.compute_breakpoints(attacker_species, defender_mindef, move, 1500, attacker_buff=attacker.buff)
+    dmg.compute_breakpoints(
+        attacker_species, defender_mindef, move, 1500, attacker_buff=attacker.buff, reporter=console
+    )
 
     print()
     print(f"vs. rank 1 ({defender_rank1.defense_stat:.2f})")
-    dmg.compute_breakpoints(attacker_species, defender_rank1, move, 1500, attacker_buff=attacker.buff)
+    dmg.compute_breakpoints(attacker_species, defender_rank1, move, 1500, attacker_buff=attacker.buff, reporter=console)
 
     print()
     print(f"vs. max defense ({defender_maxdef.defense_stat:.2f})")
-    dmg.compute_breakpoints(attacker_species, defender_maxdef, move, 1500, attacker_buff=attacker.buff)
+    dmg.compute_breakpoints(
+        attacker_species, defender_maxdef, move, 1500, attacker_buff=attacker.buff, reporter=console
+    )
 
 
 ariados = Battler("Ariados")
@@ -105,23 +114,22 @@ def pex_vs_ariados():
     # Of the Ariados that have >= 127.8 attack, how much defense do
     # we need to get the bulkpoint against these Toxapex?
     ariados = pkm.get_species("Ariados")
-    ariados_ivs = dmg.compute_iv_possibilities(ariados, 1500)
-    viable_ariados = {ivs: mon for ivs, mon in ariados_ivs.items() if mon.attack_stat >= 127.18}
+    viable_ariados = compute_iv_table(ariados, 1500).filter(ATTACK >= 127.18)
 
     print("Rank 1 Toxapex vs. high-ish attack Ariados")
-    dmg.compute_bulkpoints(rank1, viable_ariados.values(), poison_jab, 1500)
+    dmg.compute_bulkpoints(rank1, viable_ariados, poison_jab, 1500, reporter=console)
 
     print()
     print("1/13/8 Toxapex vs. high-ish attack Ariados")
-    dmg.compute_bulkpoints(pex_ivs[(1, 13, 8)], viable_ariados.values(), poison_jab, 1500)
+    dmg.compute_bulkpoints(pex_ivs[(1, 13, 8)], viable_ariados, poison_jab, 1500, reporter=console)
 
     print()
     print("3/12/15 Toxapex vs. high-ish attack Ariados")
-    dmg.compute_bulkpoints(pex_ivs[(3, 12, 15)], viable_ariados.values(), poison_jab, 1500)
+    dmg.compute_bulkpoints(pex_ivs[(3, 12, 15)], viable_ariados, poison_jab, 1500, reporter=console)
 
     print()
     print("Default IV Toxapex vs. high-ish attack Ariados")
-    dmg.compute_bulkpoints(default, viable_ariados.values(), poison_jab, 1500)
+    dmg.compute_bulkpoints(default, viable_ariados, poison_jab, 1500, reporter=console)
 
 
 # pex_vs_ariados()
@@ -140,15 +148,14 @@ def squag_vs_ariados():
     # Of the Ariados that have >= 127.18 attack, how much defense do
     # we need to get the bulkpoint against these Quag?
     ariados = pkm.get_species("Ariados")
-    ariados_ivs = dmg.compute_iv_possibilities(ariados, 1500)
-    viable_ariados = {ivs: mon for ivs, mon in ariados_ivs.items() if mon.attack_stat >= 127.18}
+    viable_ariados = compute_iv_table(ariados, 1500).filter(ATTACK >= 127.18)
 
     print("Rank 1 S-Quag vs. high-ish attack Ariados")
-    dmg.compute_bulkpoints(rank1, viable_ariados.values(), mudshot, 1500)
+    dmg.compute_bulkpoints(rank1, viable_ariados, mudshot, 1500, reporter=console)
 
     print()
     print("Default IV S-Quag vs. high-ish attack Ariados")
-    dmg.compute_bulkpoints(default, viable_ariados.values(), mudshot, 1500)
+    dmg.compute_bulkpoints(default, viable_ariados, mudshot, 1500, reporter=console)
 
 
 squag_vs_ariados()
@@ -161,7 +168,7 @@ def compute_ape_mirror():
 
     # first, find the apes that hit the clodsire breakpoint
     clod_ivs = dmg.compute_iv_possibilities(clodsire, 1500).values()
-    clod_ranges = dmg.compute_breakpoints(ape, highest_defense(clod_ivs), counter, 1500)
+    clod_ranges = dmg.compute_breakpoints(ape, highest_defense(clod_ivs), counter, 1500, reporter=console)
     clod_killers = sort_defense(clod_ranges.ranges_all[5])
 
     print()
@@ -172,11 +179,11 @@ def compute_ape_mirror():
     # then, consider how much damage our ape can do to each of these apes
     # (that is, assuming our opponent is using a Clod-slayer)
     print("Against the defense Clodsire-killer, we can ...")
-    dmg.compute_breakpoints(ape, lowest_defense(clod_killers), counter, 1500)
+    dmg.compute_breakpoints(ape, lowest_defense(clod_killers), counter, 1500, reporter=console)
 
     print()
     print("Against the highest defense Clodsire-killer, we can ...")
-    dmg.compute_breakpoints(ape, highest_defense(clod_killers), counter, 1500)
+    dmg.compute_breakpoints(ape, highest_defense(clod_killers), counter, 1500, reporter=console)
 
 
 # compute_ape_mirror()
@@ -191,7 +198,7 @@ def compute_ape_serperior_bulkpoints():
 
     # first, get the clod-slayer apes
     clod_ivs = dmg.compute_iv_possibilities(clod, 1500).values()
-    clod_ranges = dmg.compute_breakpoints(ape, highest_defense(clod_ivs), counter, 1500)
+    clod_ranges = dmg.compute_breakpoints(ape, highest_defense(clod_ivs), counter, 1500, reporter=console)
     clod_killers = sort_defense(clod_ranges.ranges_all[5])
 
     print()
@@ -205,11 +212,11 @@ def compute_ape_serperior_bulkpoints():
 
     # what defense would we need to get the bulkpoint against the rank1 serp?
     # can any of the clod-slayers do it? no.
-    dmg.compute_bulkpoints(rank1_serp, clod_killers, vine_whip, 1500)
+    dmg.compute_bulkpoints(rank1_serp, clod_killers, vine_whip, 1500, reporter=console)
 
     # what about the bulkpoint in general? vs. rank 1 and slgiht attack weight
-    dmg.compute_bulkpoints(rank1_serp, ape, vine_whip, 1500)
-    dmg.compute_bulkpoints(slight_attack_serp, ape, vine_whip, 1500)
+    dmg.compute_bulkpoints(rank1_serp, ape, vine_whip, 1500, reporter=console)
+    dmg.compute_bulkpoints(slight_attack_serp, ape, vine_whip, 1500, reporter=console)
 
 
 # compute_ape_serperior_bulkpoints()
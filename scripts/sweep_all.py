@@ -0,0 +1,54 @@
+"""
+Sweep every species' moves against the meta of each league, checkpointing as it goes.
+Rerun the same command to resume after a crash or Ctrl-C (which stops after the current
+species, so nothing is lost).
+
+    python scripts/sweep_all.py --store sweeps.sqlite --leagues great ultra
+
+After `scripts/fetch_data.py`, pass `--changes data/changes.json` to keep the units that
+the refresh didn't affect instead of rerunning everything.
+"""
+
+import argparse
+import signal
+import sys
+import threading
+from pathlib import Path
+
+from pvp_damage.checkpoint import CheckpointStore, Progress, run_units, sweep_units
+from pvp_damage.models.leagues import LEAGUES
+from pvp_damage.models.pokemon import POKEMON, get_species
+from pvp_damage.refresh import ChangeSet
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", type=Path, default=Path("sweeps.sqlite"), help="checkpoint file")
+    parser.add_argument("--leagues", nargs="+", choices=list(LEAGUES), default=list(LEAGUES))
+    parser.add_argument("--species", nargs="+", help="species names (default: every species)")
+    parser.add_argument("--include-charged", action="store_true", help="sweep charged moves too")
+    parser.add_argument("--changes", type=Path, help="change set from a data refresh, to keep unaffected units")
+    args = parser.parse_args()
+
+    species = [get_species(name) for name in args.species] if args.species else POKEMON
+    units = sweep_units(species, args.leagues, include_charged=args.include_charged)
+
+    cancel = threading.Event()
+    signal.signal(signal.SIGINT, lambda _signum, _frame: cancel.set())
+
+    def report(progress: Progress) -> None:
+        print(f"\r{progress}", end="", file=sys.stderr, flush=True)
+
+    with CheckpointStore(args.store) as store:
+        if args.changes is not None:
+            changes = ChangeSet.load(args.changes)
+            kept, dropped = store.carry_over(changes.old_hash, changes.keeps_sweep)
+            print(f"Kept {kept} units from before the refresh, {dropped} to rerun", file=sys.stderr)
+        progress = run_units(units, store, on_progress=report, cancel=cancel)
+
+    print(f"\r{progress}", file=sys.stderr)
+    return 130 if progress.cancelled else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from pvp_damage.atlas import COLUMNS, build_atlas, compute_league_atlas
+from pvp_damage.damage import compute_breakpoints, compute_bulkpoints
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_fast_move
+from pvp_damage.models.pokemon import get_species, get_species_by_id
+
+
+def test_atlas_matches_compute_breakpoints():
+    rows = compute_league_atlas("great")
+    ape = get_species("Annihilape")
+    clodsire = get_species_by_id("clodsire")
+    counter = get_fast_move("Counter")
+    assert (ape, counter) in {(species, moveset.fast) for species, moveset in GREAT_LEAGUE.meta}
+
+    def select(kind: str) -> dict[int, tuple[float, float, int]]:
+        return {
+            row.damage: (row.stat_min, row.stat_max, row.count)
+            for row in rows
+            if (row.kind, row.attacker, row.move, row.defender) == (kind, ape.key, counter.move_id, clodsire.key)
+        }
+
+    expected = compute_breakpoints(ape, compute_iv_table(clodsire, 1500).rank1(), counter, 1500)
+    assert select("breakpoint") == {
+        damage: (low.attack_stat, high.attack_stat, len(expected.ranges_all[damage]))
+        for damage, (low, high) in expected.ranges.items()
+    }
+
+    expected = compute_bulkpoints(compute_iv_table(ape, 1500).rank1(), clodsire, counter, 1500)
+    assert select("bulkpoint") == {
+        damage: (low.defense_stat, high.defense_stat, len(expected.ranges_all[damage]))
+        for damage, (low, high) in expected.ranges.items()
+    }
+
+
+def test_atlas_only_has_varying_pairs(tmp_path: Path):
+    path = tmp_path / "atlas.tsv"
+    counts = build_atlas(path, ["great", "ultra"], jobs=1)
+
+    header, *lines = path.read_text().splitlines()
+    assert header.split("\t") == list(COLUMNS)
+    assert len(lines) == sum(counts.values())
+
+    # every pair in the atlas has more than one damage value, and the shares add up to 1
+    pairs: dict[tuple[str, ...], list[float]] = {}
+    for line in lines:
+        league, kind, attacker, move, defender, _damage, _low, _high, _count, share = line.split("\t")
+        pairs.setdefault((league, kind, attacker, move, defender), []).append(float(share))
+
+    assert {league for league, *_ in pairs} == {"great", "ultra"}
+    for shares in pairs.values():
+        assert len(shares) > 1
+        assert abs(sum(shares) - 1) < 1e-3
@@ -0,0 +1,185 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from pvp_damage.batch import Analysis, IVFilter, load_spec, run_analysis, run_batch
+from pvp_damage.damage import compute_breakpoints, compute_bulkpoints, compute_iv_possibilities
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.moves import get_move_by_name
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.report import ConsoleReporter, JsonLinesReporter
+
+SPEC = """
+[defaults]
+league = "great"
+attacker = "Annihilape"
+move = "Counter"
+
+[[analyses]]
+name = "vs-clodsire"
+kind = "breakpoints"
+defender = "Clodsire"
+defender_ivs = ["rank1", [0, 15, 15]]
+
+[[analyses]]
+name = "vs-clodsire-high-attack"
+kind = "breakpoints"
+defender = "Clodsire"
+iv_filter = { attack = [12, 15] }
+
+[[analyses]]
+name = "serperior-vs-swampert"
+kind = "bulkpoints"
+attacker = "Serperior"
+attacker_ivs = [8, 15, 15]
+attacker_level = 51
+defender = "Swampert"
+move = "Vine Whip"
+league = "ultra"
+"""
+
+
+def test_load_spec(tmp_path: Path):
+    path = tmp_path / "spec.toml"
+    path.write_text(SPEC)
+
+    analyses = load_spec(path)
+    assert [analysis.name for analysis in analyses] == [
+        "vs-clodsire",
+        "vs-clodsire-high-attack",
+        "serperior-vs-swampert",
+    ]
+    assert analyses[0].attacker == "Annihilape"
+    assert analyses[0].defender_ivs == ["rank1", (0, 15, 15)]
+    assert analyses[2].cp_limit == 2500
+
+    # the two breakpoint analyses check the same attacker IV table
+    assert analyses[0].table_key == analyses[1].table_key != analyses[2].table_key
+
+
+def test_load_spec_json_matches_toml(tmp_path: Path):
+    (tmp_path / "spec.toml").write_text(SPEC)
+    toml_analyses = load_spec(tmp_path / "spec.toml")
+
+    entry = {
+        "name": "vs-clodsire",
+        "kind": "breakpoints",
+        "defender": "Clodsire",
+        "defender_ivs": ["rank1", [0, 15, 15]],
+    }
+    data = {"defaults": {"attacker": "Annihilape", "move": "Counter"}, "analyses": [entry]}
+    (tmp_path / "spec.json").write_text(json.dumps(data))
+
+    assert load_spec(tmp_path / "spec.json") == toml_analyses[:1]
+
+
+def test_load_spec_rejects_duplicate_names(tmp_path: Path):
+    path = tmp_path / "spec.json"
+    entry = {"name": "same", "kind": "breakpoints", "attacker": "Annihilape", "defender": "Clodsire", "move": "Counter"}
+    path.write_text(json.dumps({"analyses": [entry, entry]}))
+
+    with pytest.raises(ValueError, match="unique"):
+        load_spec(path)
+
+
+def test_iv_filter():
+    iv_filter = IVFilter(attack=(0, 1), stamina=(10, 15))
+
+    assert iv_filter.matches((0, 15, 15))
+    assert not iv_filter.matches((2, 15, 15))
+    assert not iv_filter.matches((0, 15, 9))
+
+
+def test_run_batch(tmp_path: Path):
+    (tmp_path / "spec.toml").write_text(SPEC)
+    analyses = load_spec(tmp_path / "spec.toml")
+
+    summary = run_batch(analyses, tmp_path / "out", jobs=1)
+    assert summary["iv_tables"] == 2
+    assert [entry["file"] for entry in summary["analyses"]] == [
+        "vs-clodsire.jsonl",
+        "vs-clodsire-high-attack.jsonl",
+        "serperior-vs-swampert.jsonl",
+    ]
+
+    # one record per defender, the same as running compute_breakpoints directly
+    records = [json.loads(line) for line in (tmp_path / "out" / "vs-clodsire.jsonl").read_text().splitlines()]
+    assert [record["defender"]["ivs"] for record in records] == [[0, 14, 13], [0, 15, 15]]
+
+    clodsire = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+    expected = compute_breakpoints(get_species("Annihilape"), clodsire, get_move_by_name("Counter"), 1500)
+    assert records[0]["min_damage"] == expected.min_damage
+    assert [r["count"] for r in records[0]["ranges"]] == [len(expected.ranges_all[d]) for d in sorted(expected.ranges)]
+
+    # the filter narrows down the attackers that are checked
+    filtered = json.loads((tmp_path / "out" / "vs-clodsire-high-attack.jsonl").read_text())
+    assert sum(r["count"] for r in filtered["ranges"]) == 4 * 16 * 16
+
+    assert json.loads((tmp_path / "out" / "summary.json").read_text()) == summary
+
+
+def test_breakpoints_with_given_attackers():
+    ape = get_species("Annihilape")
+    clodsire = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+    counter = get_move_by_name("Counter")
+
+    all_attackers = compute_breakpoints(ape, clodsire, counter, 1500)
+    attackers = [mon for mon in compute_iv_possibilities(ape, 1500).values() if mon.attack_iv == 15]
+    some_attackers = compute_breakpoints(ape, clodsire, counter, 1500, attackers=attackers)
+
+    assert some_attackers.max_damage == all_attackers.max_damage
+    assert set().union(*some_attackers.ranges_all.values()) == set(attackers)
+
+
+def test_bulkpoints_with_sparse_filter():
+    # with only 16 defenders, some damage values between the min and max have none of them
+    analysis = Analysis(
+        name="abomasnow-vs-gastrodon",
+        kind="bulkpoints",
+        attacker="Abomasnow",
+        defender="Gastrodon",
+        move="Energy Ball",
+        iv_filter=IVFilter(attack=(15, 15), stamina=(15, 15)),
+    )
+    out = io.StringIO()
+    run_analysis(analysis, JsonLinesReporter(out))
+    record = json.loads(out.getvalue())
+    assert sum(r["count"] for r in record["ranges"]) == 16
+    assert len(record["ranges"]) < record["max_damage"] - record["min_damage"] + 1
+
+    text = io.StringIO()
+    run_analysis(analysis, ConsoleReporter(text))
+    assert len(text.getvalue().splitlines()) == 2 + len(record["ranges"])
+
+
+def test_bulkpoints_without_defenders():
+    attacker = compute_iv_table(get_species("Medicham"), 1500).rank1()
+    with pytest.raises(ValueError, match="no defenders"):
+        compute_bulkpoints(attacker, [], get_move_by_name("Counter"), 1500)
+
+
+def test_breakpoints_with_one_candidate():
+    analysis = Analysis(
+        name="hundo-ape-vs-clodsire",
+        kind="breakpoints",
+        attacker="Annihilape",
+        defender="Clodsire",
+        move="Counter",
+        iv_filter=IVFilter(attack=(15, 15), defense=(15, 15), stamina=(15, 15)),
+    )
+    out = io.StringIO()
+    run_analysis(analysis, JsonLinesReporter(out))
+    record = json.loads(out.getvalue())
+    assert record["min_damage"] == record["max_damage"]
+    assert [r["count"] for r in record["ranges"]] == [1]
+
+    with pytest.raises(ValueError, match="no attackers"):
+        compute_breakpoints(
+            get_species("Annihilape"),
+            compute_iv_table(get_species("Clodsire"), 1500).rank1(),
+            get_move_by_name("Counter"),
+            1500,
+            attackers=[],
+        )
@@ -0,0 +1,63 @@
+from collections.abc import Callable
+
+import pytest
+
+from pvp_damage.bounds import (
+    MetaSweep,
+    breakpoint_bounds,
+    bulkpoint_bounds,
+    compute_stat_bounds,
+    sweep_meta_breakpoints,
+    sweep_meta_bulkpoints,
+)
+from pvp_damage.damage import compute_breakpoints, compute_bulkpoints
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_fast_move
+from pvp_damage.models.pokemon import get_species
+
+
+@pytest.mark.parametrize("name", ["Annihilape", "Clodsire", "Azumarill", "Registeel"])
+@pytest.mark.parametrize("cp_limit", [1500, 2500])
+def test_stat_bounds_are_exact(name: str, cp_limit: int):
+    species = get_species(name)
+    table = compute_iv_table(species, cp_limit)
+    bounds = compute_stat_bounds(species, cp_limit)
+
+    assert bounds.min_attack.attack_stat == table.attack_stat.min()
+    assert bounds.max_attack.attack_stat == table.attack_stat.max()
+    assert bounds.min_defense.defense_stat == table.defense_stat.min()
+    assert bounds.max_defense.defense_stat == table.defense_stat.max()
+
+
+def test_damage_bounds_match_full_computation():
+    ape = get_species("Annihilape")
+    clodsire = get_species("Clodsire")
+    counter = get_fast_move("Counter")
+
+    defender = compute_iv_table(clodsire, 1500).rank1()
+    expected = compute_breakpoints(ape, defender, counter, 1500)
+    assert breakpoint_bounds(ape, defender, counter, 1500) == (expected.min_damage, expected.max_damage)
+
+    attacker = compute_iv_table(ape, 1500).rank1()
+    expected = compute_bulkpoints(attacker, clodsire, counter, 1500)
+    assert bulkpoint_bounds(attacker, clodsire, counter, 1500) == (expected.min_damage, expected.max_damage)
+
+
+@pytest.mark.parametrize("sweep", [sweep_meta_breakpoints, sweep_meta_bulkpoints])
+def test_pruned_sweep_keeps_every_matchup_with_breakpoints(sweep: Callable[..., MetaSweep]):
+    # a slice of the meta, to keep the unpruned sweep quick
+    league = GREAT_LEAGUE.model_copy(update={"meta": GREAT_LEAGUE.meta[:6]})
+    pruned = sweep(league)
+    full = sweep(league, prune=False)
+
+    assert full.pruned == 0
+    assert pruned.pruned > 0
+    assert pruned.checked == full.checked == len(full.results)
+
+    # everything pruned had a single damage value, and nothing else was dropped
+    varying = {key for key, result in full.results.items() if result.min_damage != result.max_damage}
+    assert varying <= set(pruned.results)
+    assert len(full.results) - len(pruned.results) == pruned.pruned
+    for key, result in pruned.results.items():
+        assert result == full.results[key]
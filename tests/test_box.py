@@ -0,0 +1,77 @@
+import csv
+import io
+
+import pytest
+
+from pvp_damage.box import COLUMNS, evaluate_box
+from pvp_damage.damage import calculate_damage, find_max_level_for_league
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_fast_move
+from pvp_damage.models.pokemon import Pokemon, get_species_by_id
+from pvp_damage.sweep import rank1_defenders
+
+BOX = """species,shadow,attack,defense,stamina,level,fast_move
+medicham,,15,15,15,51,
+azumarill,false,0,15,15,40,Bubble
+medicham,true,4,14,13,30.5,Counter
+Azumarill,,3,12,14,38,
+missingno,,1,1,1,20,
+azumarill,,16,0,0,20,
+registeel,,0,15,15,23.5,Lock On
+"""
+
+
+def evaluate(chunk_size: int, leagues: list[str]) -> list[dict[str, str]]:
+    output = io.StringIO()
+    summary = evaluate_box(io.StringIO(BOX), output, leagues, chunk_size=chunk_size)
+    assert (summary.rows, summary.skipped) == (7, 2)
+
+    output.seek(0)
+    reader = csv.DictReader(output)
+    assert tuple(reader.fieldnames or ()) == COLUMNS
+    return sorted(reader, key=lambda record: (record["row"], record["league"], record["move"]))
+
+
+def test_chunks_dont_change_results():
+    assert evaluate(2, ["great", "master"]) == evaluate(100, ["great", "master"])
+
+
+def test_box_scores_match_scalar_damage():
+    records = evaluate(3, ["great"])
+
+    # the level 51 hundo Medicham is over 1500 CP, so only the others are scored
+    assert {record["row"] for record in records} == {"1", "2", "3", "6"}
+    assert {record["move"] for record in records if record["row"] == "2"} == {"COUNTER"}
+    azumarill = get_species_by_id("azumarill")
+    assert {record["move"] for record in records if record["row"] == "3"} == {
+        move.move_id for move in azumarill.fast_moves
+    }
+
+    record = next(record for record in records if record["row"] == "1")
+    mon = Pokemon(species=azumarill, level=40, ivs=(0, 15, 15))
+    bubble = get_fast_move("Bubble")
+    assert int(record["cp"]) == mon.cp
+
+    strongest_attack = max(
+        (find_max_level_for_league(azumarill, (a, 0, 0), 1500) for a in range(16)), key=lambda m: m.attack_stat
+    )
+    weakest_attack = min(
+        (find_max_level_for_league(azumarill, (a, 15, 15), 1500) for a in range(16)), key=lambda m: m.attack_stat
+    )
+
+    defenders = rank1_defenders(GREAT_LEAGUE)
+    expected = sum(
+        calculate_damage(bubble, mon, defender) - calculate_damage(bubble, weakest_attack, defender)
+        for defender in defenders
+    )
+    most = sum(
+        calculate_damage(bubble, strongest_attack, defender) - calculate_damage(bubble, weakest_attack, defender)
+        for defender in defenders
+    )
+    assert int(record["breakpoints"]) == expected
+    assert int(record["max_breakpoints"]) == most
+
+
+def test_unknown_league():
+    with pytest.raises(ValueError, match="Unknown leagues"):
+        evaluate_box(io.StringIO(BOX), io.StringIO(), ["little"])
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pvp_damage.checkpoint import CheckpointStore, Progress, WorkUnit, load_sweep, run_units, sweep_unit, sweep_units
+from pvp_damage.models.leagues import DATA_DIR, GREAT_LEAGUE
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.sweep import sweep_moves
+
+
+def counting_units(ran: list[str], n: int, **params: object) -> list[WorkUnit]:
+    def unit(key: str) -> WorkUnit:
+        def run() -> bytes:
+            ran.append(key)
+            return key.encode()
+
+        return WorkUnit(key=key, params={"key": key, **params}, run=run)
+
+    return [unit(f"unit-{i}") for i in range(n)]
+
+
+def test_resume_skips_finished_units(tmp_path: Path):
+    ran: list[str] = []
+    cancel = threading.Event()
+
+    def stop_after_three(progress: Progress) -> None:
+        if progress.done == 3:
+            cancel.set()
+
+    with CheckpointStore(tmp_path / "store.sqlite") as store:
+        progress = run_units(counting_units(ran, 5), store, on_progress=stop_after_three, cancel=cancel)
+    assert progress.cancelled
+    assert ran == ["unit-0", "unit-1", "unit-2"]
+
+    # a new process picks up where the last one stopped
+    with CheckpointStore(tmp_path / "store.sqlite") as store:
+        progress = run_units(counting_units(ran, 5), store)
+        assert store.load("unit-4") == ({"key": "unit-4"}, b"unit-4")
+
+    assert ran == ["unit-0", "unit-1", "unit-2", "unit-3", "unit-4"]
+    assert (progress.done, progress.skipped, progress.cancelled) == (5, 3, False)
+
+
+def test_rerun_on_new_params_or_gamemaster(tmp_path: Path):
+    ran: list[str] = []
+    with CheckpointStore(tmp_path / "store.sqlite") as store:
+        run_units(counting_units(ran, 2), store)
+        run_units(counting_units(ran, 2, include_charged=True), store)
+    assert len(ran) == 4
+
+    with CheckpointStore(tmp_path / "store.sqlite", gamemaster_hash="something else") as store:
+        assert store.completed() == {}
+        run_units(counting_units(ran, 2), store)
+    assert len(ran) == 6
+
+
+def test_progress_eta():
+    progress = Progress(total=10, done=6, skipped=2, elapsed=8)
+
+    # 4 units took 8s, so the remaining 4 should too
+    assert progress.eta == 8
+    assert str(progress) == "6/10 units (2 from checkpoint), 0m08s elapsed, ETA 0m08s"
+    assert Progress(total=10, done=2, skipped=2, elapsed=0).eta is None
+
+
+def test_sweep_round_trip(tmp_path: Path):
+    altaria = get_species("Altaria", as_shadow=True)
+    with CheckpointStore(tmp_path / "store.sqlite") as store:
+        run_units([sweep_unit(altaria, "great", include_charged=True)], store)
+        loaded = load_sweep(store, "altaria_shadow:great")
+
+    expected = sweep_moves(altaria, GREAT_LEAGUE, include_charged=True)
+    assert loaded.moves == expected.moves
+    assert loaded.defenders == expected.defenders
+    assert np.array_equal(loaded.damage, expected.damage)
+    assert loaded.attackers.species == altaria
+
+
+def test_sweep_units():
+    units = sweep_units([get_species("Altaria"), get_species("Azumarill")], ["great", "ultra"])
+    assert [unit.key for unit in units] == ["altaria:great", "altaria:ultra", "azumarill:great", "azumarill:ultra"]
+
+    # a change to the league file (e.g., its meta) changes the parameters, so the unit runs again
+    great_hash = hashlib.sha256((DATA_DIR / "great.json").read_bytes()).hexdigest()
+    assert units[0].params["league_hash"] == units[2].params["league_hash"] == great_hash
+    assert units[1].params["league_hash"] != great_hash
+
+    with pytest.raises(ValueError, match="Unknown leagues"):
+        sweep_units([get_species("Altaria")], ["little"])
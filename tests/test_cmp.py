@@ -0,0 +1,35 @@
+import numpy as np
+
+from pvp_damage.cmp import compute_cmp_matrix
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.pokemon import get_species
+
+
+def test_cmp_matrix():
+    species = get_species("Medicham")
+    cmp = compute_cmp_matrix(species, GREAT_LEAGUE)
+
+    assert cmp.wins.shape == cmp.ties.shape == (16**3, len(GREAT_LEAGUE.meta))
+    assert np.all(cmp.wins >= 0)
+    assert np.allclose(cmp.wins + cmp.ties + cmp.losses, 1)
+
+    # check a few entries against a brute force comparison
+    for j in (0, len(GREAT_LEAGUE.meta) // 2, len(GREAT_LEAGUE.meta) - 1):
+        opponent, _moveset = GREAT_LEAGUE.meta[j]
+        opponents = compute_iv_table(opponent, GREAT_LEAGUE.max_cp).attack_stat
+
+        for i in (0, 1234, 4095):
+            ours = cmp.attackers.attack_stat[i]
+            assert cmp.wins[i, j] == np.mean(ours > opponents)
+            assert cmp.ties[i, j] == np.mean(ours == opponents)
+
+
+def test_cmp_mirror_ties():
+    table = compute_iv_table(get_species("Azumarill"), GREAT_LEAGUE.max_cp)
+    hundo = table.take(np.array([table.index_of((15, 15, 15))]))
+
+    # in the mirror, a Pokemon always ties with (at least) itself
+    league = GREAT_LEAGUE.model_copy(update={"meta": [m for m in GREAT_LEAGUE.meta if m[0].name == "Azumarill"]})
+    cmp = compute_cmp_matrix(hundo, league)
+    assert np.all(cmp.ties > 0)
@@ -0,0 +1,69 @@
+from math import ceil
+
+import numpy as np
+import pytest
+
+from pvp_damage.damage import calculate_damage, find_max_level_for_league
+from pvp_damage.duel import Side, simulate_duel
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.moves import get_charged_move, get_fast_move
+from pvp_damage.models.pokemon import get_species
+
+
+def test_fast_moves_only():
+    counter, mud_shot = get_fast_move("Counter"), get_fast_move("Mud Shot")
+    medicham = find_max_level_for_league(get_species("Medicham"), (0, 15, 15), 1500)
+    swampert = find_max_level_for_league(get_species("Swampert"), (0, 15, 15), 1500)
+
+    result = simulate_duel(Side(medicham, counter), Side(swampert, mud_shot))
+    assert len(result) == 1
+
+    # each side faints when the other's fast moves add up to its HP
+    faint_medicham = ceil(medicham.stamina_stat / calculate_damage(mud_shot, swampert, medicham)) * mud_shot.turns
+    faint_swampert = ceil(swampert.stamina_stat / calculate_damage(counter, medicham, swampert)) * counter.turns
+    assert result.turns[0] == min(faint_medicham, faint_swampert)
+    assert result.outcome[0] == np.sign(faint_medicham - faint_swampert)
+
+
+def test_table_matches_single_pokemon():
+    counter, ice_punch = get_fast_move("Counter"), get_charged_move("Ice Punch")
+    table = compute_iv_table(get_species("Medicham"), 1500)
+    opponent = Side(
+        compute_iv_table(get_species("Mandibuzz"), 1500).rank1(),
+        get_fast_move("Snarl"),
+        get_charged_move("Dark Pulse"),
+        shields=1,
+    )
+
+    result = simulate_duel(Side(table, counter, ice_punch, shields=1), opponent)
+    assert len(result) == len(table)
+    assert 0 < result.win_rate < 1
+    assert sum(result.hp_distribution(0).values()) == len(table)
+
+    for i in range(0, len(table), 331):
+        single = simulate_duel(Side(table.pokemon(i), counter, ice_punch, shields=1), opponent)
+        assert single.outcome[0] == result.outcome[i]
+        assert (single.hp[0][0], single.hp[1][0], single.turns[0]) == (
+            result.hp[0][i],
+            result.hp[1][i],
+            result.turns[i],
+        )
+
+    # and from the other side
+    reverse = simulate_duel(opponent, Side(table, counter, ice_punch, shields=1))
+    assert (reverse.outcome == -result.outcome).all()
+    assert (reverse.hp[0] == result.hp[1]).all()
+
+
+def test_mirror_match_ties():
+    mon = find_max_level_for_league(get_species("Azumarill"), (0, 15, 15), 1500)
+    side = Side(mon, get_fast_move("Bubble"), get_charged_move("Ice Beam"), shields=2)
+    result = simulate_duel(side, side)
+    assert result.outcome[0] == 0
+    assert result.hp[0][0] == result.hp[1][0] == 0
+
+
+def test_shields_are_checked():
+    mon = find_max_level_for_league(get_species("Azumarill"), (0, 15, 15), 1500)
+    with pytest.raises(ValueError, match="Shields"):
+        simulate_duel(Side(mon, get_fast_move("Bubble"), shields=3), Side(mon, get_fast_move("Bubble")))
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import shutil
+import threading
+from collections.abc import Iterator
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from pvp_damage.fetch import refresh
+from pvp_damage.models.constants import GAMEMASTER
+from pvp_damage.models.leagues import DATA_DIR
+
+
+class StandIn:
+    """
+    A local stand-in for PVPoke's GitHub: serves `files` (by path, e.g. "groups/great.json")
+    with ETags, answers matching conditional requests with 304s, and records every request.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.requests: list[tuple[str, int]] = []
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                path = self.path.removeprefix("/")
+                if path not in stand_in.files:
+                    self.send_response(404)
+                    self.end_headers()
+                    stand_in.requests.append((path, 404))
+                    return
+
+                content = stand_in.files[path]
+                etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    stand_in.requests.append((path, 304))
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", formatdate(usegmt=True))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+                stand_in.requests.append((path, 200))
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def statuses(self) -> dict[str, int]:
+        """The status of the latest request for each path."""
+
+        return dict(self.requests)
+
+
+@pytest.fixture()
+def stand_in() -> Iterator[StandIn]:
+    stand_in = StandIn()
+    base = {key: value for key, value in GAMEMASTER.items() if key not in {"pokemon", "moves"}}
+    stand_in.files = {
+        "gamemaster/base.json": json.dumps(base).encode(),
+        "gamemaster/pokemon.json": json.dumps(GAMEMASTER["pokemon"]).encode(),
+        "gamemaster/moves.json": json.dumps(GAMEMASTER["moves"]).encode(),
+        **{f"groups/{name}.json": (DATA_DIR / f"{name}.json").read_bytes() for name in ("great", "ultra", "master")},
+    }
+
+    thread = threading.Thread(target=stand_in.server.serve_forever, daemon=True)
+    thread.start()
+    yield stand_in
+    stand_in.server.shutdown()
+    stand_in.server.server_close()
+
+
+@pytest.fixture()
+def data_dir(tmp_path: Path) -> Path:
+    for name in ("gamemaster", "great", "ultra", "master"):
+        shutil.copy(DATA_DIR / f"{name}.json", tmp_path / f"{name}.json")
+    return tmp_path
+
+
+def test_fetch_unchanged_writes_nothing(stand_in: StandIn, data_dir: Path):
+    before = {path: path.read_bytes() for path in data_dir.iterdir()}
+
+    # the first fetch downloads everything, but the contents match what's on disk
+    result = refresh(data_dir, stand_in.url)
+    assert result.written == []
+    assert result.changes.is_empty
+    assert set(stand_in.statuses().values()) == {200}
+    assert {path: path.read_bytes() for path in before} == before
+
+    # the second one sends the saved ETags back, and nothing is downloaded
+    result = refresh(data_dir, stand_in.url)
+    assert len(result.not_modified) == len(stand_in.files)
+    assert set(stand_in.statuses().values()) == {304}
+
+
+def test_fetch_detects_changes(stand_in: StandIn, data_dir: Path):
+    refresh(data_dir, stand_in.url)
+
+    moves = json.loads(stand_in.files["gamemaster/moves.json"])
+    for move in moves:
+        if move["moveId"] == "COUNTER":
+            move["power"] += 1
+    stand_in.files["gamemaster/moves.json"] = json.dumps(moves).encode()
+    great = json.loads(stand_in.files["groups/great.json"])
+    stand_in.files["groups/great.json"] = json.dumps(great[1:]).encode()
+
+    result = refresh(data_dir, stand_in.url)
+    assert sorted(result.written) == ["gamemaster.json", "great.json"]
+    downloaded = {"gamemaster/moves.json", "groups/great.json"}
+    assert stand_in.statuses() == {path: 200 if path in downloaded else 304 for path in stand_in.files}
+
+    # the parts that weren't downloaded again are filled in from the gamemaster on disk
+    gamemaster = json.loads((data_dir / "gamemaster.json").read_text())
+    assert gamemaster["pokemon"] == GAMEMASTER["pokemon"]
+    assert gamemaster["moves"] == moves
+    assert gamemaster["settings"] == GAMEMASTER["settings"]
+
+    assert result.changes.moves == {"COUNTER"}
+    assert result.changes.leagues == {"great"}
+    assert result.changes.species == frozenset()
+    assert json.loads((data_dir / "changes.json").read_text())["moves"] == ["COUNTER"]
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+from pvp_damage.atlas import compute_league_atlas
+from pvp_damage.impact import patch_impact
+from pvp_damage.models.constants import GAMEMASTER
+from pvp_damage.models.leagues import DATA_DIR
+from pvp_damage.models.registry import Registry
+
+
+def test_registry_load_matches_current():
+    loaded = Registry.load(DATA_DIR / "gamemaster.json")
+    current = Registry.current()
+
+    assert loaded.gamemaster_hash == current.gamemaster_hash
+    assert loaded.pokemon == current.pokemon
+    assert loaded.leagues["great"].meta == current.leagues["great"].meta
+
+
+def test_patch_impact_matches_full_recompute(tmp_path: Path):
+    patched = json.loads(json.dumps(GAMEMASTER))
+    for move in patched["moves"]:
+        if move["moveId"] == "COUNTER":
+            move["power"] += 1
+    for mon in patched["pokemon"]:
+        if mon["speciesId"] == "medicham":
+            mon["baseStats"]["def"] += 6
+    (tmp_path / "gamemaster.json").write_text(json.dumps(patched))
+
+    old, new = Registry.current(), Registry.load(tmp_path / "gamemaster.json")
+    assert new.fast_moves["COUNTER"].power == old.fast_moves["COUNTER"].power + 1
+
+    impact = patch_impact(old, new, ["great"])["great"]
+    assert not impact.meta_changed
+    assert impact.recomputed > 0
+    assert impact.reused > impact.recomputed
+
+    def by_pair(registry: Registry) -> dict[tuple[str, ...], list[tuple[int, float, float, int]]]:
+        out: dict[tuple[str, ...], list[tuple[int, float, float, int]]] = {}
+        for row in compute_league_atlas("great", registry.leagues["great"]):
+            key = (row.kind, row.attacker, row.move, row.defender)
+            out.setdefault(key, []).append((row.damage, row.stat_min, row.stat_max, row.count))
+        return out
+
+    before, after = by_pair(old), by_pair(new)
+    changed = {key for key in before.keys() | after.keys() if before.get(key) != after.get(key)}
+    assert {(diff.kind, diff.attacker, diff.move, diff.defender) for diff in impact.diffs} == changed
+
+    for diff in impact.diffs:
+        assert diff.move == "COUNTER" or "medicham" in (diff.attacker, diff.defender)
+        if diff.status == "appeared":
+            assert len(diff.old) == 1
+            assert len(diff.new) > 1
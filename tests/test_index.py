@@ -0,0 +1,75 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from pvp_damage.atlas import pair_thresholds
+from pvp_damage.damage import compute_breakpoints, compute_bulkpoints
+from pvp_damage.index import MetaIndex
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.moves import get_move_by_name
+from pvp_damage.models.pokemon import get_species, get_species_by_id
+
+
+@pytest.fixture(scope="module")
+def index_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("index") / "index.sqlite"
+
+
+@pytest.fixture(scope="module")
+def index(index_path: Path) -> Iterator[MetaIndex]:
+    with MetaIndex(index_path) as index:
+        index.build(["great"])
+        yield index
+
+
+def test_breakpoints_match_engine(index: MetaIndex):
+    # (by ID, since there is more than one species named Clodsire)
+    ape, clodsire, counter = get_species("Annihilape"), get_species_by_id("clodsire"), get_move_by_name("Counter")
+    rows = index.query("breakpoint", "great", attacker=ape, move=counter, defender=clodsire)
+
+    expected = compute_breakpoints(ape, compute_iv_table(clodsire, 1500).rank1(), counter, 1500)
+    assert [row.damage for row in rows] == sorted(expected.ranges)
+    for row in rows:
+        lowest, highest = expected.ranges[row.damage]
+        assert (row.stat_min, row.stat_max) == (lowest.attack_stat, highest.attack_stat)
+        assert row.count == len(expected.ranges_all[row.damage])
+
+
+def test_bulkpoints_match_engine(index: MetaIndex):
+    ape, clodsire, counter = get_species("Annihilape"), get_species_by_id("clodsire"), get_move_by_name("Counter")
+    rows = index.query("bulkpoint", "great", attacker="annihilape", move="COUNTER", defender="clodsire")
+
+    expected = compute_bulkpoints(compute_iv_table(ape, 1500).rank1(), clodsire, counter, 1500)
+    assert [row.damage for row in rows] == sorted(expected.ranges)
+    for row in rows:
+        lowest, highest = expected.ranges[row.damage]
+        assert (row.stat_min, row.stat_max) == (lowest.defense_stat, highest.defense_stat)
+
+
+def test_rows_match_atlas(index: MetaIndex):
+    ape, clodsire, counter = get_species("Annihilape"), get_species_by_id("clodsire"), get_move_by_name("Counter")
+    rows = index.query("breakpoint", "great", attacker=ape, move=counter, defender=clodsire)
+    rows += index.query("bulkpoint", "great", attacker=ape, move=counter, defender=clodsire)
+    assert rows == pair_thresholds("great", 1500, ape, counter, clodsire)
+
+
+def test_query_by_stat(index: MetaIndex):
+    rows = index.query("bulkpoint", "great", defender="clodsire", stat_at_least=120, stat_at_most=121)
+
+    assert rows
+    assert all(row.stat_max >= 120 and row.stat_min <= 121 for row in rows)
+    assert {row.defender for row in rows} == {"clodsire"}
+
+
+def test_build_is_keyed_by_gamemaster(index: MetaIndex, index_path: Path):
+    # already built, so nothing to do
+    assert index.build(["great"]) == {}
+
+    with pytest.raises(ValueError, match="isn't built"):
+        index.query("breakpoint", "ultra")
+
+    with MetaIndex(index_path, gamemaster_hash="older") as older:
+        assert not older.is_built("great")
+        with pytest.raises(ValueError, match="isn't built"):
+            older.query("breakpoint", "great")
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from pvp_damage import instrument
+from pvp_damage.damage import compute_breakpoints, compute_iv_possibilities
+from pvp_damage.iv_table import clear_iv_table_cache, get_iv_table
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_move_by_name
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.sweep import sweep_moves
+
+
+def test_off_by_default():
+    assert instrument.active is None
+    compute_iv_possibilities(get_species("Azumarill"), 1500)
+    assert instrument.active is None
+
+
+def test_counters_and_spans():
+    ape = get_species("Annihilape")
+    clodsire = get_iv_table(get_species("Clodsire"), 1500).rank1()
+
+    with instrument.instrumented() as recorder:
+        ranges = compute_breakpoints(ape, clodsire, get_move_by_name("Counter"), 1500)
+
+    assert instrument.active is None
+    assert recorder.counters["find_max_level_for_league"] == 16**3
+    assert recorder.counters["pokemon"] == 16**3
+    # one damage calculation per distinct attack stat (plus the min and max check)
+    assert 2 < recorder.counters["calculate_damage"] < 16**3
+    assert recorder.spans["compute_iv_possibilities"].calls == 1
+    assert ranges.min_damage < ranges.max_damage
+
+
+def test_iv_table_cache_counters():
+    clear_iv_table_cache()
+    with instrument.instrumented() as recorder:
+        sweep_moves(get_species("Altaria"), GREAT_LEAGUE)
+        sweep_moves(get_species("Altaria"), GREAT_LEAGUE)
+
+    meta_species = len({species for species, _moveset in GREAT_LEAGUE.meta})
+    assert recorder.counters["iv_table_cache.miss"] == meta_species
+    assert recorder.counters["iv_table_cache.hit"] == meta_species
+    assert recorder.spans["compute_iv_table"].calls == meta_species + 2
+
+
+def test_nested_recorders():
+    with instrument.instrumented() as outer:
+        instrument.count("outer")
+        with instrument.instrumented() as inner:
+            instrument.count("inner", 3)
+
+    assert inner.counters == {"inner": 3}
+    assert outer.counters == {"outer": 1, "inner": 3}
+    assert json.loads(json.dumps(outer.to_json()))["counters"] == {"inner": 3, "outer": 1}
+    assert "inner" in outer.summary()
+
+
+def test_environment_variable(tmp_path: Path):
+    dump = tmp_path / "instrument.json"
+    code = "; ".join([
+        "import pvp_damage.models.leagues",
+        "from pvp_damage.damage import compute_iv_possibilities",
+        "from pvp_damage.models.pokemon import get_species",
+        "compute_iv_possibilities(get_species('Azumarill'), 1500)",
+    ])
+    env = os.environ | {"PVP_DAMAGE_INSTRUMENT": str(dump)}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True, cwd=Path(__file__).parent.parent)
+
+    report = json.loads(dump.read_text())
+    assert report["counters"]["pokemon"] == 16**3
+    assert report["spans"]["load_league"]["calls"] == 3
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from pvp_damage import inverse
+from pvp_damage.damage import find_max_level_for_league
+from pvp_damage.inverse import build_cp_index, clear_cp_index_cache, get_cp_index
+from pvp_damage.models.constants import CP_MULTIPLIERS
+from pvp_damage.models.pokemon import Pokemon, get_species
+
+
+def test_lookup_finds_the_pokemon():
+    species = get_species("Altaria")
+    index = get_cp_index(species)
+    assert len(index) == len(CP_MULTIPLIERS) * 16**3
+
+    mon = find_max_level_for_league(species, (3, 14, 12), 1500)
+    candidates = index.lookup(mon.cp, int(mon.stamina_stat))
+    assert mon in candidates
+    assert all((other.cp, other.stamina_stat) == (mon.cp, mon.stamina_stat) for other in candidates)
+
+    with_level = index.lookup(mon.cp, int(mon.stamina_stat), level=mon.level)
+    assert mon in with_level
+    assert len(with_level) < len(candidates)
+    assert index.lookup(1, 1) == []
+
+
+def test_lookup_many_matches_lookup():
+    species = get_species("Medicham")
+    index = build_cp_index(species)
+
+    rng = np.random.default_rng(0)
+    ivs = rng.integers(0, 16, size=(500, 3))
+    levels = rng.integers(2, 102, size=500) / 2
+    mons = [
+        Pokemon(species=species, level=level, ivs=(int(a), int(d), int(s)))
+        for (a, d, s), level in zip(ivs, levels, strict=True)
+    ]
+    cps = [mon.cp for mon in mons] + [1]
+    hps = [int(mon.stamina_stat) for mon in mons] + [1]
+
+    # the level is only known for every other observation
+    known = np.where(np.arange(len(cps)) % 2 == 0, np.append(levels, np.nan), np.nan)
+    matches = index.lookup_many(cps, hps, known)
+    assert matches.counts[-1] == 0
+    assert np.all(matches.counts[:-1] >= 1)
+
+    for i in range(0, len(mons), 37):
+        level = None if np.isnan(known[i]) else float(known[i])
+        expected = index.lookup(cps[i], hps[i], level=level)
+        assert sorted(matches.pokemon(i), key=lambda mon: (mon.level, mon.ivs)) == sorted(
+            expected, key=lambda mon: (mon.level, mon.ivs)
+        )
+        assert mons[i] in expected
+
+
+def test_cp_index_cache_is_bounded(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(inverse, "CP_INDEX_CACHE_SIZE", 1)
+    clear_cp_index_cache()
+
+    altaria = get_cp_index(get_species("Altaria"))
+    assert get_cp_index(get_species("Altaria")) is altaria
+    get_cp_index(get_species("Medicham"))
+    assert get_cp_index(get_species("Altaria")) is not altaria
+    clear_cp_index_cache()
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from pvp_damage.damage import calculate_damage, calculate_damage_array, compute_bulkpoints, compute_iv_possibilities
+from pvp_damage.iv_table import ATTACK, ATTACK_IV, DEFENSE, DEFENSE_IV, LEVEL, RANK, STAMINA_IV, compute_iv_table
+from pvp_damage.models.moves import get_fast_move, get_move_by_name
+from pvp_damage.models.pokemon import get_species
+
+
+@pytest.mark.parametrize(
+    ("species_name", "shadow", "cp_limit"),
+    [
+        ("Azumarill", False, 1500),
+        ("Altaria", False, 1500),
+        ("Swampert", True, 1500),
+        ("Garchomp", False, 2500),
+        ("Chansey", False, 1500),
+        ("Dialga", False, 10_000),
+    ],
+)
+def test_iv_table_matches_iv_possibilities(species_name: str, shadow: bool, cp_limit: int):
+    species = get_species(species_name, as_shadow=shadow)
+    table = compute_iv_table(species, cp_limit)
+    mons = list(compute_iv_possibilities(species, cp_limit).values())
+
+    assert len(table) == len(mons) == 16**3
+    assert list(table) == mons
+
+    # the stats should be identical, not just close
+    assert np.array_equal(table.attack_stat, [mon.attack_stat for mon in mons])
+    assert np.array_equal(table.defense_stat, [mon.defense_stat for mon in mons])
+    assert np.array_equal(table.stamina_stat, [mon.stamina_stat for mon in mons])
+    assert np.array_equal(table.stat_product, [mon.stat_product for mon in mons])
+    assert np.array_equal(table.cp, [mon.cp for mon in mons])
+    assert table.rank1() == max(mons, key=lambda mon: mon.stat_product)
+
+
+def test_iv_table_take():
+    table = compute_iv_table(get_species("Azumarill"), 1500)
+    high_attack = table.take(table.attack_stat >= 95)
+
+    assert 0 < len(high_attack) < len(table)
+    assert all(mon.attack_stat >= 95 for mon in high_attack)
+
+    ivs = (15, 0, 0)
+    assert high_attack.pokemon(high_attack.index_of(ivs)) == table.pokemon(table.index_of(ivs))
+    with pytest.raises(ValueError, match="IVs not in table"):
+        high_attack.index_of((0, 15, 15))
+
+
+def test_calculate_damage_array():
+    ape = get_species("Annihilape")
+    clodsire = get_species("Clodsire")
+    counter = get_fast_move("Counter")
+
+    apes = compute_iv_table(ape, 1500)
+    clods = compute_iv_table(clodsire, 1500)
+
+    # broadcast 4096 attackers against a handful of defenders
+    sample = np.arange(0, len(clods), 512)
+    damage = calculate_damage_array(
+        counter, ape, apes.attack_stat[:, None], clodsire, clods.defense_stat[None, sample], attacker_buff=1
+    )
+    assert damage.shape == (len(apes), len(sample))
+
+    for j, defender_index in enumerate(sample):
+        defender = clods.pokemon(int(defender_index))
+        expected = [calculate_damage(counter, attacker, defender, attacker_buff=1) for attacker in apes]
+        assert np.array_equal(damage[:, j], expected)
+
+
+def test_stat_classes():
+    table = compute_iv_table(get_species("Medicham"), 1500)
+
+    for classes, stats in (
+        (table.attack_classes, table.attack_stat),
+        (table.defense_classes, table.defense_stat),
+        (table.bulk_classes, np.stack([table.defense_stat, table.stamina_stat], axis=1)),
+    ):
+        assert len(classes) < len(table)
+        assert classes.counts.sum() == len(table)
+        assert np.array_equal(classes.values[classes.inverse], stats)
+
+    # damage computed per class and expanded is the damage computed per row
+    move = get_fast_move("Counter")
+    per_class = calculate_damage_array(move, table.species, table.attack_classes.values, table.species, 120.0)
+    per_row = calculate_damage_array(move, table.species, table.attack_stat, table.species, 120.0)
+    assert np.array_equal(table.attack_classes.expand(per_class), per_row)
+
+
+def test_filter():
+    ariados = get_species("Ariados")
+    table = compute_iv_table(ariados, 1500)
+    possibilities = compute_iv_possibilities(ariados, 1500)
+
+    viable = table.filter(ATTACK >= 127.18)
+    assert {mon.ivs for mon in viable} == {ivs for ivs, mon in possibilities.items() if mon.attack_stat >= 127.18}
+
+    # predicates combine like the conditions they stand for
+    combined = table.filter((RANK <= 100) | (ATTACK_IV == 15), ~(DEFENSE < 100), STAMINA_IV.between(10, 14))
+    ranks = sorted(possibilities.values(), key=lambda mon: -mon.stat_product)
+    top100 = {mon.ivs for mon in ranks if mon.stat_product >= ranks[99].stat_product}
+    assert {mon.ivs for mon in combined} == {
+        ivs
+        for ivs, mon in possibilities.items()
+        if (ivs in top100 or ivs[0] == 15) and mon.defense_stat >= 100 and 10 <= ivs[2] <= 14
+    }
+
+    assert table.filter(RANK == 1).rank1() == table.rank1()
+    assert len(table.filter(LEVEL.isin([51.0]), LEVEL < 51)) == 0
+    assert len(table.filter()) == len(table)
+
+
+def test_filtered_table_as_candidates():
+    # a handful of spreads, whose damage values can skip some of the ones in between
+    azumarill = compute_iv_table(get_species("Azumarill"), 1500)
+    corners = azumarill.filter(DEFENSE_IV.isin([0, 15]), ATTACK_IV == 15, STAMINA_IV.isin([0, 15]))
+    assert len(corners) == 4
+
+    medicham = compute_iv_table(get_species("Medicham"), 1500).rank1()
+    ranges = compute_bulkpoints(medicham, corners, get_move_by_name("Dynamic Punch"), 1500)
+    assert set().union(*ranges.ranges_all.values()) == set(corners)
+    assert len(ranges.ranges) < ranges.max_damage - ranges.min_damage + 1
+    for damage, (lowest, highest) in ranges.ranges.items():
+        assert lowest in ranges.ranges_all[damage]
+        assert highest in ranges.ranges_all[damage]
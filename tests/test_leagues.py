@@ -1,6 +1,9 @@
+import json
+from pathlib import Path
+
 import pytest
 
-from pvp_damage.models.leagues import GREAT_LEAGUE, ULTRA_LEAGUE
+from pvp_damage.models.leagues import DATA_DIR, GREAT_LEAGUE, ULTRA_LEAGUE, League, load_league
 from pvp_damage.models.pokemon import get_species
 
 
@@ -74,3 +77,25 @@ def test_ultra_league(name: str, shadow: bool, expected_present: bool):
     species = get_species(name, shadow)
 
     assert (species in ultra_species) is expected_present
+
+
+def test_league_weights(tmp_path: Path):
+    assert GREAT_LEAGUE.weights is None
+    assert GREAT_LEAGUE.meta_weights == [1.0] * len(GREAT_LEAGUE.meta)
+
+    first = GREAT_LEAGUE.meta[0][0]
+    weighted = GREAT_LEAGUE.with_weights({first.key: 0.25}, default=0.01)
+    assert weighted.meta_weights == [0.25 if species == first else 0.01 for species, _moveset in GREAT_LEAGUE.meta]
+
+    with pytest.raises(ValueError, match="weights"):
+        League(name="Great League", max_cp=1500, meta=GREAT_LEAGUE.meta, weights=[1.0])
+    with pytest.raises(ValueError, match="negative"):
+        League(name="Great League", max_cp=1500, meta=GREAT_LEAGUE.meta[:1], weights=[-1.0])
+
+    # league files can have weights too
+    data = json.loads((DATA_DIR / "great.json").read_text())
+    data[0]["weight"] = 3
+    (tmp_path / "great.json").write_text(json.dumps(data))
+    league = load_league("great", "Great League", 1500, tmp_path)
+    assert league.meta == GREAT_LEAGUE.meta
+    assert league.weights == [3.0] + [1.0] * (len(data) - 1)
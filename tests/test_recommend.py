@@ -0,0 +1,69 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_fast_move
+from pvp_damage.models.pokemon import get_species, get_species_by_id
+from pvp_damage.recommend import pareto_front, recommend_ivs, score_ivs
+
+
+def brute_force_pareto(points: np.ndarray) -> set[int]:
+    dominated: set[int] = set()
+    for i, p in enumerate(points):
+        if any(np.all(q >= p) and np.any(q > p) for q in points):
+            dominated.add(i)
+
+    return set(range(len(points))) - dominated
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_pareto_front(seed: int):
+    rng = np.random.default_rng(seed)
+    first = rng.integers(0, 20, size=200).astype(np.float64)
+    second = rng.integers(0, 6, size=200)
+    third = rng.integers(0, 6, size=200)
+
+    front = pareto_front(first, second, third)
+    assert set(front.tolist()) == brute_force_pareto(np.stack([first, second, third], axis=1))
+
+    # ordered by the first objective, best first
+    assert np.all(np.diff(first[front]) <= 0)
+
+
+def test_recommend_ivs():
+    recs = recommend_ivs(get_species("Altaria"), get_fast_move("Dragon Breath"), GREAT_LEAGUE)
+
+    assert recs.breakpoints.shape == recs.bulkpoints.shape == (16**3,)
+    assert np.all(recs.breakpoints >= 0)
+    assert np.all(recs.bulkpoints >= 0)
+
+    # rank 1 is always on the frontier, and nothing on the frontier dominates anything else on it
+    frontier = recs.frontier()
+    assert recs.table.rank1() in set(frontier)
+    points = np.stack([recs.stat_product, recs.breakpoints, recs.bulkpoints], axis=1)[recs.pareto]
+    assert brute_force_pareto(points) == set(range(len(points)))
+
+
+def test_score_ivs_weights():
+    altaria, dragon_breath = get_species("Altaria"), get_fast_move("Dragon Breath")
+    recs = recommend_ivs(altaria, dragon_breath, GREAT_LEAGUE)
+
+    # without weights, every meta entry counts once
+    scores = score_ivs(altaria, dragon_breath, GREAT_LEAGUE)
+    assert np.array_equal(scores.breakpoints, recs.breakpoints)
+    assert np.array_equal(scores.bulkpoints, recs.bulkpoints)
+    assert np.array_equal(scores.score, recs.breakpoints + recs.bulkpoints)
+
+    ranked = scores.ranked()
+    assert len(ranked) == 16**3
+    assert all(a[1] >= b[1] for a, b in itertools.pairwise(ranked))
+
+    # with all the weight on one species, only its entries count
+    clodsire = get_species_by_id("clodsire")
+    weighted = score_ivs(altaria, dragon_breath, GREAT_LEAGUE.with_weights({clodsire.key: 1.0}), bulk_weight=0.5)
+    meta = [entry for entry in GREAT_LEAGUE.meta if entry[0] == clodsire]
+    only = score_ivs(altaria, dragon_breath, GREAT_LEAGUE.model_copy(update={"meta": meta}))
+    assert np.array_equal(weighted.breakpoints, only.breakpoints)
+    assert np.allclose(weighted.score, only.breakpoints + 0.5 * only.bulkpoints)
@@ -0,0 +1,83 @@
+import copy
+import json
+from pathlib import Path
+
+from pvp_damage.checkpoint import CheckpointStore, run_units, sweep_unit
+from pvp_damage.index import MetaIndex
+from pvp_damage.models.constants import GAMEMASTER, GAMEMASTER_HASH
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.refresh import ChangeSet, hash_gamemaster
+
+DATA = Path(__file__).parent.parent / "data"
+
+
+def test_compare_finds_changes():
+    old = GAMEMASTER
+    new = copy.deepcopy(old)
+    for mon in new["pokemon"]:
+        if mon["speciesId"] == "medicham":
+            mon["baseStats"]["atk"] += 1
+        if mon["speciesId"] == "azumarill":
+            mon["buddyDistance"] = 20  # doesn't affect damage
+    for move in new["moves"]:
+        if move["moveId"] == "COUNTER":
+            move["power"] += 1
+        if move["moveId"] == "BUBBLE":
+            move["archetype"] = "changed"  # doesn't affect damage
+
+    old_leagues = {name: (DATA / f"{name}.json").read_bytes() for name in ("great", "ultra")}
+    new_great = json.loads(old_leagues["great"])[1:]
+    new_leagues = old_leagues | {"great": json.dumps(new_great).encode()}
+
+    old_bytes, new_bytes = json.dumps(old).encode(), json.dumps(new).encode()
+    changes = ChangeSet.compare(old_bytes, new_bytes, old_leagues, new_leagues)
+    assert (changes.old_hash, changes.new_hash) == (hash_gamemaster(old_bytes), hash_gamemaster(new_bytes))
+    assert changes.species == {"medicham"}
+    assert changes.moves == {"COUNTER"}
+    assert changes.leagues == {"great"}
+
+    assert changes.affects_pair("medicham_shadow", "PSYCHO_CUT", "azumarill")
+    assert changes.affects_pair("annihilape", "COUNTER", "azumarill")
+    assert not changes.affects_pair("azumarill", "BUBBLE", "annihilape")
+
+    assert ChangeSet.compare(old_bytes, old_bytes, old_leagues, old_leagues).is_empty
+
+
+def test_index_update_reuses_unaffected_pairs(tmp_path: Path):
+    path = tmp_path / "index.sqlite"
+    with MetaIndex(path, gamemaster_hash="old") as index:
+        index.build(["great"])
+    with MetaIndex(path) as index:
+        index.build(["great"])
+        expected = index.query("breakpoint", "great") + index.query("bulkpoint", "great")
+        index.connection.execute("DELETE FROM builds WHERE gamemaster = ?", (GAMEMASTER_HASH,))
+        index.connection.commit()
+
+        # the data didn't really change, so the updated index should match a full build
+        changes = ChangeSet(
+            old_hash="old", new_hash=GAMEMASTER_HASH, species=frozenset({"clodsire"}), moves=frozenset({"COUNTER"})
+        )
+        updated = index.update(changes)
+        assert set(updated) == {"great"}
+        reused, computed = updated["great"]
+        assert reused > 0
+        assert computed > 0
+
+        assert index.query("breakpoint", "great") + index.query("bulkpoint", "great") == expected
+        assert index.update(changes) == {}
+
+
+def test_checkpoint_carry_over(tmp_path: Path):
+    units = [sweep_unit(get_species(name), "great") for name in ("Altaria", "Medicham")]
+    with CheckpointStore(tmp_path / "store.sqlite", gamemaster_hash="old") as store:
+        run_units(units, store)
+
+    with CheckpointStore(tmp_path / "store.sqlite") as store:
+        changes = ChangeSet(old_hash="old", new_hash=GAMEMASTER_HASH, moves=frozenset({"COUNTER"}))
+        assert store.carry_over("old", changes.keeps_sweep) == (1, 1)
+        assert set(store.completed()) == {"altaria:great"}
+
+        # a change to the league's meta invalidates every unit in it
+        changes = ChangeSet(old_hash=GAMEMASTER_HASH, new_hash=GAMEMASTER_HASH, leagues=frozenset({"great"}))
+        assert store.carry_over(GAMEMASTER_HASH, changes.keeps_sweep) == (0, 1)
+        assert store.completed() == {}
@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+from pvp_damage.damage import compute_breakpoints, compute_bulkpoints, find_max_level_for_league
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.moves import get_move_by_name
+from pvp_damage.models.pokemon import Pokemon, get_species
+from pvp_damage.report import ConsoleReporter, JsonLinesReporter
+
+
+def test_no_output_by_default(capsys: pytest.CaptureFixture[str]):
+    my_serp = Pokemon(species=get_species("Serperior"), level=51, ivs=(8, 15, 15))
+    compute_bulkpoints(my_serp, get_species("Swampert"), get_move_by_name("Vine Whip"), 2500)
+
+    assert capsys.readouterr().out == ""
+
+
+def test_console_bulkpoints(capsys: pytest.CaptureFixture[str]):
+    my_serp = Pokemon(species=get_species("Serperior"), level=51, ivs=(8, 15, 15))
+    compute_bulkpoints(
+        my_serp, get_species("Swampert"), get_move_by_name("Vine Whip"), 2500, reporter=ConsoleReporter()
+    )
+
+    assert capsys.readouterr().out.splitlines() == [
+        "Serperior using Vine Whip; CP 2496 (level 51.0, (8, 15, 15))",
+        "vs. Swampert (129.11 - 144.70 defense); rank 1 142.27 def)",
+        "- 10: 1.93% of IVs; 142.82 - 144.70 defense",
+        "- 11: 97.80% of IVs; 129.85 - 142.62 defense",
+        "- 12: 0.27% of IVs; 129.11 - 129.64 defense",
+    ]
+
+
+def test_console_no_breakpoints():
+    clodsire = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+    out = io.StringIO()
+    compute_breakpoints(
+        get_species("Registeel"), clodsire, get_move_by_name("Lock On"), 1500, reporter=ConsoleReporter(out)
+    )
+
+    assert out.getvalue() == "- 1 damage guaranteed (no breakpoints)\n"
+
+
+def test_json_lines():
+    out = io.StringIO()
+    reporter = JsonLinesReporter(out)
+
+    ape = get_species("Annihilape")
+    clodsire = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+    breakpoints = compute_breakpoints(ape, clodsire, get_move_by_name("Counter"), 1500, reporter=reporter)
+
+    registeel = find_max_level_for_league(get_species("Registeel", as_shadow=True), (10, 15, 15), 1500)
+    compute_bulkpoints(registeel, get_species("Doublade"), get_move_by_name("Lock On"), 1500, reporter=reporter)
+
+    first, second = (json.loads(line) for line in out.getvalue().splitlines())
+    assert first["analysis"] == "breakpoints"
+    assert first["move"] == "COUNTER"
+    assert [r["damage"] for r in first["ranges"]] == sorted(breakpoints.ranges)
+    assert sum(r["count"] for r in first["ranges"]) == 16**3
+
+    assert second["analysis"] == "bulkpoints"
+    assert second["attacker"] == {"species": "registeel", "shadow": True, "ivs": [10, 15, 15], "level": 22.0}
+    assert second["min_damage"] == second["max_damage"] == 1
@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+import pytest
+
+from pvp_damage.damage import compute_breakpoints
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_move_by_name
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.report import breakpoints_record
+from pvp_damage.server import check_loopback, handle, start
+
+type Client = Callable[[httpx.AsyncClient], Coroutine[Any, Any, None]]
+
+
+def with_server(test: Client) -> None:
+    """Start the service on a free loopback port, with threads instead of processes."""
+
+    async def run() -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            server = await start("127.0.0.1", 0, executor)
+            port = server.sockets[0].getsockname()[1]
+            async with server, httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as http:
+                await test(http)
+
+    asyncio.run(run())
+
+
+def test_breakpoints_endpoint():
+    async def test(http: httpx.AsyncClient) -> None:
+        params = {"attacker": "Annihilape", "defender": "Clodsire", "move": "Counter"}
+        response = await http.get("/breakpoints", params=params)
+        assert response.status_code == 200
+
+        clodsire = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+        counter = get_move_by_name("Counter")
+        expected = compute_breakpoints(get_species("Annihilape"), clodsire, counter, 1500)
+        assert response.json() == breakpoints_record(get_species("Annihilape"), clodsire, counter, expected)
+
+    with_server(test)
+
+
+def test_concurrent_requests():
+    async def test(http: httpx.AsyncClient) -> None:
+        requests = [
+            http.get("/rank", params={"species": "Azumarill", "ivs": "0,15,15"}),
+            http.get("/rank", params={"species": "Azumarill", "ivs": "15,15,15"}),
+            http.get("/meta-matrix", params={"league": "great"}),
+            http.get(
+                "/bulkpoints",
+                params={
+                    "attacker": "Serperior",
+                    "attacker_ivs": "8,15,15",
+                    "level": "51",
+                    "defender": "Swampert",
+                    "move": "Vine Whip",
+                    "league": "ultra",
+                },
+            ),
+        ]
+        rank1, hundo, matrix, bulkpoints = await asyncio.gather(*requests)
+
+        assert rank1.json()["rank"] == 1
+        assert hundo.json()["rank"] > 1
+        assert len(matrix.json()["damage"]) == len(GREAT_LEAGUE.meta)
+        assert bulkpoints.json()["min_damage"] == 10
+
+    with_server(test)
+
+
+def test_errors():
+    assert handle("/nowhere", {})[0] == 404
+    assert handle("/rank", {"species": "Azumarill"}) == (400, {"error": "Missing parameter: ivs"})
+    assert handle("/rank", {"species": "Azumarill", "ivs": "16,0,0"})[0] == 400
+    assert handle("/rank", {"species": "Azumarill", "ivs": "0,0,0", "league": "little"})[0] == 400
+    assert handle("/breakpoints", {"attacker": "Annihilape", "defender": "Clodsire", "move": "Nope"})[0] == 400
+
+
+def test_only_loopback():
+    check_loopback("127.0.0.1")
+    check_loopback("::1")
+    check_loopback("localhost")
+
+    with pytest.raises(ValueError, match="loopback"):
+        check_loopback("0.0.0.0")
@@ -0,0 +1,43 @@
+from math import ceil
+
+import pytest
+
+from pvp_damage.damage import calculate_damage, find_max_level_for_league
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.moves import Moveset, get_charged_move, get_fast_move
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.survival import compute_hits_to_faint
+
+
+def test_hits_to_faint():
+    moveset = Moveset(fast=get_fast_move("Mud Shot"), charged=(get_charged_move("Earthquake"),))
+    attacker = find_max_level_for_league(get_species("Swampert", as_shadow=True), (0, 14, 14), 1500)
+    defenders = compute_iv_table(get_species("Stunfisk (Galarian)"), 1500)
+
+    analysis = compute_hits_to_faint(attacker, defenders, 1500, moveset=moveset)
+    assert len(analysis.charged) == 1
+
+    for result in (analysis.fast, *analysis.charged):
+        # the partitions cover every defender exactly once
+        assert sum(len(part) for part in result.partitions.values()) == len(defenders)
+
+        for hits, part in result.partitions.items():
+            for defender in list(part)[::97]:
+                damage = calculate_damage(result.move, attacker, defender)
+                assert ceil(defender.stamina_stat / damage) == hits
+
+
+def test_hits_to_faint_uses_attacker_moveset():
+    species = get_species("Azumarill")
+    moveset = Moveset(
+        fast=get_fast_move("Bubble"), charged=(get_charged_move("Ice Beam"), get_charged_move("Play Rough"))
+    )
+    attacker = find_max_level_for_league(species, (0, 15, 15), 1500).model_copy(update={"moveset": moveset})
+
+    analysis = compute_hits_to_faint(attacker, get_species("Medicham"), 1500)
+    assert analysis.fast.move == moveset.fast
+    assert [result.move for result in analysis.charged] == list(moveset.charged)
+    assert analysis.fast.min_hits <= analysis.fast.max_hits
+
+    with pytest.raises(ValueError, match="No moveset"):
+        compute_hits_to_faint(attacker.model_copy(update={"moveset": None}), get_species("Medicham"), 1500)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from pvp_damage.damage import calculate_damage, compute_breakpoints
+from pvp_damage.iv_table import compute_iv_table
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_fast_move
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.sweep import rank1_defenders, sweep_moves
+
+
+def test_sweep_matches_compute_breakpoints():
+    ape = get_species("Annihilape")
+    clodsire = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+
+    sweep = sweep_moves(ape, clodsire, 1500)
+    assert {move.name for move in sweep.moves} == {move.name for move in ape.fast_moves}
+    assert sweep.damage.shape == (len(ape.fast_moves), 1, 16**3)
+
+    counter = get_fast_move("Counter")
+    expected = compute_breakpoints(ape, clodsire, counter, 1500)
+    partition = sweep.partition(counter)
+
+    assert set(partition) == set(expected.ranges_all)
+    for damage, attackers in partition.items():
+        assert set(attackers) == expected.ranges_all[damage]
+
+
+def test_sweep_league_meta():
+    species = get_species("Altaria")
+    sweep = sweep_moves(species, GREAT_LEAGUE, include_charged=True)
+
+    defenders = rank1_defenders(GREAT_LEAGUE)
+    assert sweep.defenders == defenders
+    assert len(sweep.moves) == len(species.fast_moves) + len(species.charged_moves)
+    assert sweep.has_breakpoints.shape == (len(sweep.moves), len(defenders))
+
+    # spot check a few entries against the scalar damage formula
+    for m, move in enumerate(sweep.moves):
+        for d in range(0, len(defenders), 7):
+            for i in (0, 2000, 4095):
+                expected = calculate_damage(move, sweep.attackers.pokemon(i), defenders[d])
+                assert sweep.damage[m, d, i] == expected
+
+
+def test_sweep_needs_cp_limit():
+    defender = compute_iv_table(get_species("Clodsire"), 1500).rank1()
+
+    with pytest.raises(ValueError, match="CP limit"):
+        sweep_moves(get_species("Annihilape"), defender)
+
+    # ... unless the attackers are already an IV table
+    apes = compute_iv_table(get_species("Annihilape"), 1500)
+    sweep = sweep_moves(apes.take(apes.attack_stat > np.median(apes.attack_stat)), defender)
+    assert sweep.damage.shape[-1] < 16**3
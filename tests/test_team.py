@@ -0,0 +1,51 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_fast_move
+from pvp_damage.models.pokemon import get_species
+from pvp_damage.team import search_team, win_matrix
+
+TEAM = [
+    (get_species("Medicham"), get_fast_move("Counter")),
+    (get_species("Azumarill"), get_fast_move("Bubble")),
+    (get_species("Altaria"), get_fast_move("Dragon Breath")),
+]
+
+
+def _masks(wins: np.ndarray) -> set[int]:
+    return {sum(1 << int(j) for j in np.flatnonzero(row)) for row in np.unique(wins, axis=0)}
+
+
+def test_search_matches_brute_force():
+    search = search_team(TEAM, GREAT_LEAGUE, top=3)
+
+    # every distinct mask of every member, without dropping the dominated ones
+    all_masks = [_masks(win_matrix(species, move, GREAT_LEAGUE)[1]) for species, move in TEAM]
+    assert search.picks[0].coverage == max((a | b | c).bit_count() for a, b, c in itertools.product(*all_masks))
+
+    # and without pruning
+    kept = [member.masks for member in search.members]
+    coverages = sorted(((a | b | c).bit_count() for a, b, c in itertools.product(*kept)), reverse=True)
+    assert [pick.coverage for pick in search.picks] == coverages[:3]
+    assert search.picks[0].coverage <= search.reachable
+
+    # the spreads shown for the best pick win what the pick says they do
+    best = search.picks[0]
+    union = 0
+    for (species, move), mon in zip(TEAM, search.pokemon(best), strict=True):
+        table, wins = win_matrix(species, move, GREAT_LEAGUE)
+        union |= sum(1 << int(j) for j in np.flatnonzero(wins[table.index_of(mon.ivs)]))
+    assert union == best.mask
+    assert len(search.covered(best)) == best.coverage
+
+
+def test_one_member_is_its_best_spreads():
+    search = search_team(TEAM[:1], GREAT_LEAGUE, top=1)
+    wins = win_matrix(*TEAM[0], GREAT_LEAGUE)[1]
+    assert search.picks[0].coverage == wins.sum(axis=1).max()
+
+    with pytest.raises(ValueError, match="at least one member"):
+        search_team([], GREAT_LEAGUE)
@@ -0,0 +1,60 @@
+import pytest
+
+from pvp_damage.atlas import Threshold, pair_thresholds, varying
+from pvp_damage.models.leagues import GREAT_LEAGUE
+from pvp_damage.models.moves import get_fast_move
+from pvp_damage.models.pokemon import get_species, get_species_by_id
+from pvp_damage.whatif import sweep_power
+
+
+def _key(rows: list[Threshold]) -> list[tuple[int, float, float, int]]:
+    return [(row.damage, row.stat_min, row.stat_max, row.count) for row in rows]
+
+
+def test_sweep_matches_pair_thresholds():
+    counter = get_fast_move("Counter")
+    sweep = sweep_power(counter, [counter.power - 2, counter.power + 1])
+    assert sweep.powers == [counter.power - 2, counter.power, counter.power + 1]
+
+    ape = get_species("Annihilape")
+    clodsire = get_species_by_id("clodsire")
+    for power in sweep.powers:
+        move = counter.model_copy(update={"power": power})
+        expected = pair_thresholds("great", GREAT_LEAGUE.max_cp, ape, move, clodsire)
+        for kind in ("breakpoint", "bulkpoint"):
+            assert _key(sweep.partitions[power][(kind, ape.key, clodsire.key)]) == _key([
+                row for row in expected if row.kind == kind
+            ])
+
+
+def test_shifts_only_has_changed_pairs():
+    counter = get_fast_move("Counter")
+    sweep = sweep_power(counter, [counter.power + 2])
+
+    assert sweep.shifts(counter.power) == []
+    shifts = sweep.shifts(counter.power + 2)
+    assert shifts
+    changed = {(shift.kind, shift.attacker, shift.defender) for shift in shifts}
+    for pair, rows in sweep.partitions[counter.power].items():
+        after = sweep.partitions[counter.power + 2][pair]
+        assert (pair in changed) == (bool(varying(rows) or varying(after)) and _key(rows) != _key(after))
+
+    # more power never lowers the most damage a matchup can do
+    for shift in shifts:
+        assert max(row.damage for row in shift.after) >= max(row.damage for row in shift.before)
+
+
+def test_sweep_needs_a_meta_user():
+    with pytest.raises(ValueError, match="Nothing in the great meta uses Splash"):
+        sweep_power(get_fast_move("Splash"), [5])
+
+
+def test_shifts_skip_matchups_without_breakpoints():
+    # one more power takes Counter from 7 to 8 damage against every Shadow Drapion
+    counter = get_fast_move("Counter")
+    sweep = sweep_power(counter, [counter.power + 1])
+    pair = ("breakpoint", "annihilape", "drapion_shadow")
+    before, after = sweep.partitions[counter.power][pair], sweep.partitions[counter.power + 1][pair]
+    assert [row.damage for row in before] == [7]
+    assert [row.damage for row in after] == [8]
+    assert pair not in {(shift.kind, shift.attacker, shift.defender) for shift in sweep.shifts(counter.power + 1)}